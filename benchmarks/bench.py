@@ -0,0 +1,377 @@
+#!/usr/bin/env python3
+"""
+Benchmark suite for the geometry, loading, processing, rendering and lookup
+hot paths.
+
+Every case runs on seeded synthetic data from ``benchmarks.synthetic`` (GLB
+models, an extraction report, position streams), so the suite needs neither
+a CS2 install nor the VRF CLI. Each case is set up once, warmed up once and
+timed ``--repeat`` times. The JSON report keeps every sample plus the median,
+quartiles and throughput (items per second at the median). ``compare``
+checks a run against the committed ``benchmarks/baseline.json`` and fails
+when a gated case slows down by more than the threshold and the noise.
+"""
+from __future__ import annotations
+
+import json
+import platform
+import subprocess
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable, Dict, List, Tuple
+
+import click
+import numpy as np
+
+from benchmarks import synthetic
+
+ROOT = Path(__file__).resolve().parents[1]
+DEFAULT_DATA_DIR = Path(".cache") / "cs2_callouts" / "bench"
+DEFAULT_BASELINE = Path(__file__).resolve().parent / "baseline.json"
+
+# Cases whose slowdown fails `compare`; the rest are reported only
+GATED = ("convex_hull", "process_callouts", "process_callouts_stream", "lookup_index", "lookup_partition")
+
+# Input sizes per scale; "small" runs the whole suite in about a minute on one core
+SCALES: Dict[str, Dict[str, int]] = {
+    "small": {
+        "models": 10,
+        "vertices": 2000,
+        "callouts": 100,
+        "hulls": 20,
+        "hull_points": 2000,
+        "srt_vertices": 20_000,
+        "positions": 200_000,
+        "lookup_callouts": 100,
+        "render_callouts": 100,
+    },
+    "default": {
+        "models": 50,
+        "vertices": 5000,
+        "callouts": 1000,
+        "hulls": 50,
+        "hull_points": 5000,
+        "srt_vertices": 100_000,
+        "positions": 1_000_000,
+        "lookup_callouts": 200,
+        "render_callouts": 200,
+    },
+}
+
+# A case's setup returns (fn, items, unit); fn() is what gets timed
+Case = Callable[[Dict[str, int], Path], Tuple[Callable[[], object], int, str]]
+CASES: Dict[str, Case] = {}
+
+
+def case(name: str):
+    def register(setup: Case) -> Case:
+        CASES[name] = setup
+        return setup
+
+    return register
+
+
+def _map(params: Dict[str, int], data_dir: Path) -> synthetic.SyntheticMap:
+    root = data_dir / f"map_m{params['models']}_v{params['vertices']}"
+    return synthetic.write_map(root, callouts=params["callouts"], models=params["models"], vertices=params["vertices"])
+
+
+def _index(params: Dict[str, int]):
+    from benchmarks.render_time import synthetic_callouts
+    from cs2_callouts.lookup import CalloutIndex
+
+    return CalloutIndex.from_output({"callouts": synthetic_callouts(params["lookup_callouts"])})
+
+
+@case("glb_load")
+def _glb_load(params, data_dir):
+    from cs2_callouts.gltf_loader import load_vertices
+
+    files = sorted(_map(params, data_dir).models_root.rglob("*.glb"))
+    return (lambda: [load_vertices(f) for f in files]), len(files) * params["vertices"], "vertices"
+
+
+@case("apply_srt")
+def _apply_srt(params, data_dir):
+    from cs2_callouts.geometry import apply_srt
+
+    verts = synthetic.mesh_vertices(params["srt_vertices"]).astype(np.float64)
+    return (lambda: apply_srt(verts, (1.0, 1.0, 1.0), (5.0, 120.0, 3.0), (100.0, -200.0, 30.0))), len(verts), "vertices"
+
+
+@case("apply_srt_float32")
+def _apply_srt_float32(params, data_dir):
+    from cs2_callouts.geometry import apply_srt
+
+    verts = synthetic.mesh_vertices(params["srt_vertices"])
+    return (lambda: apply_srt(verts, (1.0, 1.0, 1.0), (5.0, 120.0, 3.0), (100.0, -200.0, 30.0))), len(verts), "vertices"
+
+
+@case("convex_hull")
+def _convex_hull(params, data_dir):
+    from cs2_callouts.geometry import convex_hull
+
+    clouds = [synthetic.mesh_vertices(params["hull_points"], seed=i)[:, :2].astype(np.float64) for i in range(params["hulls"])]
+    return (lambda: [convex_hull(c) for c in clouds]), params["hulls"] * params["hull_points"], "points"
+
+
+@case("choose_global_order")
+def _choose_global_order(params, data_dir):
+    from cs2_callouts.geometry import choose_global_order
+
+    samples = [
+        (synthetic.mesh_vertices(params["vertices"], seed=i).astype(np.float64), (1.0, 1.0, 1.0), (0.0, 30.0 * i, 0.0), (0.0, 0.0, 0.0))
+        for i in range(8)
+    ]
+    return (lambda: choose_global_order(samples, limit=len(samples))), len(samples), "samples"
+
+
+@case("process_callouts")
+def _process_callouts(params, data_dir):
+    from cs2_callouts.pipeline import process_callouts, read_callouts_json
+
+    m = _map(params, data_dir)
+    callouts = read_callouts_json(m.callouts_json)
+    return (lambda: process_callouts(callouts, models_root=m.models_root)), len(callouts), "callouts"
+
+
+@case("process_callouts_stream")
+def _process_callouts_stream(params, data_dir):
+    from cs2_callouts.pipeline import process_callouts, read_callouts_json
+
+    m = _map(params, data_dir)
+    callouts = read_callouts_json(m.callouts_json)
+    return (lambda: process_callouts(callouts, models_root=m.models_root, stream=True)), len(callouts), "callouts"
+
+
+@case("process_callouts_float32")
+def _process_callouts_float32(params, data_dir):
+    from cs2_callouts.pipeline import process_callouts, read_callouts_json
+
+    m = _map(params, data_dir)
+    callouts = read_callouts_json(m.callouts_json)
+    return (lambda: process_callouts(callouts, models_root=m.models_root, float32=True)), len(callouts), "callouts"
+
+
+@case("render_pillow")
+def _render_pillow(params, data_dir):
+    from benchmarks.render_time import MAP_METADATA, synthetic_callouts, synthetic_radar
+    from cs2_callouts.raster import render_callouts_image
+
+    data = {"callouts": synthetic_callouts(params["render_callouts"])}
+    radar = synthetic_radar()
+    return (lambda: render_callouts_image(data, radar=radar, map_metadata=MAP_METADATA)), params["render_callouts"], "callouts"
+
+
+@case("lookup_index")
+def _lookup_index(params, data_dir):
+    index = _index(params)
+    pts = synthetic.positions(params["positions"])
+    return (lambda: index.lookup(pts)), len(pts), "points"
+
+
+@case("lookup_partition")
+def _lookup_partition(params, data_dir):
+    from cs2_callouts.partition import CalloutPartition
+
+    part = CalloutPartition.build(_index(params))
+    pts = synthetic.positions(params["positions"])
+    return (lambda: part.lookup(pts)), len(pts), "points"
+
+
+@case("heatmap_accumulate")
+def _heatmap_accumulate(params, data_dir):
+    from benchmarks.render_time import MAP_METADATA
+    from cs2_callouts.heatmap import HeatmapAccumulator
+
+    index = _index(params)
+    pts = synthetic.positions(params["positions"])
+    ids = index.lookup(pts)
+    return (lambda: HeatmapAccumulator(index.names, MAP_METADATA).add(pts, ids)), len(pts), "points"
+
+
+def summarize(samples: List[float], items: int, unit: str) -> Dict:
+    q1, median, q3 = np.percentile(samples, [25, 50, 75]).tolist()
+    return {
+        "unit": unit,
+        "items": items,
+        "samples_s": [round(s, 6) for s in samples],
+        "median_s": round(median, 6),
+        "q1_s": round(q1, 6),
+        "q3_s": round(q3, 6),
+        "iqr_s": round(q3 - q1, 6),
+        "min_s": round(min(samples), 6),
+        "items_per_s": round(items / median, 3) if median > 0 else None,
+    }
+
+
+def run_case(name: str, params: Dict[str, int], data_dir: Path, repeat: int) -> Dict:
+    fn, items, unit = CASES[name](params, data_dir)
+    fn()  # warm-up: imports, caches, allocator
+    samples = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - t0)
+    return summarize(samples, items, unit)
+
+
+def _git_commit() -> str | None:
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True, check=True)
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return out.stdout.strip() or None
+
+
+def run_suite(names: List[str], scale: str, repeat: int, data_dir: Path, echo=print) -> Dict:
+    params = SCALES[scale]
+    results = {}
+    for name in names:
+        results[name] = r = run_case(name, params, data_dir, repeat)
+        echo(
+            f"{name:<26} median={r['median_s'] * 1000:10.2f} ms  iqr={r['iqr_s'] * 1000:8.2f} ms  "
+            f"{r['items_per_s']:>14,.0f} {r['unit']}/s"
+        )
+    return {
+        "meta": {
+            "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "commit": _git_commit(),
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "platform": platform.platform(),
+            "machine": platform.machine(),
+            "scale": scale,
+            "params": params,
+            "repeat": repeat,
+        },
+        "results": results,
+    }
+
+
+def compare_results(
+    baseline: Dict, current: Dict, threshold: float = 0.20, iqr_factor: float = 2.0, gate=GATED
+) -> Tuple[List[Dict], bool]:
+    """Per-case verdicts for ``current`` against ``baseline``; the flag is True when a gated case regressed.
+
+    A case regresses when its median is more than ``threshold`` slower
+    *and* the slowdown exceeds ``iqr_factor`` times the larger of the two
+    IQRs, so a noisy case needs a bigger difference before it fails.
+    """
+    rows = []
+    failed = False
+    base, cur = baseline.get("results", {}), current.get("results", {})
+    for name in list(cur) + [n for n in base if n not in cur]:
+        b, c = base.get(name), cur.get(name)
+        row = {"case": name, "gated": name in gate, "baseline_s": b and b["median_s"], "current_s": c and c["median_s"]}
+        if b is None or c is None:
+            row.update(change=None, noise=None, status="new" if b is None else "missing")
+            rows.append(row)
+            continue
+        delta = c["median_s"] - b["median_s"]
+        noise = iqr_factor * max(b["iqr_s"], c["iqr_s"])
+        change = delta / b["median_s"] if b["median_s"] else 0.0
+        if change > threshold and delta > noise:
+            status = "REGRESSION" if row["gated"] else "slower"
+        elif change < -threshold and -delta > noise:
+            status = "faster"
+        else:
+            status = "ok"
+        failed |= status == "REGRESSION"
+        row.update(change=change, noise=noise / b["median_s"] if b["median_s"] else 0.0, status=status)
+        rows.append(row)
+    return rows, failed
+
+
+def format_comparison(rows: List[Dict]) -> List[str]:
+    def ms(v):
+        return f"{v * 1000:10.2f}" if v is not None else f"{'-':>10}"
+
+    lines = [f"{'case':<26} {'baseline ms':>11} {'current ms':>11} {'change':>8} {'noise':>7}  status"]
+    for r in rows:
+        change = f"{r['change']:+8.1%}" if r["change"] is not None else f"{'-':>8}"
+        noise = f"{r['noise']:7.1%}" if r["noise"] is not None else f"{'-':>7}"
+        gate = "" if r["gated"] else " (not gated)"
+        lines.append(f"{r['case']:<26} {ms(r['baseline_s'])} {ms(r['current_s'])} {change} {noise}  {r['status']}{gate}")
+    return lines
+
+
+def _select(only: str | None) -> List[str]:
+    if not only:
+        return list(CASES)
+    names = [s.strip() for s in only.split(",") if s.strip()]
+    unknown = [n for n in names if n not in CASES]
+    if unknown:
+        raise click.BadParameter(f"unknown case(s) {', '.join(unknown)}; available: {', '.join(CASES)}", param_hint="--only")
+    return names
+
+
+@click.group()
+def cli():
+    """Offline benchmark suite with JSON results."""
+
+
+@cli.command("list")
+def list_cases():
+    """Show the available cases."""
+    for name in CASES:
+        click.echo(name)
+
+
+@cli.command()
+@click.option("--scale", type=click.Choice(sorted(SCALES)), default="small", show_default=True, help="Input sizes (see SCALES).")
+@click.option("--repeat", default=5, show_default=True, help="Timed runs per case after one warm-up run.")
+@click.option("--only", default=None, help="Comma-separated case names (default: all).")
+@click.option("--out", "out_path", default="bench_results.json", show_default=True, type=click.Path(dir_okay=False), help="Results JSON.")
+@click.option("--data-dir", default=str(DEFAULT_DATA_DIR), show_default=True, type=click.Path(file_okay=False), help="Where synthetic GLBs are generated and reused.")
+def run(scale: str, repeat: int, only: str | None, out_path: str, data_dir: str):
+    """Run the suite and write per-case samples, median/IQR and throughput."""
+    report = run_suite(_select(only), scale, repeat, Path(data_dir), echo=click.echo)
+    Path(out_path).parent.mkdir(parents=True, exist_ok=True)
+    Path(out_path).write_text(json.dumps(report, indent=2), encoding="utf-8")
+    click.echo(f"Wrote {out_path}")
+
+
+@cli.command()
+@click.option("--baseline", "baseline_path", default=str(DEFAULT_BASELINE), show_default=True, type=click.Path(exists=True, dir_okay=False), help="Baseline results JSON.")
+@click.option("--results", "results_path", default=None, type=click.Path(exists=True, dir_okay=False), help="Compare an existing results JSON instead of running the suite.")
+@click.option("--threshold", default=0.20, show_default=True, help="Relative median slowdown that counts as a regression.")
+@click.option("--iqr-factor", default=2.0, show_default=True, help="The slowdown must also exceed this many IQRs (larger of baseline/current).")
+@click.option("--gate", default=",".join(GATED), show_default=True, help="Comma-separated cases that fail the check ('all' for every case).")
+@click.option("--repeat", default=None, type=int, help="Timed runs per case (default: the baseline's).")
+@click.option("--only", default=None, help="Comma-separated case names (default: all in the baseline).")
+@click.option("--out", "out_path", default=None, type=click.Path(dir_okay=False), help="Also save this run's results JSON.")
+@click.option("--data-dir", default=str(DEFAULT_DATA_DIR), show_default=True, type=click.Path(file_okay=False), help="Where synthetic GLBs are generated and reused.")
+def compare(baseline_path: str, results_path: str | None, threshold: float, iqr_factor: float, gate: str,
+            repeat: int | None, only: str | None, out_path: str | None, data_dir: str):
+    """Run the suite at the baseline's scale and fail on gated slowdowns."""
+    baseline = json.loads(Path(baseline_path).read_text(encoding="utf-8"))
+    meta = baseline.get("meta", {})
+    if results_path:
+        current = json.loads(Path(results_path).read_text(encoding="utf-8"))
+    else:
+        scale = meta.get("scale", "small")
+        if scale not in SCALES:
+            raise click.UsageError(f"Baseline scale {scale!r} is not defined in this version of the suite")
+        names = _select(only) if only else [n for n in baseline.get("results", {}) if n in CASES]
+        current = run_suite(names, scale, repeat or meta.get("repeat", 5), Path(data_dir), echo=click.echo)
+        if out_path:
+            Path(out_path).write_text(json.dumps(current, indent=2), encoding="utf-8")
+    if meta.get("params") and current.get("meta", {}).get("params") != meta["params"]:
+        raise click.UsageError("Baseline and current run used different input sizes; rerun with the baseline's scale")
+
+    gated = tuple(CASES) if gate.strip() == "all" else tuple(s.strip() for s in gate.split(",") if s.strip())
+    rows, failed = compare_results(baseline, current, threshold=threshold, iqr_factor=iqr_factor, gate=gated)
+    click.echo(f"Baseline {baseline_path} (commit {meta.get('commit')}, {meta.get('platform')})")
+    for line in format_comparison(rows):
+        click.echo(line)
+    if failed:
+        slow = ", ".join(r["case"] for r in rows if r["status"] == "REGRESSION")
+        click.echo(f"Performance regression beyond {threshold:.0%}: {slow}", err=True)
+        raise SystemExit(1)
+    click.echo("No gated regressions.")
+
+
+if __name__ == "__main__":
+    cli()
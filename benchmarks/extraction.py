@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Extraction-path benchmark against the stub VRF CLI.
+
+Builds fixture VPKs (``synthetic.write_vpk_fixture``), installs the
+``fake_vrf`` launcher and runs the same steps as ``cs2_callouts extract``:
+decompile the map and entity lumps, parse ``env_cs_place`` entries and
+export every model. Each run is profiled, so the report breaks wall time
+into time spent waiting on VRF subprocesses (idle) and our own Python time,
+with subprocess counts per kind. Sweep ``--latency`` to see how much of a
+real run is per-process startup, which is what batching or running exports
+concurrently would remove.
+"""
+from __future__ import annotations
+
+import contextlib
+import io
+import json
+import os
+import shutil
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict
+
+import click
+
+from benchmarks import fake_vrf, synthetic
+from cs2_callouts.extract import decompile_map_and_entities_from_multiple_vpks, export_models, parse_callout_models
+from cs2_callouts.profiling import profiling
+
+
+def run_extraction(cli_path: str, fixture: synthetic.FixtureVpks, out_root: Path, latency: float, verbose: bool = False) -> Dict:
+    """One extract run into a fresh ``out_root``; returns wall, idle and per-stage timings."""
+    shutil.rmtree(out_root, ignore_errors=True)
+    vpks = [str(p) for p in fixture.vpk_paths]
+    old = os.environ.get(fake_vrf.LATENCY_ENV)
+    os.environ[fake_vrf.LATENCY_ENV] = str(latency)
+    quiet = contextlib.nullcontext() if verbose else contextlib.redirect_stdout(io.StringIO())
+    try:
+        with quiet, profiling("extract") as prof:
+            t0 = time.perf_counter()
+            out_map_dir = decompile_map_and_entities_from_multiple_vpks(cli_path, vpks, fixture.map_name, out_root)
+            callouts = parse_callout_models(out_map_dir)
+            models = [c["model"] for c in callouts if c.get("model")]
+            result = export_models(cli_path, vpks, models, out_root / "models", "glb", out_map_dir)
+            wall = time.perf_counter() - t0
+    finally:
+        if old is None:
+            os.environ.pop(fake_vrf.LATENCY_ENV, None)
+        else:
+            os.environ[fake_vrf.LATENCY_ENV] = old
+    report = prof.report()
+    sub = report["vrf_subprocesses"]
+    return {
+        "latency_s": latency,
+        "wall_s": round(wall, 6),
+        "idle_s": sub["wall_s"],
+        "python_s": round(wall - sub["wall_s"], 6),
+        "idle_fraction": round(sub["wall_s"] / wall, 4) if wall else 0.0,
+        "subprocesses": sub["calls"],
+        "subprocesses_by_kind": {k: v["calls"] for k, v in sub["by_kind"].items()},
+        "callouts": len(callouts),
+        "models_exported": len(result["exported"]),
+        "models_missing": len(result["missing"]),
+        "stages": report["stages"],
+    }
+
+
+@click.command()
+@click.option("--callouts", default=200, show_default=True, help="env_cs_place entries in the fixture map.")
+@click.option("--models", default=20, show_default=True, help="Distinct callout models (each one VRF export).")
+@click.option("--vertices", default=2000, show_default=True, help="Vertices per fixture GLB.")
+@click.option("--lumps", default=2, show_default=True, help="Entity lumps in the map VPK.")
+@click.option("--latency", "latencies", default="0,0.05,0.2", show_default=True, help="Comma-separated stub startup latencies in seconds.")
+@click.option("--out", "out_path", default=None, type=click.Path(dir_okay=False), help="Write the results JSON here.")
+@click.option("--verbose", is_flag=True, help="Show the extractor's own log lines.")
+def main(callouts: int, models: int, vertices: int, lumps: int, latencies: str, out_path: str | None, verbose: bool):
+    """Measure subprocess count, idle time and wall time of the extraction path offline."""
+    runs = []
+    with tempfile.TemporaryDirectory() as tmp:
+        fixture = synthetic.write_vpk_fixture(Path(tmp) / "vpk", callouts=callouts, models=models, vertices=vertices, lumps=lumps)
+        cli_path = fake_vrf.install_stub(Path(tmp) / "vrf-cli")
+        for latency in [float(s) for s in latencies.split(",") if s.strip()]:
+            r = run_extraction(cli_path, fixture, Path(tmp) / "export", latency, verbose=verbose)
+            runs.append(r)
+            click.echo(
+                f"latency={latency * 1000:6.0f} ms  wall={r['wall_s']:7.2f} s  idle={r['idle_s']:7.2f} s "
+                f"({r['idle_fraction']:5.1%})  python={r['python_s']:6.2f} s  subprocesses={r['subprocesses']:4d} "
+                f"{r['subprocesses_by_kind']}  exported={r['models_exported']}/{models}"
+            )
+    if out_path:
+        params = {"callouts": callouts, "models": models, "vertices": vertices, "lumps": lumps}
+        Path(out_path).write_text(json.dumps({"params": params, "runs": runs}, indent=2), encoding="utf-8")
+        click.echo(f"Wrote {out_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Stand-in for Source2Viewer-CLI over fixture VPKs, for benchmarking and
+exercising the extraction path offline.
+
+Fixture "VPKs" are JSON manifests written by
+``benchmarks.synthetic.write_vpk_fixture``. The stub understands the
+invocations ``cs2_callouts.extract`` makes:
+
+    -i VPK --vpk_list                               list entries
+    -i VPK --vpk_filepath PATH -o OUT -d            decompile one entry (or a folder with -e EXT)
+    ... --gltf_export_format glb                    export a model entry as GLB
+
+Decompiled text lands at ``OUT/<entry without the _c suffix>`` and models at
+``OUT/<entry>.glb``, keeping the archive's directory structure like VRF
+does. A missing entry exits 1. Set ``FAKE_VRF_LATENCY`` (seconds) to add a
+fixed startup delay per call; the real CLI spends a few hundred ms starting
+.NET. Only the standard library is imported, so the stub's own startup stays
+small.
+
+``install_stub(dir)`` writes an executable launcher that can be passed to
+the extract functions as ``cli_path``.
+"""
+from __future__ import annotations
+
+import json
+import os
+import shutil
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List
+
+LATENCY_ENV = "FAKE_VRF_LATENCY"
+
+
+def install_stub(directory: str | Path) -> str:
+    """Write a ``Source2Viewer-CLI`` launcher for this stub into ``directory``; returns its path."""
+    d = Path(directory)
+    d.mkdir(parents=True, exist_ok=True)
+    script = Path(__file__).resolve()
+    if os.name == "nt":
+        launcher = d / "Source2Viewer-CLI.cmd"
+        launcher.write_text(f'@"{sys.executable}" "{script}" %*\r\n', encoding="utf-8")
+    else:
+        launcher = d / "Source2Viewer-CLI"
+        launcher.write_text(f'#!/bin/sh\nexec "{sys.executable}" "{script}" "$@"\n', encoding="utf-8")
+        launcher.chmod(0o755)
+    return str(launcher)
+
+
+def _arg(args: List[str], flag: str) -> str | None:
+    return args[args.index(flag) + 1] if flag in args and args.index(flag) + 1 < len(args) else None
+
+
+def _write_entry(name: str, entry: Dict, out: Path, gltf: bool) -> None:
+    if "glb" in entry:
+        if not gltf:
+            return
+        dest = out / (name[: -len(".vmdl_c")] + ".glb")
+        dest.parent.mkdir(parents=True, exist_ok=True)
+        shutil.copyfile(entry["glb"], dest)
+        return
+    dest = out / (name[:-2] if name.endswith("_c") else name)
+    dest.parent.mkdir(parents=True, exist_ok=True)
+    dest.write_text(entry.get("text", ""), encoding="utf-8")
+
+
+def main(args: List[str]) -> int:
+    time.sleep(float(os.environ.get(LATENCY_ENV, "0") or 0))
+    vpk = _arg(args, "-i")
+    if not vpk or not Path(vpk).exists():
+        print(f"Input file not found: {vpk}", file=sys.stderr)
+        return 1
+    entries: Dict[str, Dict] = json.loads(Path(vpk).read_text(encoding="utf-8"))["entries"]
+
+    if "--vpk_list" in args:
+        print("\n".join(entries))
+        return 0
+
+    path = _arg(args, "--vpk_filepath")
+    out = Path(_arg(args, "-o") or ".")
+    gltf = "--gltf_export_format" in args
+    if path is None:
+        print("Nothing to do", file=sys.stderr)
+        return 1
+    if path.endswith("/"):
+        ext = _arg(args, "-e")
+        names = [n for n in entries if n.startswith(path) and (not ext or n.endswith("." + ext))]
+    else:
+        names = [path] if path in entries else []
+    if not names:
+        print(f"File not found in package: {path}", file=sys.stderr)
+        return 1
+    for name in names:
+        _write_entry(name, entries[name], out, gltf)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
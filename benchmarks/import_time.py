@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Import-time benchmark for the CLI entry points.
+
+Runs each entry module under ``python -X importtime`` in a fresh interpreter,
+parses the report and fails when the cumulative import time exceeds the
+budget or when a heavy dependency (NumPy, matplotlib, trimesh, Pillow) is
+pulled in just to start the CLI.
+"""
+from __future__ import annotations
+
+import re
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+import click
+
+ROOT = Path(__file__).resolve().parents[1]
+
+# Modules behind the console scripts in pyproject.toml
+ENTRY_MODULES = [
+    "cs2_callouts.cli",
+    "cs2_callouts.visualize",
+    "cs2_callouts.__main__",
+]
+
+HEAVY_MODULES = ("numpy", "matplotlib", "trimesh", "PIL")
+
+_LINE_RE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)$")
+
+
+def parse_importtime(stderr: str) -> List[Tuple[str, int, int, int]]:
+    """Parse ``-X importtime`` output into (module, self_us, cumulative_us, depth) rows."""
+    rows = []
+    for line in stderr.splitlines():
+        m = _LINE_RE.match(line)
+        if not m:
+            continue
+        self_us, cum_us, indent, name = m.groups()
+        depth = (len(indent) - 1) // 2
+        rows.append((name, int(self_us), int(cum_us), depth))
+    return rows
+
+
+def measure(module: str) -> Dict:
+    """Import ``module`` in a fresh interpreter and summarise the importtime report."""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        cwd=str(ROOT),
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(f"Importing {module} failed:\n{proc.stderr}")
+    rows = parse_importtime(proc.stderr)
+    # Top-level rows are the roots of the import tree; their cumulative times sum to the total
+    total_us = sum(cum for _, _, cum, depth in rows if depth == 0)
+    heavy = sorted({name.split(".")[0] for name, _, _, _ in rows if name.split(".")[0] in HEAVY_MODULES})
+    slowest = sorted(rows, key=lambda r: r[1], reverse=True)[:5]
+    return {"module": module, "total_ms": total_us / 1000.0, "heavy": heavy, "slowest": slowest}
+
+
+@click.command()
+@click.option("--budget-ms", default=250.0, show_default=True, help="Maximum cumulative import time per entry module.")
+@click.option("--repeat", default=5, show_default=True, help="Fresh-interpreter runs per module; the median is compared against the budget.")
+def main(budget_ms: float, repeat: int):
+    """Fail when CLI startup imports exceed the budget or pull in heavy modules."""
+    failed = False
+    for module in ENTRY_MODULES:
+        runs = [measure(module) for _ in range(max(1, repeat))]
+        median_ms = statistics.median(r["total_ms"] for r in runs)
+        heavy = sorted({h for r in runs for h in r["heavy"]})
+        status = "OK"
+        if median_ms > budget_ms:
+            status = "OVER BUDGET"
+            failed = True
+        if heavy:
+            status = f"HEAVY IMPORTS: {', '.join(heavy)}"
+            failed = True
+        click.echo(f"{module:<26} median={median_ms:7.1f} ms  budget={budget_ms:.0f} ms  {status}")
+        for name, self_us, _, _ in runs[-1]["slowest"]:
+            click.echo(f"    {self_us / 1000.0:7.2f} ms self  {name}")
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
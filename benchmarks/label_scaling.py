@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""
+Worker-scaling benchmark for position labeling.
+
+Writes a synthetic position table (uniform points over a mirage-sized world
+extent), then labels it with ``stream_label`` at increasing worker counts
+against synthetic callouts. Output is not written, so the numbers cover
+reading plus lookup; the speedup column is relative to the in-process run.
+"""
+from __future__ import annotations
+
+import csv
+import tempfile
+import time
+from pathlib import Path
+
+import click
+import numpy as np
+
+from benchmarks.render_time import synthetic_callouts
+from cs2_callouts.labeling import StreamSummary, stream_label
+from cs2_callouts.lookup import CalloutIndex
+
+
+def write_positions(path: Path, rows: int, seed: int = 0) -> None:
+    rng = np.random.default_rng(seed)
+    xy = rng.uniform([-3000.0, -3300.0], [1800.0, 1500.0], size=(rows, 2))
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        w = csv.writer(f)
+        w.writerow(["tick", "X", "Y"])
+        w.writerows(zip(range(rows), np.round(xy[:, 0], 2).tolist(), np.round(xy[:, 1], 2).tolist()))
+
+
+@click.command()
+@click.option("--rows", default=2_000_000, show_default=True, help="Rows in the synthetic position table.")
+@click.option("--callouts", default=200, show_default=True, help="Synthetic callout count.")
+@click.option("--workers", "worker_counts", default="1,2,4", show_default=True, help="Comma-separated worker counts.")
+@click.option("--chunk-size", default=250_000, show_default=True, help="Rows per chunk.")
+def main(rows: int, callouts: int, worker_counts: str, chunk_size: int):
+    """Report labeling throughput per worker count."""
+    items = synthetic_callouts(callouts)
+    index = CalloutIndex.from_polygons([it["name"] for it in items], [it["polygon_2d"] for it in items])
+    with tempfile.TemporaryDirectory() as tmp:
+        positions = Path(tmp) / "positions.csv"
+        write_positions(positions, rows)
+        baseline = None
+        for workers in [int(s) for s in worker_counts.split(",") if s.strip()]:
+            summary = StreamSummary()
+            t0 = time.perf_counter()
+            for _ in stream_label(positions, index, chunk_size=chunk_size, summary=summary, workers=workers):
+                pass
+            wall = time.perf_counter() - t0
+            rate = summary.rows / wall
+            baseline = baseline or rate
+            click.echo(f"workers={workers:2d}  {rate:12,.0f} rows/s  wall={wall:6.2f} s  speedup={rate / baseline:4.2f}x")
+
+
+if __name__ == "__main__":
+    main()
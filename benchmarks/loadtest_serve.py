@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Load test for ``cs2_callouts serve``.
+
+Starts the server in-process on a free port (or a Unix socket) over a
+directory of callout files, or targets an already running server with
+``--port``/``--unix-socket`` plus ``--external``. N client threads, each with
+its own keep-alive connection, send batched lookups of random points for a
+fixed duration. Reports requests/s, points/s and p50/p99 request latency.
+"""
+from __future__ import annotations
+
+import json
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import List
+
+import click
+import numpy as np
+
+from benchmarks.render_time import synthetic_callouts
+from cs2_callouts.registry import CalloutMaps
+from cs2_callouts.server import CalloutClient, make_server
+
+
+def _client_loop(client: CalloutClient, map_name: str, batch: int, deadline: float, seed: int, latencies: List[float]) -> None:
+    rng = np.random.default_rng(seed)
+    while time.perf_counter() < deadline:
+        pts = rng.uniform([-3000.0, -3300.0, 0.0], [1800.0, 1500.0, 200.0], size=(batch, 3))
+        t0 = time.perf_counter()
+        client.lookup(map_name, pts)
+        latencies.append(time.perf_counter() - t0)
+
+
+@click.command()
+@click.option("--out-dir", default=None, type=click.Path(file_okay=False), help="Callouts directory to serve (default: synthetic maps in a temp dir).")
+@click.option("--map", "map_name", default="de_mirage", show_default=True, help="Map to query.")
+@click.option("--clients", default=4, show_default=True, help="Concurrent client threads.")
+@click.option("--batch", default=256, show_default=True, help="Points per request.")
+@click.option("--duration", default=5.0, show_default=True, help="Seconds to run.")
+@click.option("--unix-socket", default=None, type=click.Path(), help="Use a Unix socket instead of TCP.")
+@click.option("--port", default=0, show_default=True, help="TCP port (0 = pick a free one for the in-process server).")
+@click.option("--external", is_flag=True, help="Target an already running server instead of starting one.")
+def main(out_dir: str | None, map_name: str, clients: int, batch: int, duration: float, unix_socket: str | None, port: int, external: bool):
+    """Measure request latency and throughput of the lookup server."""
+    server = None
+    with tempfile.TemporaryDirectory() as tmp:
+        if not external:
+            if out_dir is None:
+                out_dir = tmp
+                items = synthetic_callouts(200)
+                (Path(tmp) / f"{map_name}_callouts.json").write_text(json.dumps({"callouts": items}), encoding="utf-8")
+            maps = CalloutMaps(out_dir)
+            maps.preload()
+            server = make_server(maps, port=port, unix_socket=unix_socket)
+            port = server.server_port
+            threading.Thread(target=server.serve_forever, daemon=True).start()
+
+        conns = [CalloutClient(port=port, unix_socket=unix_socket) for _ in range(clients)]
+        per_client: List[List[float]] = [[] for _ in range(clients)]
+        deadline = time.perf_counter() + duration
+        threads = [
+            threading.Thread(target=_client_loop, args=(conns[i], map_name, batch, deadline, i, per_client[i]))
+            for i in range(clients)
+        ]
+        t0 = time.perf_counter()
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        wall = time.perf_counter() - t0
+        for c in conns:
+            c.close()
+        if server is not None:
+            server.shutdown()
+            server.server_close()
+
+    lat = np.array([x for xs in per_client for x in xs])
+    if lat.size == 0:
+        raise click.ClickException("No requests completed")
+    click.echo(
+        f"clients={clients} batch={batch} transport={'unix' if unix_socket else 'tcp'}: "
+        f"{lat.size / wall:,.0f} req/s, {lat.size * batch / wall:,.0f} points/s, "
+        f"p50 {np.percentile(lat, 50) * 1000:.2f} ms, p99 {np.percentile(lat, 99) * 1000:.2f} ms "
+        f"({lat.size} requests in {wall:.1f} s)"
+    )
+
+
+if __name__ == "__main__":
+    main()
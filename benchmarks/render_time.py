@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Render-time benchmark for the overlay renderers.
+
+Compares the previous per-callout matplotlib path (Python closures per
+vertex, one Polygon patch per callout), the vectorized PolyCollection
+renderer and the matplotlib-free Pillow raster renderer on synthetic callout
+sets of increasing size. Every path draws over a 1024x1024 radar and encodes
+an in-memory PNG, so the numbers are per-image latencies.
+"""
+from __future__ import annotations
+
+import io
+import statistics
+import time
+from typing import Callable, Dict, List
+
+import click
+import numpy as np
+
+from cs2_callouts.render import use_noninteractive_backend
+
+use_noninteractive_backend()
+
+import matplotlib.pyplot as plt  # noqa: E402
+from matplotlib.patches import Polygon as MplPolygon  # noqa: E402
+
+from PIL import Image  # noqa: E402
+
+from cs2_callouts.geometry import convex_hull  # noqa: E402
+from cs2_callouts.raster import render_callouts_image  # noqa: E402
+from cs2_callouts.render import color_for_name, draw_callouts, flatten_polygons, game_to_pixel  # noqa: E402
+
+MAP_METADATA = {"pos_x": -3230, "pos_y": 1713, "scale": 5.0}
+
+
+def synthetic_callouts(count: int, seed: int = 0) -> List[Dict]:
+    """Random convex hulls scattered over a mirage-sized world extent."""
+    rng = np.random.default_rng(seed)
+    items = []
+    for i in range(count):
+        center = rng.uniform([-3000.0, -3300.0], [1800.0, 1500.0])
+        pts = center + rng.normal(scale=rng.uniform(40.0, 250.0), size=(24, 2))
+        hull = convex_hull(pts)
+        items.append({"name": f"Callout{i}", "polygon_2d": hull.tolist()})
+    return items
+
+
+def synthetic_radar(size: int = 1024, seed: int = 0) -> Image.Image:
+    """Blocky low-frequency image; per-pixel noise would make PNG encoding dominate."""
+    rng = np.random.default_rng(seed)
+    small = Image.fromarray((rng.random((32, 32, 3)) * 255).astype(np.uint8), "RGB")
+    return small.resize((size, size), Image.NEAREST)
+
+
+def render_legacy(items: List[Dict], radar: Image.Image, dpi: int, labels: bool) -> None:
+    """The pre-vectorization renderer: per-vertex closures and one patch per callout."""
+    fig, ax = plt.subplots(figsize=(12, 12))
+    ax.imshow(radar, extent=[0, radar.size[0], 0, radar.size[1]], alpha=0.7, origin="lower")
+    scale, pos_x, pos_y = MAP_METADATA["scale"], MAP_METADATA["pos_x"], MAP_METADATA["pos_y"]
+
+    def game_to_pixel_x(game_x):
+        return (game_x - pos_x) / scale
+
+    def game_to_pixel_y(game_y):
+        return (pos_y - game_y) / scale
+
+    for it in items:
+        name = it["name"]
+        color = color_for_name(name)
+        pixel_poly = [[game_to_pixel_x(float(x)), game_to_pixel_y(float(y))] for x, y in it["polygon_2d"]]
+        ax.add_patch(MplPolygon(pixel_poly, closed=True, facecolor=color + (0.35,), edgecolor=color, linewidth=1.0))
+        if labels:
+            cx = sum(p[0] for p in pixel_poly) / len(pixel_poly)
+            cy = sum(p[1] for p in pixel_poly) / len(pixel_poly)
+            ax.text(cx, cy, name, fontsize=7, color="black", ha="center", va="center", bbox=dict(boxstyle="round,pad=0.1", fc="white", ec="none", alpha=0.6))
+    ax.set_xlim(0, 1024)
+    ax.set_ylim(0, 1024)
+    fig.savefig(io.BytesIO(), format="png", dpi=dpi)
+    plt.close(fig)
+
+
+def render_vectorized(items: List[Dict], radar: Image.Image, dpi: int, labels: bool) -> None:
+    fig, ax = plt.subplots(figsize=(12, 12))
+    ax.imshow(radar, extent=[0, radar.size[0], 0, radar.size[1]], alpha=0.7, origin="lower")
+    vertices, offsets = flatten_polygons([it["polygon_2d"] for it in items])
+    vertices = game_to_pixel(vertices, MAP_METADATA)
+    draw_callouts(ax, vertices, offsets, [it["name"] for it in items], labels=labels)
+    ax.set_xlim(0, 1024)
+    ax.set_ylim(0, 1024)
+    fig.savefig(io.BytesIO(), format="png", dpi=dpi)
+    plt.close(fig)
+
+
+def render_pillow(items: List[Dict], radar: Image.Image, size: int, labels: bool) -> None:
+    img = render_callouts_image({"callouts": items}, radar=radar, map_metadata=MAP_METADATA, size=(size, size), labels=labels)
+    img.save(io.BytesIO(), format="png")
+
+
+def _time(fn: Callable[[], None], repeat: int) -> float:
+    samples = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - t0)
+    return statistics.median(samples)
+
+
+@click.command()
+@click.option("--sizes", default="25,200,1000", show_default=True, help="Comma-separated callout counts.")
+@click.option("--repeat", default=3, show_default=True, help="Runs per case; the median is reported.")
+@click.option("--dpi", default=200, show_default=True, help="Output DPI for the matplotlib paths (the CLI saves at 200).")
+@click.option("--thumb-size", default=256, show_default=True, help="Output size for the Pillow thumbnail case.")
+@click.option("--labels/--no-labels", default=True, show_default=True, help="Include label artists in both paths (they dominate at high counts).")
+def main(sizes: str, repeat: int, dpi: int, thumb_size: int, labels: bool):
+    """Compare per-image latency of the overlay renderers."""
+    radar = synthetic_radar()
+    for n in [int(s) for s in sizes.split(",") if s.strip()]:
+        items = synthetic_callouts(n)
+        legacy = _time(lambda: render_legacy(items, radar, dpi, labels), repeat)
+        fast = _time(lambda: render_vectorized(items, radar, dpi, labels), repeat)
+        pillow = _time(lambda: render_pillow(items, radar, radar.size[0], labels), repeat)
+        thumb = _time(lambda: render_pillow(items, radar, thumb_size, labels), repeat)
+        click.echo(
+            f"callouts={n:5d}  mpl-legacy={legacy * 1000:8.1f} ms  mpl-vectorized={fast * 1000:8.1f} ms  "
+            f"pillow={pillow * 1000:7.1f} ms  pillow@{thumb_size}={thumb * 1000:6.1f} ms  "
+            f"(pillow vs mpl-vectorized: {fast / pillow:5.1f}x)"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""
+Synthetic inputs for the benchmarks: GLB models, extraction reports, fixture
+VPKs for the stub VRF CLI (``benchmarks.fake_vrf``) and position streams.
+
+Everything is seeded and written locally, so benchmarks run offline without
+a CS2 install or the VRF CLI. ``write_map`` lays out the same tree the
+extract step produces (``models/`` plus ``callouts_found.json``), so
+``process_callouts`` runs on it unchanged.
+"""
+from __future__ import annotations
+
+import json
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List
+
+import click
+import numpy as np
+
+# World extent of a mirage-sized map, matching benchmarks.render_time.synthetic_callouts
+WORLD_MIN = (-3000.0, -3300.0)
+WORLD_MAX = (1800.0, 1500.0)
+
+
+def mesh_vertices(vertex_count: int, seed: int = 0) -> np.ndarray:
+    """(V, 3) points of a lumpy unit-ish blob, so hulls have a realistic vertex count."""
+    rng = np.random.default_rng(seed)
+    d = rng.normal(size=(vertex_count, 3))
+    d /= np.linalg.norm(d, axis=1, keepdims=True)
+    r = 1.0 + 0.15 * rng.standard_normal((vertex_count, 1))
+    return (d * r * rng.uniform([40.0, 40.0, 20.0], [300.0, 300.0, 80.0])).astype(np.float32)
+
+
+def write_glb(path: Path, vertex_count: int, seed: int = 0) -> Path:
+    """Write a GLB whose mesh has exactly ``vertex_count`` vertices (faces are arbitrary triangles)."""
+    import trimesh
+
+    verts = mesh_vertices(vertex_count, seed)
+    faces = np.arange(vertex_count - vertex_count % 3, dtype=np.int64).reshape(-1, 3)
+    mesh = trimesh.Trimesh(vertices=verts, faces=faces, process=False)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    mesh.export(path)
+    return path
+
+
+def callouts_found(model_names: List[str], count: int, seed: int = 0) -> List[Dict]:
+    """``env_cs_place`` records in the extract report format, cycling over ``model_names``."""
+    rng = np.random.default_rng(seed)
+    items = []
+    for i in range(count):
+        origin = rng.uniform([*WORLD_MIN, -200.0], [*WORLD_MAX, 200.0])
+        items.append(
+            {
+                "file": "synthetic.vents",
+                "placename": f"Callout{i}",
+                "model": model_names[i % len(model_names)],
+                "origin": [round(float(x), 3) for x in origin],
+                "angles": [0.0, round(float(rng.uniform(0.0, 360.0)), 3), 0.0],
+                "scales": [1.0, 1.0, 1.0],
+            }
+        )
+    return items
+
+
+@dataclass
+class SyntheticMap:
+    root: Path
+    models_root: Path
+    callouts_json: Path
+    models: int
+    callouts: int
+    vertices: int
+
+
+def write_map(root: str | Path, callouts: int = 500, models: int = 50, vertices: int = 2000, seed: int = 0) -> SyntheticMap:
+    """Write ``models`` GLBs and a ``callouts_found.json`` referencing them under ``root``.
+
+    Models are stored as ``models/callouts/mN_physics.glb`` and referenced
+    as ``models/callouts/mN.vmdl``, the way VRF exports physics meshes.
+    Existing GLBs are reused so repeated runs skip generation; use a separate
+    ``root`` per (models, vertices, seed) combination.
+    """
+    root = Path(root)
+    models_root = root / "models"
+    names = []
+    for m in range(models):
+        glb = models_root / "callouts" / f"m{m}_physics.glb"
+        if not glb.exists():
+            write_glb(glb, vertices, seed=seed + m)
+        names.append(f"models/callouts/m{m}.vmdl")
+    report = root / "callouts_found.json"
+    report.write_text(json.dumps(callouts_found(names, callouts, seed), indent=2), encoding="utf-8")
+    return SyntheticMap(root, models_root, report, models, callouts, vertices)
+
+
+def vents_text(records: List[Dict]) -> str:
+    """Decompiled entity lump text for ``callouts_found``-style records, as VRF writes ``.vents`` files."""
+    blocks = []
+    for r in records:
+        blocks.append(
+            "\n".join(
+                [
+                    "====",
+                    "classname env_cs_place",
+                    f"place_name {r['placename']}",
+                    f"model {r['model']}",
+                    "origin {} {} {}".format(*r["origin"]),
+                    "angles {} {} {}".format(*r["angles"]),
+                    "scales {} {} {}".format(*r["scales"]),
+                ]
+            )
+        )
+    return "\n".join(blocks) + "\n"
+
+
+@dataclass
+class FixtureVpks:
+    map_name: str
+    vpk_paths: List[Path]  # main pak01_dir.vpk first, then the map VPK, as resolve_vpk_paths orders them
+    callouts: int
+    models: int
+
+
+def write_vpk_fixture(
+    root: str | Path, map_name: str = "de_synthetic", callouts: int = 200, models: int = 20, vertices: int = 2000,
+    lumps: int = 2, seed: int = 0,
+) -> FixtureVpks:
+    """Fixture "VPKs" for ``benchmarks.fake_vrf``: JSON manifests of the files each archive holds.
+
+    ``pak01_dir.vpk`` holds unrelated shared content and ``<map>.vpk`` holds
+    the ``.vmap_c``, ``lumps`` entity lumps and the callout models (backed
+    by real GLBs under ``root/glb``). Like real CS2 installs, each model is
+    therefore only found in the second archive.
+    """
+    root = Path(root)
+    records = callouts_found([f"models/{map_name}/callouts/m{m}.vmdl" for m in range(models)], callouts, seed)
+    map_entries: Dict[str, Dict] = {f"maps/{map_name}.vmap_c": {"text": f"// synthetic {map_name}\n"}}
+    per_lump = -(-len(records) // lumps)
+    for k in range(lumps):
+        chunk = records[k * per_lump:(k + 1) * per_lump]
+        map_entries[f"maps/{map_name}/entities/lump{k}.vents_c"] = {"text": vents_text(chunk)}
+    for m in range(models):
+        glb = root / "glb" / f"v{vertices}_s{seed + m}.glb"
+        if not glb.exists():
+            write_glb(glb, vertices, seed=seed + m)
+        map_entries[f"models/{map_name}/callouts/m{m}.vmdl_c"] = {"glb": str(glb.resolve())}
+    main_entries = {f"materials/shared/tex{i}.vtex_c": {"text": ""} for i in range(50)}
+
+    main_vpk = root / "pak01_dir.vpk"
+    map_vpk = root / "maps" / f"{map_name}.vpk"
+    for path, entries in ((main_vpk, main_entries), (map_vpk, map_entries)):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps({"fake_vpk": 1, "entries": entries}), encoding="utf-8")
+    return FixtureVpks(map_name, [main_vpk, map_vpk], callouts, models)
+
+
+def positions(rows: int, seed: int = 0) -> np.ndarray:
+    """(rows, 2) world XY uniformly over the map extent."""
+    rng = np.random.default_rng(seed)
+    return rng.uniform(WORLD_MIN, WORLD_MAX, size=(rows, 2))
+
+
+@click.command()
+@click.option("--out", "out_dir", required=True, type=click.Path(file_okay=False), help="Directory for models/ and callouts_found.json.")
+@click.option("--callouts", default=500, show_default=True, help="env_cs_place entries.")
+@click.option("--models", default=50, show_default=True, help="Distinct GLB models.")
+@click.option("--vertices", default=2000, show_default=True, help="Vertices per model.")
+@click.option("--seed", default=0, show_default=True)
+def main(out_dir: str, callouts: int, models: int, vertices: int, seed: int):
+    """Write a synthetic extraction tree for `cs2_callouts process --models-root`."""
+    m = write_map(out_dir, callouts=callouts, models=models, vertices=vertices, seed=seed)
+    click.echo(f"Wrote {m.callouts} callouts over {m.models} models ({m.vertices} vertices each) to {m.root}")
+    click.echo(f"python -m cs2_callouts process --callouts-json {m.callouts_json} --models-root {m.models_root}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,18 @@
 __all__ = [
+    "CalloutMap",
+    "CalloutMaps",
     "geometry",
     "gltf_loader",
     "pipeline",
 ]
 
 __version__ = "0.1.0"
+
+
+def __getattr__(name):
+    # Resolved on first access so importing the package (and the CLI) stays free of NumPy
+    if name in ("CalloutMap", "CalloutMaps"):
+        from . import registry
+
+        return getattr(registry, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,170 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+DEFAULT_CACHE_DIR = Path(".cache") / "cs2_callouts"
+
+# Where map-data.json is looked for when no explicit path is given
+MAP_DATA_LOCATIONS = [
+    Path("map-data.json"),  # Current directory
+    Path("C:/Users/mwrid/.awpy/maps/map-data.json"),  # User's awpy directory
+    Path.home() / ".awpy/maps/map-data.json",  # Generic user awpy directory
+]
+
+# Smallest side kept when building pre-downsampled radar variants
+MIN_VARIANT_SIZE = 128
+
+
+def _source_key(path: Path) -> str:
+    """Cache key for a source file: resolved path plus mtime and size."""
+    st = path.stat()
+    raw = f"{path.resolve()}|{st.st_mtime_ns}|{st.st_size}"
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()[:16]
+
+
+def _atomic_write_text(path: Path, text: str) -> None:
+    tmp = path.with_name(path.name + f".{os.getpid()}.tmp")
+    tmp.write_text(text, encoding="utf-8")
+    os.replace(tmp, path)
+
+
+def _atomic_save_npy(path: Path, arr: np.ndarray) -> None:
+    tmp = path.with_name(path.name + f".{os.getpid()}.tmp")
+    with open(tmp, "wb") as f:
+        np.save(f, arr)
+    os.replace(tmp, path)
+
+
+class AssetCache:
+    """On-disk cache of decoded radar images and map-data.json entries.
+
+    Radars are decoded once into ``.npy`` files (full size plus halved
+    variants down to MIN_VARIANT_SIZE) and memory-mapped on later reads.
+    map-data.json is split into one small JSON per map, keyed by the source
+    file's path, mtime and size, so a changed file is re-indexed automatically.
+    Everything loaded is also memoized in-process for batch runs.
+    """
+
+    def __init__(self, cache_dir: str | Path = DEFAULT_CACHE_DIR):
+        self.cache_dir = Path(cache_dir)
+        self._radars: Dict[Tuple[str, int], np.ndarray] = {}
+        self._metadata: Dict[Tuple[str, str], Optional[Dict]] = {}
+
+    # -- map-data.json -------------------------------------------------
+
+    @staticmethod
+    def find_map_data(map_data: str | Path | None = None) -> Optional[Path]:
+        if map_data:
+            return Path(map_data)
+        for location in MAP_DATA_LOCATIONS:
+            if location.exists():
+                return location
+        return None
+
+    def _metadata_index(self, source: Path) -> Path:
+        index_dir = self.cache_dir / "map-data" / _source_key(source)
+        if (index_dir / "_complete").exists():
+            return index_dir
+        all_metadata = json.loads(source.read_text(encoding="utf-8-sig"))
+        index_dir.mkdir(parents=True, exist_ok=True)
+        for name, entry in all_metadata.items():
+            _atomic_write_text(index_dir / f"{name}.json", json.dumps(entry))
+        _atomic_write_text(index_dir / "_complete", str(source.resolve()))
+        return index_dir
+
+    def map_metadata(self, map_name: str, map_data: str | Path | None = None) -> Optional[Dict]:
+        """Radar metadata (pos_x, pos_y, scale, ...) for ``map_name``, or None if unknown."""
+        source = self.find_map_data(map_data)
+        if source is None:
+            return None
+        memo_key = (_source_key(source), map_name)
+        if memo_key in self._metadata:
+            return self._metadata[memo_key]
+        entry_path = self._metadata_index(source) / f"{map_name}.json"
+        entry = json.loads(entry_path.read_text(encoding="utf-8")) if entry_path.exists() else None
+        self._metadata[memo_key] = entry
+        return entry
+
+    # -- radar images --------------------------------------------------
+
+    def _radar_paths(self, source: Path) -> Tuple[str, Path]:
+        key = _source_key(source)
+        return key, self.cache_dir / "radar" / key
+
+    def _build_radar_variants(self, source: Path, base: Path) -> None:
+        from PIL import Image
+
+        base.mkdir(parents=True, exist_ok=True)
+        with Image.open(source) as img:
+            img = img.convert("RGBA") if img.mode in ("P", "LA", "RGBA") else img.convert("RGB")
+            level = 0
+            while True:
+                _atomic_save_npy(base / f"L{level}.npy", np.asarray(img))
+                if min(img.size) // 2 < MIN_VARIANT_SIZE:
+                    break
+                img = img.reduce(2)
+                level += 1
+
+    def radar_levels(self, path: str | Path) -> List[Tuple[int, int]]:
+        """(width, height) of every cached variant; index is the downsampling level."""
+        source = Path(path)
+        _, base = self._radar_paths(source)
+        if not (base / "L0.npy").exists():
+            self._build_radar_variants(source, base)
+        sizes = []
+        level = 0
+        while (base / f"L{level}.npy").exists():
+            arr = self.radar_array(source, level)
+            sizes.append((arr.shape[1], arr.shape[0]))
+            level += 1
+        return sizes
+
+    def radar_array(self, path: str | Path, level: int = 0) -> np.ndarray:
+        """Decoded radar pixels (H, W, C) as a read-only memory map; level k is 2^k smaller."""
+        source = Path(path)
+        key, base = self._radar_paths(source)
+        memo_key = (key, level)
+        if memo_key in self._radars:
+            return self._radars[memo_key]
+        npy = base / f"L{level}.npy"
+        if not npy.exists():
+            self._build_radar_variants(source, base)
+        if not npy.exists():
+            raise ValueError(f"Radar {source} has no variant at level {level}")
+        arr = np.load(npy, mmap_mode="r")
+        self._radars[memo_key] = arr
+        return arr
+
+    def radar_image(self, path: str | Path, min_size: Optional[int] = None):
+        """PIL image of the smallest cached variant at least ``min_size`` wide.
+
+        Returns ``(image, factor)`` where ``factor`` converts full-size radar
+        pixel coordinates into the returned image's pixels.
+        """
+        from PIL import Image
+
+        level = 0
+        if min_size:
+            levels = self.radar_levels(path)
+            while level + 1 < len(levels) and levels[level + 1][0] >= min_size:
+                level += 1
+        full = self.radar_array(path, 0)
+        arr = self.radar_array(path, level)
+        return Image.fromarray(np.asarray(arr)), arr.shape[1] / float(full.shape[1])
+
+
+_shared: Dict[Path, AssetCache] = {}
+
+
+def get_asset_cache(cache_dir: str | Path | None = None) -> AssetCache:
+    """Process-wide AssetCache per directory, shared by every visualize entry point."""
+    key = Path(cache_dir) if cache_dir else DEFAULT_CACHE_DIR
+    if key not in _shared:
+        _shared[key] = AssetCache(key)
+    return _shared[key]
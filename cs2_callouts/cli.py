@@ -1,12 +1,11 @@
 from __future__ import annotations
 
+import os
 import sys
 from pathlib import Path
 
 import click
 
-from .pipeline import process_callouts, read_callouts_json, write_json
-
 
 @click.group()
 def cli():
@@ -19,8 +18,20 @@ def cli():
 @click.option("--map", "map_name", default="de_mirage", help="Map name")
 @click.option("--out-root", default="export", help="Output root directory")
 @click.option("--gltf-format", type=click.Choice(["glb", "gltf"]), default="glb", help="GLTF export format")
-def extract(vpk_path: str, map_name: str, out_root: str, gltf_format: str):
+@click.option("--profile", is_flag=True, help="Record wall/CPU time per stage and VRF subprocess totals to a timings JSON next to the outputs.")
+@click.option("--cprofile", is_flag=True, help="With --profile, also dump cProfile stats (.prof) next to the timings JSON.")
+def extract(vpk_path: str, map_name: str, out_root: str, gltf_format: str, profile: bool, cprofile: bool):
     """Extract callout entities and models from CS2 VPK files."""
+    from .profiling import finish_profile, profiling
+
+    with profiling("extract", enabled=profile or cprofile, cprofile=cprofile) as prof:
+        result = _extract(vpk_path, map_name, out_root, gltf_format)
+    finish_profile(prof, Path(out_root) / "maps" / map_name / "report" / "timings.json", echo=click.echo)
+    return result
+
+
+def _extract(vpk_path: str, map_name: str, out_root: str, gltf_format: str):
+    from .profiling import stage
     from .extract import (
         ensure_vrf_cli, resolve_vpk_paths, decompile_map_and_entities_from_multiple_vpks,
         parse_callout_models, export_models, ensure_dir, info, error
@@ -34,7 +45,8 @@ def extract(vpk_path: str, map_name: str, out_root: str, gltf_format: str):
         cli_dir_path = Path("tools/vrf-cli").resolve()
         
         # Ensure VRF CLI
-        cli_path = ensure_vrf_cli(cli_dir_path)
+        with stage("vrf_cli"):
+            cli_path = ensure_vrf_cli(cli_dir_path)
         info(f"VRF CLI: {cli_path}")
         
         # Resolve VPK paths (including map-specific VPKs)
@@ -46,8 +58,10 @@ def extract(vpk_path: str, map_name: str, out_root: str, gltf_format: str):
         info(f"Using VPKs: {[Path(vpk).name for vpk in vpk_paths]}")
         
         # Decompile and extract from multiple VPKs
-        out_map_dir = decompile_map_and_entities_from_multiple_vpks(cli_path, vpk_paths, map_name, out_root_path)
-        callouts = parse_callout_models(out_map_dir)
+        with stage("decompile"):
+            out_map_dir = decompile_map_and_entities_from_multiple_vpks(cli_path, vpk_paths, map_name, out_root_path)
+        with stage("parse_entities"):
+            callouts = parse_callout_models(out_map_dir)
         
         if not callouts:
             error("No env_cs_place entries found")
@@ -66,7 +80,8 @@ def extract(vpk_path: str, map_name: str, out_root: str, gltf_format: str):
         model_paths = [c['model'] for c in callouts if c.get('model')]
         if model_paths:
             models_out = out_root_path / "models"
-            result = export_models(cli_path, vpk_paths, model_paths, models_out, gltf_format, out_map_dir)
+            with stage("export_models"):
+                result = export_models(cli_path, vpk_paths, model_paths, models_out, gltf_format, out_map_dir)
             info(f"Exported {len(result['exported'])} models")
         
         info("Extraction complete!")
@@ -82,38 +97,201 @@ def extract(vpk_path: str, map_name: str, out_root: str, gltf_format: str):
 @click.option("--models-root", type=click.Path(exists=True, file_okay=False), default="export/models", show_default=True, help="Root folder containing exported GLB/GLTF models.")
 @click.option("--out", "out_path", type=click.Path(), default=None, help="Output JSON path.")
 @click.option("--rotation-order", type=click.Choice(["auto", "rz_rx_ry", "ry_rx_rz", "rz_ry_rx"], case_sensitive=False), default="auto", show_default=True)
-def process(map_name: str, callouts_json: str | None, models_root: str, out_path: str | None, rotation_order: str):
+@click.option("--simplify", "simplify_tolerance", default=None, type=float, help="Also write polygon_2d_simplified, keeping every hull vertex within this many game units.")
+@click.option("--max-vertices", default=None, type=int, help="Vertex budget per simplified polygon (may exceed --simplify; reported).")
+@click.option("--stream", is_flag=True, help="Load one model at a time and free it after hulling its callouts (peak memory ~ largest model).")
+@click.option("--float32", is_flag=True, help="Load and transform vertices in float32 (GLB positions are float32 already); hulls stay float64.")
+@click.option("--check-precision", is_flag=True, help="With --float32, also run in float64 and fail if any hull deviates by more than --precision-tolerance.")
+@click.option("--precision-tolerance", default=0.05, show_default=True, help="Allowed float32 vs float64 hull deviation, game units.")
+@click.option("--profile", is_flag=True, help="Record wall/CPU time per stage and VRF subprocess totals to a timings JSON next to the outputs.")
+@click.option("--cprofile", is_flag=True, help="With --profile, also dump cProfile stats (.prof) next to the timings JSON.")
+@click.option("--memory", is_flag=True, help="With --profile, also record peak RSS, tracemalloc peaks and top allocations per stage, and bytes per cached model (slower).")
+def process(map_name: str, callouts_json: str | None, models_root: str, out_path: str | None, rotation_order: str,
+            simplify_tolerance: float | None, max_vertices: int | None, stream: bool, float32: bool,
+            check_precision: bool, precision_tolerance: float, profile: bool, cprofile: bool, memory: bool):
     """Process extracted callouts into 2D polygon data."""
+    from .pipeline import compare_precision, process_callouts, read_callouts_json, write_json
+    from .profiling import finish_profile, profiling, stage, timings_path_for
+
     if callouts_json is None:
         callouts_json = str(Path("export") / "maps" / map_name / "report" / "callouts_found.json")
     if out_path is None:
         out_path = str(Path("out") / f"{map_name}_callouts.json")
 
-    callouts = read_callouts_json(callouts_json)
-    if not callouts:
-        click.echo(f"No callouts found in {callouts_json}", err=True)
-        sys.exit(1)
-
-    data = process_callouts(callouts, models_root=models_root, rotation_order=rotation_order)
-    write_json(data, out_path, pretty=True)
+    with profiling("process", enabled=profile or cprofile or memory, cprofile=cprofile, memory=memory) as prof:
+        with stage("read_callouts"):
+            callouts = read_callouts_json(callouts_json)
+        if not callouts:
+            click.echo(f"No callouts found in {callouts_json}", err=True)
+            sys.exit(1)
+
+        with stage("process_callouts"):
+            data = process_callouts(callouts, models_root=models_root, rotation_order=rotation_order,
+                                    simplify_tolerance=simplify_tolerance, max_vertices=max_vertices,
+                                    stream=stream, float32=float32)
+        precision = None
+        if check_precision and float32:
+            with stage("check_precision"):
+                reference = process_callouts(callouts, models_root=models_root, rotation_order=rotation_order, stream=stream)
+                precision = compare_precision(reference, data, tolerance=precision_tolerance)
+        with stage("write_json"):
+            write_json(data, out_path, pretty=True)
     click.echo(f"Wrote {out_path} with {data['count']} callouts. Rotation order: {data['rotation_order']}")
     if data.get("missing_models"):
         click.echo(f"Missing models: {len(data['missing_models'])}")
+    if data.get("simplification"):
+        _echo_simplification(data["simplification"])
+    finish_profile(prof, timings_path_for(out_path), echo=click.echo)
+    if check_precision and not float32:
+        click.echo("--check-precision only applies with --float32", err=True)
+    if precision is not None:
+        click.echo(
+            f"float32 vs float64: max hull deviation {precision['max_deviation']:.4g} units "
+            f"({precision['worst']}), max area error {precision['max_area_error']:.3g}"
+        )
+        if not precision["ok"]:
+            reasons = []
+            if not precision["same_rotation_order"]:
+                reasons.append("rotation order differs")
+            if not precision["same_callouts"]:
+                reasons.append("hulled callouts differ")
+            if precision["over_tolerance"]:
+                reasons.append(f"{precision['over_tolerance']} hull(s) exceed {precision_tolerance} units")
+            click.echo(f"Precision check failed: {', '.join(reasons)}", err=True)
+            sys.exit(1)
+
+
+def _echo_simplification(summary: dict) -> None:
+    click.echo(
+        f"Simplified {summary['vertices_before']} -> {summary['vertices_after']} vertices "
+        f"({summary['reduction']:.1%} fewer), max area error {summary['max_abs_area_error']:.3%}"
+        + (f"; {summary['over_tolerance']} callout(s) exceed the tolerance to meet --max-vertices" if summary["over_tolerance"] else "")
+    )
+
+
+@cli.command()
+@click.option("--json", "json_path", required=True, type=click.Path(exists=True), help="Path to <map>_callouts.json produced by process.")
+@click.option("--tolerance", default=2.0, show_default=True, help="Keep every hull vertex within this many game units of the simplified polygon.")
+@click.option("--max-vertices", default=None, type=int, help="Vertex budget per polygon (may exceed --tolerance; reported).")
+@click.option("--out", "out_path", default=None, type=click.Path(), help="Output JSON (default: update --json in place).")
+def simplify(json_path: str, tolerance: float, max_vertices: int | None, out_path: str | None):
+    """Add polygon_2d_simplified to an existing callouts file and report the vertex/area trade-off."""
+    from .pipeline import write_json
+    from .simplify import simplify_callouts
+    from .render import load_output
+
+    data = load_output(json_path)
+    summary = simplify_callouts(data, tolerance=tolerance, max_vertices=max_vertices)
+    write_json(data, out_path or json_path, pretty=True)
+    click.echo(f"Wrote {out_path or json_path}")
+    _echo_simplification(summary)
+
+
+@cli.command()
+@click.option("--json", "json_path", required=True, type=click.Path(exists=True), help="Path to <map>_callouts.json produced by process.")
+@click.option("--out", "out_path", default=None, type=click.Path(), help="Output file (default: <map>_callouts.compact.json next to --json).")
+@click.option("--space", type=click.Choice(["world", "radar"]), default="world", show_default=True, help="Quantize in game units or in radar pixels (needs map metadata).")
+@click.option("--step", default=None, type=float, help="Grid step in --space units (default: 1.0 game unit, 0.25 radar px).")
+@click.option("--map-data", default=None, type=click.Path(exists=True), help="Optional map-data.json with radar positioning metadata.")
+@click.option("--cache-dir", default=None, type=click.Path(file_okay=False), help="Asset cache for map metadata (default: .cache/cs2_callouts).")
+@click.option("--polygon-key", default="polygon_2d", show_default=True, help="Polygon field to use, e.g. polygon_2d_simplified from process --simplify.")
+def compact(json_path: str, out_path: str | None, space: str, step: float | None, map_data: str | None,
+            cache_dir: str | None, polygon_key: str):
+    """Write a quantized, delta-encoded callouts file for web clients and report size and parse time."""
+    from .compact import compact_path_for, encode_compact, size_report, write_compact
+    from .render import load_output
+
+    data = load_output(json_path)
+    map_metadata = _load_map_metadata(json_path, map_data, cache_dir) if space == "radar" else None
+    if space == "radar" and not map_metadata:
+        raise click.ClickException("--space radar needs map metadata; pass --map-data")
+    doc = encode_compact(data, space=space, step=step, map_metadata=map_metadata, polygon_key=polygon_key)
+    out = write_compact(doc, out_path or compact_path_for(json_path))
+    report = size_report(data, doc, polygon_key=polygon_key)
+    click.echo(f"Wrote {out} ({report['callouts']} callouts, {space} grid step {doc['transform']['scale'][0]:g})")
+    for name, s in report["sizes"].items():
+        click.echo(f"  {name:<9} {s['bytes']:>10,} bytes  {s['gzip_bytes']:>9,} gzipped  parse {report['parse_s'][name] * 1000:7.2f} ms")
+    click.echo(f"  {'+ decode':<9} {'':>10}{'':8}{'':>9}{'':10}parse {report['parse_s']['compact_decoded'] * 1000:7.2f} ms")
+    click.echo(
+        f"{report['size_reduction']:.1%} smaller than pretty JSON ({report['gzip_size_reduction']:.1%} gzipped), "
+        f"parses {report['parse_speedup']}x faster ({report['decoded_speedup']}x with decoding); "
+        f"max round-trip error {report['max_error']:.3f} units"
+    )
+
+
+@cli.command()
+@click.option("--map", "map_name", default="de_mirage", show_default=True, help="Map name used for path defaults.")
+@click.option("--callouts-json", default=None, type=click.Path(exists=True), help="Processed <map>_callouts.json (default: out/<map>_callouts.json).")
+@click.option("--out", "out_path", default=None, type=click.Path(), help="Output graph JSON (default: next to the callouts file as <map>_graph.json).")
+@click.option("--tolerance", default=16.0, show_default=True, help="Hulls closer than this many game units are neighbours.")
+def graph(map_name: str, callouts_json: str | None, out_path: str | None, tolerance: float):
+    """Build the callout adjacency graph with precomputed shortest routes."""
+    from .graph import build_graph_file
+
+    if callouts_json is None:
+        callouts_json = str(Path("out") / f"{map_name}_callouts.json")
+    if not Path(callouts_json).exists():
+        click.echo(f"Callouts file not found: {callouts_json}", err=True)
+        sys.exit(1)
+    g, out = build_graph_file(callouts_json, out_path=out_path, tolerance=tolerance)
+    connected = int((g.next_hop >= 0).sum() - len(g))
+    click.echo(f"Wrote {out}: {len(g)} callouts, {len(g.edges)} adjacencies, {connected} connected ordered pairs")
+
+
+@cli.command()
+@click.option("--map", "map_name", default="de_mirage", show_default=True, help="Map name used for path defaults.")
+@click.option("--callouts-json", default=None, type=click.Path(exists=True), help="Processed <map>_callouts.json (default: out/<map>_callouts.json).")
+@click.option("--zones", "zones_json", default=None, type=click.Path(exists=True), help="inferno.json-style file with a priority per zone name (default: smallest area wins).")
+@click.option("--cell-size", default=16.0, show_default=True, help="Raster cell size in game units.")
+@click.option("--out", "out_path", default=None, type=click.Path(), help="Output .npz (default: next to the callouts file as <map>_partition.npz).")
+@click.option("--polygon-key", default="polygon_2d", show_default=True, help="Polygon field to use, e.g. polygon_2d_simplified from process --simplify.")
+def partition(map_name: str, callouts_json: str | None, zones_json: str | None, cell_size: float, out_path: str | None,
+              polygon_key: str):
+    """Resolve overlapping callouts once into a disjoint label raster for fast lookups."""
+    from .partition import build_partition_file
+
+    if callouts_json is None:
+        callouts_json = str(Path("out") / f"{map_name}_callouts.json")
+    if not Path(callouts_json).exists():
+        click.echo(f"Callouts file not found: {callouts_json}", err=True)
+        sys.exit(1)
+    part, out = build_partition_file(callouts_json, zones_json=zones_json, out_path=out_path, cell_size=cell_size,
+                                     polygon_key=polygon_key)
+    ny, nx = part.labels.shape
+    click.echo(
+        f"Wrote {out}: {nx}x{ny} cells of {cell_size:g} units, "
+        f"{part.boundary_fraction:.1%} on a boundary (exact test)"
+    )
 
 
 @cli.command()
 @click.option("--map", "map_name", default="de_mirage", help="Map name for full pipeline")
 @click.option("--vpk-path", default="", help="Path to CS2 VPK file (auto-detected if not provided)")
 @click.option("--gltf-format", type=click.Choice(["glb", "gltf"]), default="glb", help="GLTF export format")
-def pipeline(map_name: str, vpk_path: str, gltf_format: str):
+@click.option("--profile", is_flag=True, help="Record wall/CPU time per stage and VRF subprocess totals to a timings JSON next to the outputs.")
+@click.option("--cprofile", is_flag=True, help="With --profile, also dump cProfile stats (.prof) next to the timings JSON.")
+@click.option("--memory", is_flag=True, help="With --profile, also record peak RSS, tracemalloc peaks and top allocations per stage, and bytes per cached model (slower).")
+def pipeline(map_name: str, vpk_path: str, gltf_format: str, profile: bool, cprofile: bool, memory: bool):
     """Run the complete extraction and processing pipeline."""
+    from .profiling import finish_profile, profiling, timings_path_for
+
+    with profiling("pipeline", enabled=profile or cprofile or memory, cprofile=cprofile, memory=memory) as prof:
+        result = _pipeline(map_name, vpk_path, gltf_format)
+    finish_profile(prof, timings_path_for(Path("out") / f"{map_name}_callouts.json"), echo=click.echo)
+    return result
+
+
+def _pipeline(map_name: str, vpk_path: str, gltf_format: str):
+    from .profiling import stage
+
     click.echo(f"Running complete pipeline for {map_name}...")
     
     # Step 1: Extract
     click.echo("Step 1: Extracting callout data...")
     ctx = click.get_current_context()
     try:
-        result = ctx.invoke(extract, vpk_path=vpk_path, map_name=map_name, out_root="export", gltf_format=gltf_format)
+        with stage("extract"):
+            result = ctx.invoke(extract, vpk_path=vpk_path, map_name=map_name, out_root="export", gltf_format=gltf_format)
         if result and result != 0:
             click.echo("❌ Extraction failed, stopping pipeline.")
             return result
@@ -131,7 +309,8 @@ def pipeline(map_name: str, vpk_path: str, gltf_format: str):
     # Step 2: Process
     click.echo("Step 2: Processing polygons...")
     try:
-        result = ctx.invoke(process, map_name=map_name, callouts_json=None, models_root="export/models", out_path=None, rotation_order="auto")
+        with stage("process"):
+            result = ctx.invoke(process, map_name=map_name, callouts_json=None, models_root="export/models", out_path=None, rotation_order="auto")
         if result and result != 0:
             click.echo("❌ Processing failed.")
             return result
@@ -139,6 +318,18 @@ def pipeline(map_name: str, vpk_path: str, gltf_format: str):
         click.echo(f"❌ Processing failed: {e}")
         return 1
     
+    # Step 3: Adjacency graph and routes
+    click.echo("Step 3: Building callout graph...")
+    try:
+        with stage("graph"):
+            result = ctx.invoke(graph, map_name=map_name, callouts_json=None, out_path=None, tolerance=16.0)
+        if result and result != 0:
+            click.echo("❌ Graph build failed.")
+            return result
+    except Exception as e:
+        click.echo(f"❌ Graph build failed: {e}")
+        return 1
+
     click.echo(f"✅ Pipeline complete!")
 
 
@@ -162,7 +353,7 @@ def clean(exclude_tools: bool, exclude_caches: bool, dry_run: bool):
     
     # Cache directories (removed by default)
     if not exclude_caches:
-        for cache_name in ['.pytest_cache', '.mypy_cache']:
+        for cache_name in ['.pytest_cache', '.mypy_cache', '.cache/cs2_callouts']:
             cache_path = root / cache_name
             if cache_path.exists():
                 targets.append(cache_path)
@@ -271,6 +462,29 @@ def run_map(map_name: str, out_json: str, models_root: str, vpk_path: str):
     click.echo(click.style(f"✅ Map processing complete for {map_name}!", fg='green'))
 
 
+def _load_map_metadata(json_path: str, map_data: str | None, cache_dir: str | None = None):
+    """Find the awpy map-data.json entry for the map behind ``<map>_callouts.json``."""
+    from pathlib import Path
+    from .assets import get_asset_cache
+
+    cache = get_asset_cache(cache_dir)
+    metadata_file = cache.find_map_data(map_data)
+    if not metadata_file:
+        return None
+    # Extract map name from JSON path (e.g., "de_mirage_callouts.json" -> "de_mirage")
+    map_name = Path(json_path).stem.replace('_callouts', '')
+    try:
+        map_metadata = cache.map_metadata(map_name, metadata_file)
+    except Exception as e:
+        click.echo(f"Warning: Could not load map metadata: {e}")
+        return None
+    if map_metadata:
+        click.echo(f"Using map metadata for {map_name}: scale={map_metadata['scale']}, pos_x={map_metadata['pos_x']}, pos_y={map_metadata['pos_y']}")
+    else:
+        click.echo(f"No metadata found for {map_name} in {metadata_file}")
+    return map_metadata
+
+
 @cli.command()
 @click.option("--json", "json_path", required=True, type=click.Path(exists=True), help="Path to <map>_callouts.json produced by the pipeline.")
 @click.option("--radar", default=None, type=click.Path(exists=True), help="Optional radar image to draw underneath; mapped to world bounds.")
@@ -280,116 +494,106 @@ def run_map(map_name: str, out_json: str, models_root: str, vpk_path: str):
 @click.option("--invert-y/--no-invert-y", default=False, show_default=True, help="Invert Y axis to match image pixel coordinates if needed.")
 @click.option("--alpha", default=0.35, show_default=True, help="Polygon fill alpha.")
 @click.option("--linewidth", default=1.0, show_default=True, help="Polygon edge line width.")
-def visualize(json_path: str, radar: str, map_data: str, out_path: str, labels: bool, invert_y: bool, alpha: float, linewidth: float):
+@click.option("--renderer", type=click.Choice(["matplotlib", "pillow"]), default="matplotlib", show_default=True, help="pillow draws straight onto the radar in pixel space (fast, no axes); requires --out.")
+@click.option("--size", default=None, type=int, help="Output width/height in pixels for the pillow renderer (default: radar size).")
+@click.option("--cache-dir", default=None, type=click.Path(file_okay=False), help="Asset cache for decoded radars and map metadata (default: .cache/cs2_callouts).")
+@click.option("--polygon-key", default="polygon_2d", show_default=True, help="Polygon field to use, e.g. polygon_2d_simplified from process --simplify.")
+@click.option("--profile", is_flag=True, help="Record wall/CPU time per stage and VRF subprocess totals to a timings JSON next to the outputs.")
+@click.option("--cprofile", is_flag=True, help="With --profile, also dump cProfile stats (.prof) next to the timings JSON.")
+def visualize(json_path: str, radar: str, map_data: str, out_path: str, labels: bool, invert_y: bool, alpha: float, linewidth: float, renderer: str, size: int | None, cache_dir: str | None, polygon_key: str,
+              profile: bool, cprofile: bool):
     """Generate overlay PNG (with optional radar underlay)."""
-    from .visualize import _load_output, _centroid, _color_for_name
-    import matplotlib.pyplot as plt
-    from matplotlib.patches import Polygon as MplPolygon
+    from .profiling import finish_profile, profiling, timings_path_for
+
+    with profiling("visualize", enabled=profile or cprofile, cprofile=cprofile) as prof:
+        _visualize(json_path, radar, map_data, out_path, labels, invert_y, alpha, linewidth, renderer, size, cache_dir, polygon_key)
+    timings = timings_path_for(out_path) if out_path else Path(json_path).with_name("visualize_timings.json")
+    finish_profile(prof, timings, echo=click.echo)
+
+
+def _visualize(json_path: str, radar: str, map_data: str, out_path: str, labels: bool, invert_y: bool, alpha: float, linewidth: float, renderer: str, size: int | None, cache_dir: str | None, polygon_key: str):
+    from .assets import get_asset_cache
+    from .profiling import stage
+    from .render import callout_polygons, flatten_polygons, load_output
     from pathlib import Path
-    import json
     
-    data = _load_output(json_path)
-    items = data.get("callouts", [])
-    polys = [it.get("polygon_2d") or [] for it in items]
+    cache = get_asset_cache(cache_dir)
+    with stage("load_callouts"):
+        data = load_output(json_path)
+        items = data.get("callouts", [])
+        polys = callout_polygons(items, polygon_key)
+        names = [it.get("name") or it.get("placename") or "?" for it in items]
+        vertices, offsets = flatten_polygons(polys)
 
     # Compute world bounds from polygons
-    xs = []
-    ys = []
-    for poly in polys:
-        for x, y in poly:
-            xs.append(float(x))
-            ys.append(float(y))
-    if not xs or not ys:
+    if len(vertices) == 0:
         click.echo("No polygon data to visualize.", err=True)
         raise SystemExit(1)
-    min_x, max_x = min(xs), max(xs)
-    min_y, max_y = min(ys), max(ys)
+    min_x, min_y = vertices.min(axis=0).tolist()
+    max_x, max_y = vertices.max(axis=0).tolist()
+
+    with stage("map_metadata"):
+        map_metadata = _load_map_metadata(json_path, map_data, cache_dir)
+
+    if renderer == "pillow":
+        from .raster import render_callouts_image
+
+        if not out_path:
+            click.echo("The pillow renderer needs --out.", err=True)
+            raise SystemExit(1)
+        with stage("radar"):
+            radar_img, pixel_scale = cache.radar_image(radar, min_size=size) if radar else (None, 1.0)
+        with stage("render"):
+            img = render_callouts_image(
+                data,
+                radar=radar_img,
+                map_metadata=map_metadata,
+                pixel_scale=pixel_scale,
+                polygon_key=polygon_key,
+                size=(size, size) if size else None,
+                alpha=alpha,
+                linewidth=linewidth,
+                labels=labels,
+            )
+        with stage("save"):
+            Path(out_path).parent.mkdir(parents=True, exist_ok=True)
+            img.save(out_path)
+        click.echo(f"Saved {out_path}")
+        return
 
-    # Load map metadata if provided
-    map_metadata = None
-    if map_data:
-        metadata_file = map_data
-    else:
-        # Try to auto-detect map-data.json in common locations
-        common_locations = [
-            "map-data.json",  # Current directory
-            "C:/Users/mwrid/.awpy/maps/map-data.json",  # User's awpy directory
-            Path.home() / ".awpy/maps/map-data.json"  # Generic user awpy directory
-        ]
-        metadata_file = None
-        for location in common_locations:
-            if Path(location).exists():
-                metadata_file = str(location)
-                break
-    
-    if metadata_file:
-        try:
-            with open(metadata_file, 'r') as f:
-                all_metadata = json.load(f)
-                # Extract map name from JSON path (e.g., "de_mirage_callouts.json" -> "de_mirage")
-                map_name = Path(json_path).stem.replace('_callouts', '')
-                map_metadata = all_metadata.get(map_name)
-                if map_metadata:
-                    click.echo(f"Using map metadata for {map_name}: scale={map_metadata['scale']}, pos_x={map_metadata['pos_x']}, pos_y={map_metadata['pos_y']}")
-                else:
-                    click.echo(f"No metadata found for {map_name} in {metadata_file}")
-        except Exception as e:
-            click.echo(f"Warning: Could not load map metadata: {e}")
+    from .render import draw_callouts, use_noninteractive_backend
+    from .transform import transform_for
+    if out_path:
+        use_noninteractive_backend()
+    import matplotlib.pyplot as plt
 
     fig, ax = plt.subplots(figsize=(12, 12))
     
     if radar and map_metadata:
-        from PIL import Image
+        # Transform all callout coordinates to radar pixel coordinates in one pass (awpy's method)
+        vertices = transform_for(map_metadata).to_pixel(vertices)
+        pixel_min_x, pixel_min_y = vertices.min(axis=0).tolist()
+        pixel_max_x, pixel_max_y = vertices.max(axis=0).tolist()
         
-        # Use awpy-style coordinate transformation
-        scale = map_metadata['scale']
-        pos_x = map_metadata['pos_x']
-        pos_y = map_metadata['pos_y']
+        # Load radar image and set it to cover the standard 1024x1024 pixel space
+        with stage("radar"):
+            img = cache.radar_array(radar)
+        radar_height, radar_width = img.shape[:2]
         
-        # Transform callout coordinates to radar pixel coordinates using awpy's method
-        def game_to_pixel_x(game_x):
-            return (game_x - pos_x) / scale
-            
-        def game_to_pixel_y(game_y):
-            return (pos_y - game_y) / scale  # Y is inverted in awpy
+        # Radar image maps to pixel coordinates (0,0) to (radar_width, radar_height)
+        ax.imshow(img, extent=[0, radar_width, 0, radar_height], alpha=0.7, origin='lower')
         
-        # Transform all callout coordinates to pixel coordinates
-        pixel_xs = []
-        pixel_ys = []
-        for poly in polys:
-            for x, y in poly:
-                pixel_x = game_to_pixel_x(float(x))
-                pixel_y = game_to_pixel_y(float(y))
-                pixel_xs.append(pixel_x)
-                pixel_ys.append(pixel_y)
+        # Set plot bounds to show the callouts in pixel coordinates with some padding
+        padding = 50
+        plot_min_x = max(0, pixel_min_x - padding)
+        plot_max_x = min(radar_width, pixel_max_x + padding)
+        plot_min_y = max(0, pixel_min_y - padding)
+        plot_max_y = min(radar_height, pixel_max_y + padding)
         
-        if pixel_xs and pixel_ys:
-            pixel_min_x, pixel_max_x = min(pixel_xs), max(pixel_xs)
-            pixel_min_y, pixel_max_y = min(pixel_ys), max(pixel_ys)
-            
-            # Load radar image and set it to cover the standard 1024x1024 pixel space
-            img = Image.open(radar)
-            radar_width, radar_height = img.size
-            
-            # Radar image maps to pixel coordinates (0,0) to (radar_width, radar_height)
-            ax.imshow(img, extent=[0, radar_width, 0, radar_height], alpha=0.7, origin='lower')
-            
-            # Set plot bounds to show the callouts in pixel coordinates with some padding
-            padding = 50
-            plot_min_x = max(0, pixel_min_x - padding)
-            plot_max_x = min(radar_width, pixel_max_x + padding)
-            plot_min_y = max(0, pixel_min_y - padding)
-            plot_max_y = min(radar_height, pixel_max_y + padding)
-            
-            click.echo(f"Transformed to pixel coords: X={pixel_min_x:.1f} to {pixel_max_x:.1f}, Y={pixel_min_y:.1f} to {pixel_max_y:.1f}")
-        else:
-            # Fallback to full radar
-            plot_min_x, plot_max_x = 0, img.size[0]
-            plot_min_y, plot_max_y = 0, img.size[1]
-            ax.imshow(img, extent=[plot_min_x, plot_max_x, plot_min_y, plot_max_y], alpha=0.7)
+        click.echo(f"Transformed to pixel coords: X={pixel_min_x:.1f} to {pixel_max_x:.1f}, Y={pixel_min_y:.1f} to {pixel_max_y:.1f}")
     elif radar:
-        from PIL import Image
-        img = Image.open(radar)
+        with stage("radar"):
+            img = cache.radar_array(radar)
         # Fallback: map radar to callout bounds
         plot_min_x, plot_max_x = min_x, max_x
         plot_min_y, plot_max_y = min_y, max_y
@@ -399,29 +603,8 @@ def visualize(json_path: str, radar: str, map_data: str, out_path: str, labels:
         plot_min_x, plot_max_x = min_x, max_x
         plot_min_y, plot_max_y = min_y, max_y
 
-    for it, poly in zip(items, polys):
-        if not poly:
-            continue
-        name = it.get("name") or it.get("placename") or "?"
-        color = _color_for_name(name)
-        
-        # Transform polygon coordinates if we have map metadata
-        if radar and map_metadata:
-            # Transform to pixel coordinates
-            pixel_poly = []
-            for x, y in poly:
-                pixel_x = (float(x) - map_metadata['pos_x']) / map_metadata['scale']
-                pixel_y = (map_metadata['pos_y'] - float(y)) / map_metadata['scale']  # Y inverted
-                pixel_poly.append([pixel_x, pixel_y])
-            poly_to_plot = pixel_poly
-        else:
-            poly_to_plot = poly
-            
-        patch = MplPolygon(poly_to_plot, closed=True, facecolor=color + (alpha,), edgecolor=color, linewidth=linewidth)
-        ax.add_patch(patch)
-        if labels:
-            cx, cy = _centroid(poly_to_plot)
-            ax.text(cx, cy, name, fontsize=7, color="black", ha="center", va="center", bbox=dict(boxstyle="round,pad=0.1", fc="white", ec="none", alpha=0.6))
+    with stage("render"):
+        draw_callouts(ax, vertices, offsets, names, alpha=alpha, linewidth=linewidth, labels=labels)
 
     ax.set_xlim(plot_min_x, plot_max_x)
     ax.set_ylim(plot_min_y, plot_max_y)
@@ -435,12 +618,348 @@ def visualize(json_path: str, radar: str, map_data: str, out_path: str, labels:
 
     if out_path:
         Path(out_path).parent.mkdir(parents=True, exist_ok=True)
-        fig.savefig(out_path, dpi=200, bbox_inches="tight")
+        with stage("save"):
+            fig.savefig(out_path, dpi=200, bbox_inches="tight")
         click.echo(f"Saved {out_path}")
     else:
         plt.show()
 
 
+@cli.command()
+@click.option("--json", "json_path", required=True, type=click.Path(exists=True), help="Path to <map>_callouts.json produced by the pipeline.")
+@click.option("--radar", default=None, type=click.Path(exists=True), help="Radar image to tile underneath the callouts.")
+@click.option("--map-data", default=None, type=click.Path(exists=True), help="Optional map-data.json with radar positioning metadata.")
+@click.option("--out-dir", default=None, type=click.Path(file_okay=False), help="Tile output directory (default: out/tiles/<map>).")
+@click.option("--max-zoom", default=4, show_default=True, help="Deepest zoom level; level z has 2^z x 2^z tiles of 256px.")
+@click.option("--sparse-from", default=2, show_default=True, help="From this zoom on, only tiles touching a callout are rendered.")
+@click.option("--workers", default=None, type=int, help="Parallel tile writers (default: CPU count).")
+@click.option("--labels/--no-labels", default=True, show_default=True, help="Draw callout names on tiles.")
+@click.option("--label-min-zoom", default=2, show_default=True, help="Lowest zoom level that gets labels.")
+@click.option("--alpha", default=0.35, show_default=True, help="Polygon fill alpha.")
+@click.option("--linewidth", default=1.0, show_default=True, help="Polygon edge line width.")
+@click.option("--cache-dir", default=None, type=click.Path(file_okay=False), help="Asset cache for decoded radars and map metadata (default: .cache/cs2_callouts).")
+@click.option("--polygon-key", default="polygon_2d", show_default=True, help="Polygon field to use, e.g. polygon_2d_simplified from process --simplify.")
+def tiles(json_path: str, radar: str | None, map_data: str | None, out_dir: str | None, max_zoom: int, sparse_from: int,
+          workers: int | None, labels: bool, label_min_zoom: int, alpha: float, linewidth: float, cache_dir: str | None,
+          polygon_key: str):
+    """Export an XYZ tile pyramid ({z}/{x}/{y}.png) of the radar overlay for web viewers."""
+    from .assets import get_asset_cache
+    from .raster import DEFAULT_SIZE, fit_to_canvas
+    from .render import callout_polygons, flatten_polygons, load_output
+    from .tiles import build_tile_pyramid
+    from .transform import transform_for
+
+    data = load_output(json_path)
+    items = data.get("callouts", [])
+    names = [it.get("name") or it.get("placename") or "?" for it in items]
+    vertices, offsets = flatten_polygons(callout_polygons(items, polygon_key))
+    if len(vertices) == 0:
+        click.echo("No polygon data to tile.", err=True)
+        raise SystemExit(1)
+
+    map_metadata = _load_map_metadata(json_path, map_data, cache_dir)
+    radar_img = get_asset_cache(cache_dir).radar_image(radar)[0] if radar else None
+    if map_metadata:
+        vertices_px = transform_for(map_metadata).to_pixel(vertices)
+    else:
+        click.echo("No radar transform available; fitting callouts to the tile canvas.")
+        vertices_px = fit_to_canvas(vertices, radar_img.size if radar_img else (DEFAULT_SIZE, DEFAULT_SIZE))
+
+    if out_dir is None:
+        out_dir = str(Path("out") / "tiles" / Path(json_path).stem.replace("_callouts", ""))
+    stats = build_tile_pyramid(
+        out_dir,
+        vertices_px,
+        offsets,
+        names,
+        radar=radar_img,
+        max_zoom=max_zoom,
+        sparse_from=sparse_from,
+        alpha=alpha,
+        linewidth=linewidth,
+        labels=labels,
+        label_min_zoom=label_min_zoom,
+        workers=workers,
+    )
+    click.echo(
+        f"Tiles in {out_dir}: {stats['planned']} planned, {stats['rendered']} rendered, "
+        f"{stats['skipped']} unchanged, {stats['removed']} removed"
+    )
+
+
+@cli.command()
+@click.option("--positions", required=True, type=click.Path(exists=True, dir_okay=False), help="Player positions table (CSV, CSV.gz or Parquet), e.g. an awpy ticks export.")
+@click.option("--map", "map_name", default="de_mirage", show_default=True, help="Map name used for path defaults.")
+@click.option("--callouts-json", default=None, type=click.Path(exists=True), help="Processed <map>_callouts.json (default: out/<map>_callouts.json).")
+@click.option("--out", "out_path", default=None, type=click.Path(), help="Labelled output table (default: <positions>_labeled with the same format).")
+@click.option("--chunk-size", default=250_000, show_default=True, help="Rows per chunk; bounds memory use.")
+@click.option("--x-col", default=None, help="X column (default: x or X).")
+@click.option("--y-col", default=None, help="Y column (default: y or Y).")
+@click.option("--label-col", default="callout", show_default=True, help="Name of the added callout column.")
+@click.option("--workers", default=1, show_default=True, help="Lookup processes sharing one index in shared memory (0 = all cores).")
+@click.option("--snap-distance", default=None, type=float, help="Give points outside every callout the nearest one within this many game units.")
+@click.option("--partition", "partition_path", default=None, type=click.Path(exists=True, dir_okay=False), help="Priority-resolved <map>_partition.npz from the partition command (single worker).")
+@click.option("--polygon-key", default="polygon_2d", show_default=True, help="Polygon field to use, e.g. polygon_2d_simplified from process --simplify.")
+@click.option("--quiet", is_flag=True, help="Only print the final summary.")
+def label(positions: str, map_name: str, callouts_json: str | None, out_path: str | None, chunk_size: int,
+          x_col: str | None, y_col: str | None, label_col: str, workers: int, snap_distance: float | None,
+          partition_path: str | None, polygon_key: str, quiet: bool):
+    """Label player positions with the callout they stand in, streaming in fixed-size chunks."""
+    from .labeling import StreamSummary, stream_label
+    from .lookup import CalloutIndex
+
+    if callouts_json is None:
+        callouts_json = str(Path("out") / f"{map_name}_callouts.json")
+    if not Path(callouts_json).exists():
+        click.echo(f"Callouts file not found: {callouts_json}", err=True)
+        sys.exit(1)
+    if out_path is None:
+        src = Path(positions)
+        suffixes = "".join(src.suffixes)
+        out_path = str(src.with_name(src.name[: len(src.name) - len(suffixes)] + "_labeled" + suffixes))
+
+    index = CalloutIndex.from_json(callouts_json, polygon_key=polygon_key)
+    summary = StreamSummary()
+    labelled_rows = 0
+    if workers == 0:
+        workers = os.cpu_count() or 1
+    resolver = index
+    if partition_path:
+        from .partition import CalloutPartition
+
+        if workers > 1:
+            raise click.UsageError("--partition labels in-process; drop --workers")
+        try:
+            resolver = CalloutPartition.load(partition_path, index)
+        except ValueError as e:
+            raise click.ClickException(str(e))
+    for chunk, stats in stream_label(positions, resolver, out_path=out_path, chunk_size=chunk_size,
+                                     x_col=x_col, y_col=y_col, label_col=label_col, summary=summary,
+                                     workers=workers, snap_distance=snap_distance):
+        labelled_rows += int((chunk.columns[label_col] != "").sum())
+        if not quiet:
+            click.echo(
+                f"chunk {stats.index}: {stats.rows} rows in {stats.total_s * 1000:.1f} ms "
+                f"(read {stats.read_s * 1000:.1f} / label {stats.label_s * 1000:.1f} / write {stats.write_s * 1000:.1f} ms, "
+                f"{stats.rows_per_s:,.0f} rows/s)"
+            )
+    pct = summary.latency_percentiles()
+    click.echo(
+        f"Wrote {out_path}: {summary.rows} rows, {labelled_rows} inside a callout; "
+        f"{summary.rows_per_s:,.0f} rows/s over {len(summary.chunks)} chunks "
+        f"(chunk latency p50 {pct['p50'] * 1000:.1f} ms, p99 {pct['p99'] * 1000:.1f} ms)"
+    )
+
+
+@cli.command()
+@click.option("--positions", required=True, type=click.Path(exists=True, dir_okay=False), help="Player positions table (CSV, CSV.gz or Parquet), e.g. an awpy ticks export.")
+@click.option("--map", "map_name", default="de_mirage", show_default=True, help="Map name used for path defaults.")
+@click.option("--callouts-json", default=None, type=click.Path(exists=True), help="Processed <map>_callouts.json (default: out/<map>_callouts.json).")
+@click.option("--out", "out_path", default=None, type=click.Path(), help="Visits table (default: <positions>_visits with the same format).")
+@click.option("--stats-out", default=None, type=click.Path(), help="Dwell/transition JSON (default: <positions>_callout_stats.json).")
+@click.option("--chunk-size", default=250_000, show_default=True, help="Rows per chunk; bounds memory use.")
+@click.option("--x-col", default=None, help="X column (default: x or X).")
+@click.option("--y-col", default=None, help="Y column (default: y or Y).")
+@click.option("--player-col", default=None, help="Player column (default: steamid, player or name).")
+@click.option("--tick-col", default=None, help="Tick column (default: tick).")
+@click.option("--max-gap", default=None, type=int, help="End a visit when a player's samples are more than this many ticks apart.")
+@click.option("--snap-distance", default=None, type=float, help="Give points outside every callout the nearest one within this many game units.")
+@click.option("--tickrate", default=64.0, show_default=True, help="Ticks per second, for dwell times in seconds.")
+@click.option("--top", default=10, show_default=True, help="Callouts to list by total dwell.")
+def trajectories(positions: str, map_name: str, callouts_json: str | None, out_path: str | None, stats_out: str | None,
+                 chunk_size: int, x_col: str | None, y_col: str | None, player_col: str | None, tick_col: str | None,
+                 max_gap: int | None, snap_distance: float | None, tickrate: float, top: int):
+    """Segment player paths into callout visits and aggregate dwell time and transitions."""
+    import json
+
+    from .labeling import StreamSummary
+    from .lookup import CalloutIndex
+    from .trajectory import VisitTracker, stream_visits
+
+    if callouts_json is None:
+        callouts_json = str(Path("out") / f"{map_name}_callouts.json")
+    if not Path(callouts_json).exists():
+        click.echo(f"Callouts file not found: {callouts_json}", err=True)
+        sys.exit(1)
+    src = Path(positions)
+    suffixes = "".join(src.suffixes)
+    stem = src.name[: len(src.name) - len(suffixes)]
+    if out_path is None:
+        out_path = str(src.with_name(stem + "_visits" + suffixes))
+    if stats_out is None:
+        stats_out = str(src.with_name(stem + "_callout_stats.json"))
+
+    index = CalloutIndex.from_json(callouts_json)
+    tracker = VisitTracker(index.names, max_gap=max_gap)
+    summary = StreamSummary()
+    visits = 0
+    for chunk_visits, _ in stream_visits(positions, index, tracker=tracker, out_path=out_path, chunk_size=chunk_size,
+                                         x_col=x_col, y_col=y_col, player_col=player_col, tick_col=tick_col,
+                                         snap_distance=snap_distance, summary=summary):
+        visits += len(chunk_visits)
+    Path(stats_out).parent.mkdir(parents=True, exist_ok=True)
+    Path(stats_out).write_text(json.dumps(tracker.to_dict(tickrate=tickrate, missing="<outside>")), encoding="utf-8")
+    click.echo(
+        f"Wrote {out_path}: {visits} visits by {len(tracker.players)} players from {summary.rows} rows "
+        f"({summary.rows_per_s:,.0f} rows/s); aggregates in {stats_out}"
+    )
+    for row in tracker.dwell_table(tickrate=tickrate, missing="<outside>")[:top]:
+        click.echo(f"  {row['callout']:<24} {row['dwell_s']:>10.1f} s over {row['visits']:>6} visits (mean {row['mean_dwell_s']:.2f} s)")
+
+
+@cli.command()
+@click.option("--positions", multiple=True, type=click.Path(exists=True, dir_okay=False), help="Player positions table(s) to add (CSV, CSV.gz or Parquet); repeat for several demos.")
+@click.option("--map", "map_name", default="de_mirage", show_default=True, help="Map name used for path defaults.")
+@click.option("--callouts-json", default=None, type=click.Path(exists=True), help="Processed <map>_callouts.json (default: out/<map>_callouts.json).")
+@click.option("--accumulator", default=None, type=click.Path(dir_okay=False), help="On-disk counts, extended on every run (default: <map>_heatmap.npz next to the callouts file).")
+@click.option("--reset", is_flag=True, help="Start a new accumulator instead of adding to the existing one.")
+@click.option("--bin-px", default=4, show_default=True, help="Radar pixels per histogram bin (new accumulators only).")
+@click.option("--chunk-size", default=250_000, show_default=True, help="Rows per chunk; bounds memory use.")
+@click.option("--x-col", default=None, help="X column (default: x or X).")
+@click.option("--y-col", default=None, help="Y column (default: y or Y).")
+@click.option("--z-col", default=None, help="Z column for two-level maps (default: z or Z when present).")
+@click.option("--snap-distance", default=None, type=float, help="Give points outside every callout the nearest one within this many game units.")
+@click.option("--partition", "partition_path", default=None, type=click.Path(exists=True, dir_okay=False), help="Priority-resolved <map>_partition.npz from the partition command.")
+@click.option("--polygon-key", default="polygon_2d", show_default=True, help="Polygon field to use, e.g. polygon_2d_simplified from process --simplify.")
+@click.option("--out", "out_path", default=None, type=click.Path(), help="Render the heatmap to this PNG.")
+@click.option("--callout", "callout_name", default=None, help="Render only this callout's positions (or <outside>).")
+@click.option("--level", type=click.Choice(["upper", "lower"]), default="upper", show_default=True, help="Radar level to render on two-level maps.")
+@click.option("--radar", default=None, type=click.Path(exists=True), help="Radar image to draw underneath.")
+@click.option("--map-data", default=None, type=click.Path(exists=True), help="Optional map-data.json with radar positioning metadata.")
+@click.option("--cache-dir", default=None, type=click.Path(file_okay=False), help="Asset cache for decoded radars and map metadata (default: .cache/cs2_callouts).")
+@click.option("--size", default=None, type=int, help="Output width/height in pixels (default: radar size).")
+@click.option("--alpha", default=0.8, show_default=True, help="Opacity of the densest heatmap cells.")
+@click.option("--linear", is_flag=True, help="Scale colours linearly with counts instead of logarithmically.")
+@click.option("--labels/--no-labels", default=True, show_default=True, help="Draw callout names on the overlay.")
+@click.option("--top", default=10, show_default=True, help="Callouts to list by position count.")
+def heatmap(positions: tuple, map_name: str, callouts_json: str | None, accumulator: str | None, reset: bool, bin_px: int,
+            chunk_size: int, x_col: str | None, y_col: str | None, z_col: str | None, snap_distance: float | None,
+            partition_path: str | None, polygon_key: str, out_path: str | None, callout_name: str | None, level: str,
+            radar: str | None, map_data: str | None, cache_dir: str | None, size: int | None, alpha: float,
+            linear: bool, labels: bool, top: int):
+    """Accumulate positions into per-callout radar heatmaps across demos and render them as a density layer."""
+    from .heatmap import HeatmapAccumulator, accumulate_positions, heatmap_path_for
+    from .labeling import StreamSummary
+    from .lookup import CalloutIndex
+    from .transform import LOWER, UPPER
+
+    if callouts_json is None:
+        callouts_json = str(Path("out") / f"{map_name}_callouts.json")
+    if not Path(callouts_json).exists():
+        click.echo(f"Callouts file not found: {callouts_json}", err=True)
+        sys.exit(1)
+    acc_path = Path(accumulator) if accumulator else heatmap_path_for(callouts_json)
+    map_metadata = _load_map_metadata(callouts_json, map_data, cache_dir)
+    if not map_metadata:
+        raise click.ClickException("Heatmaps are binned in radar pixels and need map metadata; pass --map-data")
+
+    index = CalloutIndex.from_json(callouts_json, polygon_key=polygon_key)
+    if acc_path.exists() and not reset:
+        acc = HeatmapAccumulator.load(acc_path)
+        if not acc.compatible(index.names, map_metadata, acc.bin_px):
+            raise click.ClickException(f"{acc_path} was built for other callouts or map metadata; pass --reset to start over")
+    else:
+        acc = HeatmapAccumulator(index.names, map_metadata, bin_px=bin_px)
+
+    resolver = index
+    if partition_path:
+        from .partition import CalloutPartition
+
+        try:
+            resolver = CalloutPartition.load(partition_path, index)
+        except ValueError as e:
+            raise click.ClickException(str(e))
+    for src in positions:
+        key = str(Path(src).resolve())
+        if key in acc.sources:
+            click.echo(f"Skipping {src}: already in {acc_path} (use --reset to rebuild)")
+            continue
+        summary = StreamSummary()
+        rows_before = acc.rows
+        for _ in accumulate_positions(acc, src, resolver, chunk_size=chunk_size, x_col=x_col, y_col=y_col,
+                                      z_col=z_col, snap_distance=snap_distance, summary=summary):
+            pass
+        acc.sources.append(key)
+        click.echo(f"Added {acc.rows - rows_before} rows from {src} ({summary.rows_per_s:,.0f} rows/s)")
+    if positions or reset:
+        acc.save(acc_path)
+    if acc.rows == 0:
+        click.echo("No positions accumulated yet; pass --positions", err=True)
+        sys.exit(1)
+    click.echo(
+        f"{acc_path}: {acc.rows} positions from {len(acc.sources)} file(s), {acc.off_radar} off the radar; "
+        f"{acc.shape[2]}x{acc.shape[1]} bins of {acc.bin_px}px"
+    )
+    for row in acc.callout_totals()[:top]:
+        click.echo(f"  {row['callout']:<24} {row['count']:>10} ({row['count'] / acc.rows:6.1%})")
+
+    if not out_path:
+        return
+    from .assets import get_asset_cache
+    from .raster import density_image, render_callouts_image
+    from .render import load_output
+
+    try:
+        grid = acc.grid(callout_name, level=LOWER if level == "lower" else UPPER)
+    except (KeyError, ValueError) as e:
+        raise click.ClickException(str(e).strip("'\""))
+    radar_img, pixel_scale = get_asset_cache(cache_dir).radar_image(radar, min_size=size) if radar else (None, 1.0)
+    img = render_callouts_image(
+        load_output(callouts_json),
+        radar=radar_img,
+        map_metadata=map_metadata,
+        pixel_scale=pixel_scale,
+        polygon_key=polygon_key,
+        size=(size, size) if size else None,
+        alpha=0.0,
+        labels=labels,
+        density=density_image(grid, alpha=alpha, log=not linear),
+    )
+    Path(out_path).parent.mkdir(parents=True, exist_ok=True)
+    img.save(out_path)
+    click.echo(f"Saved {out_path}")
+
+
+@cli.command()
+@click.option("--out-dir", default="out", show_default=True, type=click.Path(file_okay=False), help="Directory holding <map>_callouts.json files.")
+@click.option("--host", default="127.0.0.1", show_default=True, help="Interface to bind.")
+@click.option("--port", default=8765, show_default=True, help="TCP port.")
+@click.option("--unix-socket", default=None, type=click.Path(), help="Serve on this Unix socket instead of TCP.")
+@click.option("--preload/--no-preload", default=True, show_default=True, help="Index every map at startup instead of on first request.")
+@click.option("--max-maps", default=None, type=int, help="Keep at most this many map indexes in memory (LRU).")
+@click.option("--max-mb", default=None, type=float, help="Memory budget for map indexes in MB (LRU).")
+@click.option("--map-data", default=None, type=click.Path(exists=True), help="Optional map-data.json with radar positioning metadata.")
+@click.option("--verbose", is_flag=True, help="Log every request.")
+@click.option("--polygon-key", default="polygon_2d", show_default=True, help="Polygon field to use, e.g. polygon_2d_simplified from process --simplify.")
+def serve(out_dir: str, host: str, port: int, unix_socket: str | None, preload: bool, max_maps: int | None,
+          max_mb: float | None, map_data: str | None, verbose: bool, polygon_key: str):
+    """Answer callout lookups for batches of points over local HTTP, keeping map indexes warm."""
+    from .registry import CalloutMaps
+    from .server import make_server
+
+    maps = CalloutMaps(
+        out_dir,
+        map_data=map_data,
+        max_entries=max_maps,
+        max_bytes=int(max_mb * 1024 * 1024) if max_mb else None,
+        polygon_key=polygon_key,
+    )
+    if preload:
+        loaded = maps.preload()
+        click.echo(f"Indexed {len(loaded)} map(s): {', '.join(maps.loaded()) or 'none'}")
+    server = make_server(maps, host=host, port=port, unix_socket=unix_socket, verbose=verbose)
+    where = unix_socket or f"http://{host}:{server.server_port}"
+    click.echo(f"Serving callout lookups on {where} (POST /lookup, GET /maps); Ctrl+C to stop")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        if unix_socket and os.path.exists(unix_socket):
+            os.unlink(unix_socket)
+
+
 if __name__ == "__main__":
     cli()
 
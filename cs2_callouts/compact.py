@@ -0,0 +1,224 @@
+from __future__ import annotations
+
+import gzip
+import json
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .geometry import polygon_deviation
+
+FORMAT = "cs2-callouts-compact"
+VERSION = 1
+COMPACT_SUFFIX = ".compact.json"
+# Default grid step per space: game units, or radar pixels (about 1.25 units on mirage's 1024px radar)
+DEFAULT_STEP = {"world": 1.0, "radar": 0.25}
+# Map metadata fields a radar-space file needs to decode back to world units
+RADAR_FIELDS = ("pos_x", "pos_y", "scale", "rotate", "zoom", "lower_level_max_units")
+
+
+def _table(values: Sequence) -> Tuple[List, List[int]]:
+    """Distinct values in first-seen order, and each value's index into them."""
+    index: Dict = {}
+    ids = [index.setdefault(v, len(index)) for v in values]
+    return list(index), ids
+
+
+def _z_bound(value, rounding) -> Optional[int]:
+    """Z bound widened to a whole unit; None (null) when the source has no Z range."""
+    return None if value is None else int(rounding(value))
+
+
+def encode_compact(
+    data: Dict,
+    space: str = "world",
+    step: Optional[float] = None,
+    map_metadata: Optional[Dict] = None,
+    polygon_key: str = "polygon_2d",
+) -> Dict:
+    """Quantized, delta-encoded form of a ``process_callouts`` payload, TopoJSON style.
+
+    Polygon vertices are snapped to a grid of ``step`` units in ``space``
+    (``"world"`` game units, or ``"radar"`` pixels via ``map_metadata``).
+    A single ``transform`` maps grid integers back, ``x = q * scale +
+    translate``. Each ring is stored flat as its first grid point followed
+    by per-vertex deltas, and repeated points after snapping are dropped.
+    Names and models go into shared tables referenced by index, and Z
+    ranges are rounded to whole units. Only the fields the radar viewer
+    needs are kept: name, model, polygon, bbox (rebuilt on load) and Z range.
+    """
+    if space not in DEFAULT_STEP:
+        raise ValueError(f"Unknown space {space!r}; expected one of {sorted(DEFAULT_STEP)}")
+    step = float(step if step is not None else DEFAULT_STEP[space])
+    if step <= 0:
+        raise ValueError("step must be positive")
+    items = data.get("callouts", [])
+    polys = [np.asarray(item.get(polygon_key) or [], dtype=np.float64).reshape(-1, 2) for item in items]
+
+    doc: Dict = {"format": FORMAT, "version": VERSION, "rotation_order": data.get("rotation_order"), "polygon_key": polygon_key, "space": space}
+    if space == "radar":
+        if not map_metadata:
+            raise ValueError("Radar space needs map metadata (scale, pos_x, pos_y)")
+        from .transform import transform_for
+
+        doc["radar"] = {k: map_metadata[k] for k in RADAR_FIELDS if k in map_metadata}
+        tf = transform_for(doc["radar"])
+        polys = [tf.to_pixel(p) if len(p) else p for p in polys]
+
+    nonempty = [p for p in polys if len(p)]
+    translate = np.vstack(nonempty).min(axis=0) if nonempty else np.zeros(2)
+    doc["transform"] = {"scale": [step, step], "translate": [float(translate[0]), float(translate[1])]}
+
+    rings = []
+    for p in polys:
+        q = np.round((p - translate) / step).astype(np.int64)
+        if len(q) > 1:
+            d = np.diff(q, axis=0)
+            # Drop vertices that snapped onto their predecessor (and a closing duplicate of the first)
+            keep = np.concatenate([[True], np.any(d != 0, axis=1)])
+            q = q[keep]
+            if len(q) > 1 and np.array_equal(q[0], q[-1]):
+                q = q[:-1]
+        deltas = np.vstack([q[:1], np.diff(q, axis=0)]) if len(q) else q
+        rings.append(deltas.ravel().tolist())
+
+    doc["names"], doc["name"] = _table([item.get("name") for item in items])
+    doc["models"], doc["model"] = _table([item.get("model") for item in items])
+    doc["z"] = [
+        v
+        for item in items
+        for v in (_z_bound(item.get("z_min"), np.floor), _z_bound(item.get("z_max"), np.ceil))
+    ]
+    doc["rings"] = rings
+    return doc
+
+
+def decode_compact(doc: Dict) -> Dict:
+    """Back to a ``process_callouts``-shaped payload with world-space ``polygon_2d`` and ``bbox_2d``.
+
+    Loaded files work anywhere a callouts JSON does (``CalloutIndex``,
+    renderers), whatever ``polygon_key`` they were written from.
+    """
+    if doc.get("format") != FORMAT:
+        raise ValueError(f"Not a {FORMAT} document")
+    if doc.get("version") != VERSION:
+        raise ValueError(f"Unsupported {FORMAT} version {doc.get('version')}")
+    scale = np.asarray(doc["transform"]["scale"], dtype=np.float64)
+    translate = np.asarray(doc["transform"]["translate"], dtype=np.float64)
+    rings = doc["rings"]
+    lengths = np.fromiter((len(r) // 2 for r in rings), dtype=np.int64, count=len(rings))
+    offsets = np.concatenate([[0], np.cumsum(lengths)])
+
+    # One cumulative sum over every ring, then take off the running total each ring starts from
+    flat = np.fromiter((v for r in rings for v in r), dtype=np.int64, count=int(offsets[-1]) * 2).reshape(-1, 2)
+    cum = np.cumsum(flat, axis=0)
+    starts = offsets[:-1]
+    before = np.zeros((len(rings), 2), dtype=np.int64)
+    nz = starts > 0
+    before[nz] = cum[starts[nz] - 1]
+    pts = (cum - np.repeat(before, lengths, axis=0)) * scale + translate
+
+    if doc.get("space") == "radar":
+        from .transform import transform_for
+
+        pts = transform_for(doc["radar"]).to_world(pts) if len(pts) else pts
+
+    # Per-ring bboxes in one pass; empty rings get the zero bbox bbox2d gives them
+    mins = np.zeros((len(rings), 2))
+    maxs = np.zeros((len(rings), 2))
+    filled = lengths > 0
+    if filled.any():
+        mins[filled] = np.minimum.reduceat(pts, starts[filled], axis=0)
+        maxs[filled] = np.maximum.reduceat(pts, starts[filled], axis=0)
+    all_pts = pts.tolist()
+    boxes = np.hstack([mins, maxs]).tolist()
+
+    names, models, z = doc["names"], doc["models"], doc["z"]
+    callouts = []
+    for i, (ni, mi) in enumerate(zip(doc["name"], doc["model"])):
+        min_x, min_y, max_x, max_y = boxes[i]
+        item = {
+            "name": names[ni],
+            "model": models[mi],
+            "polygon_2d": all_pts[offsets[i]:offsets[i + 1]],
+            "bbox_2d": {"min_x": min_x, "min_y": min_y, "max_x": max_x, "max_y": max_y},
+        }
+        # Null bounds mean the source had no Z range; leave them out so lookups don't clip by height
+        if z[2 * i] is not None:
+            item["z_min"] = float(z[2 * i])
+        if z[2 * i + 1] is not None:
+            item["z_max"] = float(z[2 * i + 1])
+        callouts.append(item)
+    return {"rotation_order": doc.get("rotation_order"), "count": len(callouts), "callouts": callouts}
+
+
+def write_compact(doc: Dict, out_path: str | Path) -> Path:
+    p = Path(out_path)
+    p.parent.mkdir(parents=True, exist_ok=True)
+    p.write_text(json.dumps(doc, separators=(",", ":")), encoding="utf-8")
+    return p
+
+
+def load_compact(path: str | Path) -> Dict:
+    """Read a compact file and decode it (see ``decode_compact``)."""
+    return decode_compact(json.loads(Path(path).read_text(encoding="utf-8")))
+
+
+def compact_path_for(json_path: str | Path) -> Path:
+    """``out/de_mirage_callouts.json`` -> ``out/de_mirage_callouts.compact.json``."""
+    p = Path(json_path)
+    return p.with_name(p.stem + COMPACT_SUFFIX)
+
+
+def _median_seconds(fn, repeat: int) -> float:
+    times = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - t0)
+    return float(np.median(times))
+
+
+def size_report(data: Dict, doc: Dict, polygon_key: str = "polygon_2d", repeat: int = 5) -> Dict:
+    """Bytes (raw and gzipped) and parse time of the compact file against the current JSON outputs.
+
+    ``pretty`` is what ``write_json(pretty=True)`` writes and ``minified``
+    its ``pretty=False`` form. ``compact`` parse time is ``json.loads`` alone
+    (what a web client pays before its own decode); ``compact_decoded`` adds
+    ``decode_compact`` back to world polygons. ``max_error`` is the largest ``polygon_deviation`` between
+    an original and a round-tripped polygon, in game units.
+    """
+    texts = {
+        "pretty": json.dumps(data, indent=2),
+        "minified": json.dumps(data, separators=(",", ":")),
+        "compact": json.dumps(doc, separators=(",", ":")),
+    }
+    sizes = {}
+    for name, text in texts.items():
+        raw = text.encode("utf-8")
+        sizes[name] = {"bytes": len(raw), "gzip_bytes": len(gzip.compress(raw, 6))}
+    parse = {
+        "pretty": _median_seconds(lambda: json.loads(texts["pretty"]), repeat),
+        "minified": _median_seconds(lambda: json.loads(texts["minified"]), repeat),
+        "compact": _median_seconds(lambda: json.loads(texts["compact"]), repeat),
+        "compact_decoded": _median_seconds(lambda: decode_compact(json.loads(texts["compact"])), repeat),
+    }
+    decoded = decode_compact(doc)["callouts"]
+    max_error = 0.0
+    for item, back in zip(data.get("callouts", []), decoded):
+        a = np.asarray(item.get(polygon_key) or [], dtype=np.float64).reshape(-1, 2)
+        b = np.asarray(back["polygon_2d"], dtype=np.float64).reshape(-1, 2)
+        max_error = max(max_error, polygon_deviation(a, b))
+    base = sizes["pretty"]
+    return {
+        "callouts": len(decoded),
+        "sizes": sizes,
+        "parse_s": parse,
+        "size_reduction": round(1.0 - sizes["compact"]["bytes"] / base["bytes"], 4) if base["bytes"] else 0.0,
+        "gzip_size_reduction": round(1.0 - sizes["compact"]["gzip_bytes"] / base["gzip_bytes"], 4) if base["gzip_bytes"] else 0.0,
+        "parse_speedup": round(parse["pretty"] / parse["compact"], 2) if parse["compact"] else None,
+        "decoded_speedup": round(parse["pretty"] / parse["compact_decoded"], 2) if parse["compact_decoded"] else None,
+        "max_error": max_error,
+    }
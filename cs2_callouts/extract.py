@@ -14,6 +14,7 @@ import re
 import shutil
 import subprocess
 import tempfile
+import time
 import uuid
 import zipfile
 from pathlib import Path
@@ -22,6 +23,8 @@ from urllib.request import urlretrieve
 
 import click
 
+from .profiling import record_subprocess, stage
+
 
 def info(msg: str) -> None:
     click.echo(click.style(f"[INFO] {msg}", fg="cyan"))
@@ -193,6 +196,7 @@ def ensure_vrf_cli(cli_dir: Path, explicit_url: str = "", version: str = "") ->
 
 def run_vrf_command(cli_path: str, args: List[str]) -> List[str]:
     """Run VRF CLI command and return output lines."""
+    started = time.perf_counter()
     try:
         result = subprocess.run(
             [cli_path] + args,
@@ -204,6 +208,8 @@ def run_vrf_command(cli_path: str, args: List[str]) -> List[str]:
     except subprocess.CalledProcessError as e:
         warn(f"VRF command failed: {e}")
         return []
+    finally:
+        record_subprocess(args, time.perf_counter() - started)
 
 
 def decompile_map_and_entities_from_multiple_vpks(cli_path: str, vpk_paths: List[str], map_name: str, out_root: Path) -> Path:
@@ -217,7 +223,8 @@ def decompile_map_and_entities_from_multiple_vpks(cli_path: str, vpk_paths: List
     # Scan all VPK files for relevant resources
     for vpk_path in vpk_paths:
         info(f"Scanning VPK for map resources: {Path(vpk_path).name}")
-        list_output = run_vrf_command(cli_path, ["-i", vpk_path, "--vpk_list"])
+        with stage("vrf_list"):
+            list_output = run_vrf_command(cli_path, ["-i", vpk_path, "--vpk_list"])
         
         if list_output:
             base = map_name[3:] if map_name.startswith('de_') else map_name
@@ -244,7 +251,8 @@ def decompile_map_and_entities_from_multiple_vpks(cli_path: str, vpk_paths: List
             for guess in guesses:
                 try:
                     info(f"Trying vmap guess: {guess} in {Path(vpk_path).name}")
-                    run_vrf_command(cli_path, ["-i", vpk_path, "--vpk_filepath", guess, "-o", str(out_map_dir), "-d"])
+                    with stage("decompile_map"):
+                        run_vrf_command(cli_path, ["-i", vpk_path, "--vpk_filepath", guess, "-o", str(out_map_dir), "-d"])
                     all_vmap_candidates.append((vpk_path, guess))
                     break  # Found one, move to next VPK
                 except:
@@ -252,7 +260,8 @@ def decompile_map_and_entities_from_multiple_vpks(cli_path: str, vpk_paths: List
     else:
         for vpk_path, vmap in all_vmap_candidates:
             info(f"Decompiling vmap: {vmap} from {Path(vpk_path).name}")
-            run_vrf_command(cli_path, ["-i", vpk_path, "--vpk_filepath", vmap, "-o", str(out_map_dir), "-d"])
+            with stage("decompile_map"):
+                run_vrf_command(cli_path, ["-i", vpk_path, "--vpk_filepath", vmap, "-o", str(out_map_dir), "-d"])
     
     # Decompile entity files
     entities_out_root = out_map_dir / "entities"
@@ -262,12 +271,14 @@ def decompile_map_and_entities_from_multiple_vpks(cli_path: str, vpk_paths: List
         info(f"Decompiling {len(all_entities_candidates)} entity lump(s) from multiple VPKs")
         for vpk_path, entity_file in all_entities_candidates:
             info(f"Decompiling entity file: {entity_file} from {Path(vpk_path).name}")
-            run_vrf_command(cli_path, ["-i", vpk_path, "--vpk_filepath", entity_file, "-o", str(entities_out_root), "-d"])
+            with stage("decompile_entities"):
+                run_vrf_command(cli_path, ["-i", vpk_path, "--vpk_filepath", entity_file, "-o", str(entities_out_root), "-d"])
     else:
         info("No specific entity lumps found by listing; trying folder heuristic on all VPKs.")
         for vpk_path in vpk_paths:
             try:
-                run_vrf_command(cli_path, ["-i", vpk_path, "--vpk_filepath", f"maps/{map_name}/entities/", "-e", "vents_c", "-o", str(entities_out_root), "-d"])
+                with stage("decompile_entities"):
+                    run_vrf_command(cli_path, ["-i", vpk_path, "--vpk_filepath", f"maps/{map_name}/entities/", "-e", "vents_c", "-o", str(entities_out_root), "-d"])
             except:
                 continue
     
@@ -374,7 +385,8 @@ def export_models(cli_path: str, vpk_paths: List[str], model_paths: List[str],
         
         for vpk_path in vpk_paths:
             # Try to extract the model
-            run_vrf_command(cli_path, ["-i", vpk_path, "--vpk_filepath", mp, "-o", str(out_dir), "-d", "--gltf_export_format", fmt])
+            with stage("export_model"):
+                run_vrf_command(cli_path, ["-i", vpk_path, "--vpk_filepath", mp, "-o", str(out_dir), "-d", "--gltf_export_format", fmt])
             
             # Check if files were actually created
             model_name = Path(mp).stem
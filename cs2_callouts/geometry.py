@@ -1,9 +1,10 @@
 from __future__ import annotations
 
 import math
-from typing import Iterable, List, Sequence, Tuple
+from typing import Iterable, List, Optional, Sequence, Tuple
 
 import numpy as np
+from numpy.typing import DTypeLike
 
 
 def _rx(a: float) -> np.ndarray:
@@ -65,22 +66,30 @@ def apply_srt(
     angles_deg: Sequence[float],
     origin: Sequence[float],
     order: str = "rz_rx_ry",
+    dtype: Optional[DTypeLike] = None,
 ) -> np.ndarray:
-    v = np.asarray(vertices, dtype=np.float64)
-    s = np.asarray(scales, dtype=np.float64)
+    """Scale, rotate and translate model vertices into world space.
+
+    The result has ``dtype``; by default float64, or float32 when
+    ``vertices`` are float32 already. The matrix is built in float64 and
+    cast once, so float32 only rounds the per-vertex products.
+    """
+    if dtype is None:
+        dtype = np.float32 if np.asarray(vertices).dtype == np.float32 else np.float64
+    v = np.asarray(vertices, dtype=dtype)
     a = np.asarray(angles_deg, dtype=np.float64)
-    o = np.asarray(origin, dtype=np.float64)
-
-    vs = v * s[None, :]
     R = euler_matrix_named(float(a[0]), float(a[1]), float(a[2]), order)
-    vr = vs @ R.T
-    vt = vr + o[None, :]
+    # Fold the scale into the matrix: one (V, 3) product instead of a scaled copy first
+    M = (R * np.asarray(scales, dtype=np.float64)[None, :]).astype(dtype)
+    vt = v @ M.T
+    vt += np.asarray(origin, dtype=dtype)[None, :]
     return vt
 
 
 def to_xy(vertices_world: np.ndarray) -> np.ndarray:
-    v = np.asarray(vertices_world, dtype=np.float64)
-    return v[:, :2]
+    # Slice before converting so float32 input copies two columns, not three
+    v = np.asarray(vertices_world)
+    return np.asarray(v[:, :2], dtype=np.float64)
 
 
 def dedupe_points(points: np.ndarray, eps: float = 1e-5) -> np.ndarray:
@@ -124,6 +133,46 @@ def polygon_area(poly: np.ndarray) -> float:
     return 0.5 * float(np.dot(x, np.roll(y, -1)) - np.dot(y, np.roll(x, -1)))
 
 
+def _outline_distance(points: np.ndarray, poly: np.ndarray) -> np.ndarray:
+    """Distance from each of ``points`` to the closed outline of ``poly``."""
+    a = poly
+    b = np.roll(poly, -1, axis=0)
+    ab = b - a
+    len2 = np.maximum((ab ** 2).sum(axis=1), 1e-18)
+    ap = points[:, None, :] - a[None, :, :]
+    t = np.clip((ap * ab[None, :, :]).sum(axis=2) / len2[None, :], 0.0, 1.0)
+    closest = a[None, :, :] + t[:, :, None] * ab[None, :, :]
+    return np.sqrt(((points[:, None, :] - closest) ** 2).sum(axis=2)).min(axis=1)
+
+
+def polygon_deviation(a: np.ndarray, b: np.ndarray) -> float:
+    """Largest distance from a vertex of either polygon to the other's outline.
+
+    For convex hulls this is the Hausdorff distance, and it ignores a
+    near-collinear vertex that only one of the two hulls kept.
+    """
+    a = np.asarray(a, dtype=np.float64)
+    b = np.asarray(b, dtype=np.float64)
+    if len(a) == 0 or len(b) == 0:
+        return 0.0 if len(a) == len(b) else float("inf")
+    return float(max(_outline_distance(a, b).max(), _outline_distance(b, a).max()))
+
+
+def polygon_centroid(poly: np.ndarray) -> Tuple[float, float]:
+    """Area centroid; falls back to the vertex mean for degenerate polygons."""
+    if len(poly) == 0:
+        return (0.0, 0.0)
+    x = poly[:, 0]
+    y = poly[:, 1]
+    xn, yn = np.roll(x, -1), np.roll(y, -1)
+    cross = x * yn - xn * y
+    a = 0.5 * float(cross.sum())
+    if len(poly) < 3 or abs(a) < 1e-12:
+        m = poly.mean(axis=0)
+        return (float(m[0]), float(m[1]))
+    return (float(((x + xn) * cross).sum() / (6.0 * a)), float(((y + yn) * cross).sum() / (6.0 * a)))
+
+
 def bbox2d(points: np.ndarray) -> Tuple[float, float, float, float]:
     if len(points) == 0:
         return (0.0, 0.0, 0.0, 0.0)
@@ -4,20 +4,31 @@ from pathlib import Path
 from typing import Optional
 
 import numpy as np
+from numpy.typing import DTypeLike
 
+from .profiling import stage
 
-def _load_trimesh_vertices(path: Path) -> np.ndarray:
+
+def _load_trimesh_vertices(path: Path, dtype: DTypeLike = np.float64) -> np.ndarray:
+    import trimesh
+
+    with stage("trimesh_load"):
+        obj = trimesh.load(path, force="mesh")
+    with stage("vertices"):
+        return _vertices_of(obj, path, dtype)
+
+
+def _vertices_of(obj, path: Path, dtype: DTypeLike = np.float64) -> np.ndarray:
     import trimesh
 
-    obj = trimesh.load(path, force="mesh")
     if isinstance(obj, trimesh.Trimesh):
-        v = np.asarray(obj.vertices, dtype=np.float64)
+        v = np.asarray(obj.vertices, dtype=dtype)
         return v
     if isinstance(obj, trimesh.Scene):
         try:
             mesh = obj.dump(concatenate=True)
             if isinstance(mesh, trimesh.Trimesh):
-                return np.asarray(mesh.vertices, dtype=np.float64)
+                return np.asarray(mesh.vertices, dtype=dtype)
         except Exception:
             pass
         verts = []
@@ -26,11 +37,11 @@ def _load_trimesh_vertices(path: Path) -> np.ndarray:
                 T = obj.graph.get(name)[0]
             except Exception:
                 T = None
-            gverts = np.asarray(geom.vertices, dtype=np.float64)
+            gverts = np.asarray(geom.vertices, dtype=dtype)
             if T is not None:
-                gverts_h = np.hstack([gverts, np.ones((len(gverts), 1))])
-                gverts_w = (T @ gverts_h.T).T[:, :3]
-                verts.append(gverts_w)
+                # Node transforms applied as rotation + translation, without a homogeneous float64 copy
+                T = np.asarray(T, dtype=dtype)
+                verts.append(gverts @ T[:3, :3].T + T[:3, 3])
             else:
                 verts.append(gverts)
         if verts:
@@ -38,9 +49,14 @@ def _load_trimesh_vertices(path: Path) -> np.ndarray:
     raise RuntimeError(f"Unsupported GLTF/GLB content in {path}")
 
 
-def load_vertices(path: str | Path) -> np.ndarray:
+def load_vertices(path: str | Path, dtype: DTypeLike = np.float64) -> np.ndarray:
+    """(V, 3) vertex positions of a GLB/GLTF as ``dtype``.
+
+    ``np.float32`` keeps the file's own precision (glTF positions are
+    float32) and halves the array compared with the float64 default.
+    """
     p = Path(path)
     if not p.exists():
         raise FileNotFoundError(str(p))
-    return _load_trimesh_vertices(p)
+    return _load_trimesh_vertices(p, dtype)
 
@@ -0,0 +1,221 @@
+from __future__ import annotations
+
+import json
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Tuple, Union
+
+import numpy as np
+
+from .geometry import polygon_centroid
+from .intersect import intersect_segments
+from .lookup import CalloutIndex, expand_ranges, group_starts, next_vertex
+
+# Hulls closer than this many game units count as neighbours
+DEFAULT_TOLERANCE = 16.0
+
+GRAPH_SUFFIX = "_graph.json"
+
+Callout = Union[int, str]
+
+
+def callout_adjacency(index: CalloutIndex, tolerance: float = DEFAULT_TOLERANCE) -> Tuple[np.ndarray, np.ndarray]:
+    """Pairs of callouts whose hulls overlap or lie within ``tolerance`` of each other.
+
+    Returns ``(pairs, gaps)``: (E, 2) ids with ``a < b`` and the gap between
+    the two hulls (0 where they touch or overlap). Candidates are pairs
+    whose bounding boxes, grown by ``tolerance``, overlap on the lookup
+    grid. Overlap is detected by running every hull edge through
+    ``intersect_segments``; for disjoint hulls the gap is the smallest
+    vertex-to-boundary distance in either direction.
+    """
+    valid = np.flatnonzero(np.diff(index.offsets) >= 3)
+    empty = (np.zeros((0, 2), dtype=np.int64), np.zeros(0))
+    if len(valid) < 2:
+        return empty
+    bb = index.bboxes[valid]
+    box, other = index.box_candidates(bb[:, :2] - tolerance, bb[:, 2:] + tolerance)
+    a, b = valid[box], other
+    keep = a < b
+    a, b = a[keep], b[keep]
+    if len(a) == 0:
+        return empty
+    npoly = len(index.names)
+    pair_keys = a * npoly + b
+
+    # Any hull edge inside the other hull means the two overlap
+    nxt = next_vertex(index.offsets)
+    edge_owner = np.repeat(np.arange(npoly, dtype=np.int64), np.diff(index.offsets))
+    hits = intersect_segments(index, index.vertices, index.vertices[nxt])
+    src, dst = edge_owner[hits.segment], hits.callout
+    cross = src != dst
+    hit_keys = np.unique(np.minimum(src, dst)[cross] * npoly + np.maximum(src, dst)[cross])
+    overlap = np.isin(pair_keys, hit_keys)
+
+    # Disjoint hulls: closest approach is at a vertex of one of them
+    gaps = np.zeros(len(a))
+    apart = np.flatnonzero(~overlap)
+    if len(apart):
+        sides = []
+        for own, far in ((a[apart], b[apart]), (b[apart], a[apart])):
+            counts = index.offsets[own + 1] - index.offsets[own]
+            pair, vtx = expand_ranges(index.offsets[own], counts)
+            d = index.boundary_distance_pairs(index.vertices, vtx, far[pair])
+            sides.append(np.minimum.reduceat(d, group_starts(pair)))
+        gaps[apart] = np.minimum(sides[0], sides[1])
+    near = gaps <= tolerance
+    return np.column_stack([a[near], b[near]]), gaps[near]
+
+
+def all_pairs_routes(weights: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Floyd-Warshall over a dense (P, P) weight matrix (inf where there is no edge).
+
+    Returns ``(dist, next_hop)``; ``next_hop[i, j]`` is the first callout
+    after ``i`` on a shortest route to ``j``, -1 when unreachable. Each of
+    the P relaxation steps is one vectorized (P, P) update.
+    """
+    n = len(weights)
+    dist = np.array(weights, dtype=np.float64)
+    np.fill_diagonal(dist, 0.0)
+    next_hop = np.where(np.isfinite(dist), np.arange(n, dtype=np.int32)[None, :], -1).astype(np.int32)
+    for k in range(n):
+        via = dist[:, k, None] + dist[None, k, :]
+        better = via < dist
+        if better.any():
+            dist = np.where(better, via, dist)
+            next_hop = np.where(better, next_hop[:, k, None], next_hop)
+    return dist, next_hop
+
+
+@dataclass
+class CalloutGraph:
+    """Callout adjacency with precomputed all-pairs shortest routes.
+
+    Ids match ``CalloutIndex``/``<map>_callouts.json`` order. Edge weights
+    are distances between hull centroids, so ``distance`` approximates the
+    walking distance between callouts and ``route`` is answered from the
+    next-hop table without any search at query time. Methods that take a
+    callout accept its id or its name; a name shared by several volumes
+    uses whichever of them gives the shortest route.
+    """
+
+    names: List[str]
+    centroids: np.ndarray  # (P, 2)
+    edges: np.ndarray  # (E, 2) int, a < b
+    gaps: np.ndarray  # (E,) hull gap in game units, 0 when touching or overlapping
+    dist: np.ndarray  # (P, P) route length, inf when unreachable
+    next_hop: np.ndarray  # (P, P) int32, -1 when unreachable
+    tolerance: float = DEFAULT_TOLERANCE
+
+    @classmethod
+    def build(cls, index: CalloutIndex, tolerance: float = DEFAULT_TOLERANCE) -> "CalloutGraph":
+        n = len(index.names)
+        centroids = np.zeros((n, 2))
+        for i in range(n):
+            centroids[i] = polygon_centroid(index.vertices[index.offsets[i]:index.offsets[i + 1]])
+        edges, gaps = callout_adjacency(index, tolerance=tolerance)
+        weights = np.full((n, n), np.inf)
+        w = np.hypot(*(centroids[edges[:, 0]] - centroids[edges[:, 1]]).T) if len(edges) else np.zeros(0)
+        weights[edges[:, 0], edges[:, 1]] = w
+        weights[edges[:, 1], edges[:, 0]] = w
+        dist, next_hop = all_pairs_routes(weights)
+        return cls(list(index.names), centroids, edges, gaps, dist, next_hop, float(tolerance))
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def _ids(self, callout: Callout) -> List[int]:
+        if isinstance(callout, (int, np.integer)):
+            if not 0 <= int(callout) < len(self.names):
+                raise KeyError(callout)
+            return [int(callout)]
+        ids = [i for i, name in enumerate(self.names) if name == callout]
+        if not ids:
+            raise KeyError(callout)
+        return ids
+
+    def _closest_pair(self, src: Callout, dst: Callout) -> Tuple[int, int]:
+        a, b = self._ids(src), self._ids(dst)
+        sub = self.dist[np.ix_(a, b)]
+        i, j = np.unravel_index(int(np.argmin(sub)), sub.shape)
+        return a[i], b[j]
+
+    def neighbours(self, callout: Callout) -> List[str]:
+        ids = set(self._ids(callout))
+        mask = np.isin(self.edges, list(ids))
+        out = set(self.edges[mask[:, 0], 1].tolist()) | set(self.edges[mask[:, 1], 0].tolist())
+        return sorted({self.names[i] for i in out - ids})
+
+    def distance(self, src: Callout, dst: Callout) -> float:
+        """Shortest route length (sum of centroid hops); inf when not connected."""
+        a, b = self._closest_pair(src, dst)
+        return float(self.dist[a, b])
+
+    def route_ids(self, src: Callout, dst: Callout) -> List[int]:
+        """Callout ids from ``src`` to ``dst`` inclusive, empty when not connected."""
+        a, b = self._closest_pair(src, dst)
+        if self.next_hop[a, b] < 0:
+            return []
+        path = [a]
+        while a != b:
+            a = int(self.next_hop[a, b])
+            path.append(a)
+        return path
+
+    def route(self, src: Callout, dst: Callout) -> List[str]:
+        return [self.names[i] for i in self.route_ids(src, dst)]
+
+    # -- persistence ---------------------------------------------------
+
+    def to_dict(self) -> Dict:
+        dist = np.round(self.dist, 2).astype(object)
+        dist[~np.isfinite(self.dist)] = None
+        return {
+            "tolerance": self.tolerance,
+            "names": self.names,
+            "centroids": np.round(self.centroids, 3).tolist(),
+            "edges": [
+                {"a": int(a), "b": int(b), "gap": round(float(g), 3)}
+                for (a, b), g in zip(self.edges.tolist(), self.gaps.tolist())
+            ],
+            "dist": dist.tolist(),
+            "next_hop": self.next_hop.tolist(),
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "CalloutGraph":
+        edges = data.get("edges", [])
+        dist = np.array([[np.inf if v is None else v for v in row] for row in data["dist"]], dtype=np.float64)
+        return cls(
+            names=list(data["names"]),
+            centroids=np.asarray(data["centroids"], dtype=np.float64).reshape(-1, 2),
+            edges=np.array([[e["a"], e["b"]] for e in edges], dtype=np.int64).reshape(-1, 2),
+            gaps=np.array([e["gap"] for e in edges], dtype=np.float64),
+            dist=dist.reshape(len(data["names"]), len(data["names"])),
+            next_hop=np.asarray(data["next_hop"], dtype=np.int32).reshape(len(data["names"]), len(data["names"])),
+            tolerance=float(data.get("tolerance", DEFAULT_TOLERANCE)),
+        )
+
+    def save(self, path: str | Path) -> None:
+        p = Path(path)
+        p.parent.mkdir(parents=True, exist_ok=True)
+        p.write_text(json.dumps(self.to_dict(), separators=(",", ":")), encoding="utf-8")
+
+    @classmethod
+    def load(cls, path: str | Path) -> "CalloutGraph":
+        return cls.from_dict(json.loads(Path(path).read_text(encoding="utf-8-sig")))
+
+
+def graph_path_for(callouts_json: str | Path) -> Path:
+    """``out/de_mirage_callouts.json`` -> ``out/de_mirage_graph.json``."""
+    p = Path(callouts_json)
+    stem = p.name[: -len("_callouts.json")] if p.name.endswith("_callouts.json") else p.stem
+    return p.with_name(stem + GRAPH_SUFFIX)
+
+
+def build_graph_file(callouts_json: str | Path, out_path: str | Path | None = None, tolerance: float = DEFAULT_TOLERANCE) -> Tuple[CalloutGraph, Path]:
+    """Build the graph for a processed callouts file and write it next to it (or to ``out_path``)."""
+    graph = CalloutGraph.build(CalloutIndex.from_json(callouts_json), tolerance=tolerance)
+    out = Path(out_path) if out_path else graph_path_for(callouts_json)
+    graph.save(out)
+    return graph, out
@@ -0,0 +1,246 @@
+from __future__ import annotations
+
+import json
+import math
+import time
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .labeling import ChunkStats, DEFAULT_CHUNK_SIZE, StreamSummary, iter_position_chunks, resolve_xy_columns
+from .transform import LOWER, RADAR_SIZE, UPPER, transform_for
+
+HEATMAP_SUFFIX = "_heatmap.npz"
+# Radar pixels per histogram bin: a 1024px radar becomes a 256x256 grid
+DEFAULT_BIN_PX = 4
+# Map metadata fields the pixel grid depends on
+METADATA_FIELDS = ("pos_x", "pos_y", "scale", "lower_level_max_units")
+OUTSIDE = "<outside>"
+
+
+class HeatmapAccumulator:
+    """Position counts on a radar-pixel grid, in total and per callout, summed across demos.
+
+    Positions go through the awpy radar transform (``transform_for``, as in
+    ``visualize``) and are binned ``bin_px`` radar pixels to a bin. Maps with
+    a lower radar get a second grid, selected by Z. Each chunk costs two
+    ``np.bincount`` calls over flat cell indexes: one for the total grid and
+    one for the callout totals. The per-callout grids are held sparsely as
+    sorted ``(callout + 1) * cells + cell`` keys with counts, where slot 0
+    holds positions outside every callout. Hulls barely overlap, so this
+    stays near one grid in size however many callouts the map has.
+    """
+
+    def __init__(
+        self,
+        names: Sequence[str],
+        map_metadata: Dict,
+        bin_px: int = DEFAULT_BIN_PX,
+        radar_size=RADAR_SIZE,
+    ):
+        self.names = list(names)
+        self.map_metadata = {k: map_metadata[k] for k in METADATA_FIELDS if k in map_metadata}
+        self.bin_px = int(bin_px)
+        if self.bin_px < 1:
+            raise ValueError("bin_px must be at least 1")
+        self.radar_size = (int(radar_size[0]), int(radar_size[1]))
+        self.transform = transform_for(self.map_metadata, self.radar_size)
+        levels = 2 if self.transform.has_lower_level else 1
+        self.shape = (levels, math.ceil(self.radar_size[1] / self.bin_px), math.ceil(self.radar_size[0] / self.bin_px))
+        self.cells = int(np.prod(self.shape))
+        self.totals = np.zeros(self.cells, dtype=np.int64)
+        self.callout_counts = np.zeros(len(self.names) + 1, dtype=np.int64)
+        self.keys = np.empty(0, dtype=np.int64)
+        self.key_counts = np.empty(0, dtype=np.int64)
+        self.rows = 0
+        self.off_radar = 0
+        self.sources: List[str] = []
+
+    def compatible(self, names: Sequence[str], map_metadata: Dict, bin_px: int) -> bool:
+        """Whether positions labelled with ``names`` on this map can be added to this accumulator."""
+        meta = {k: map_metadata[k] for k in METADATA_FIELDS if k in map_metadata}
+        return list(names) == self.names and meta == self.map_metadata and int(bin_px) == self.bin_px
+
+    def cell_index(self, points: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Flat grid cell per world point (N, 2) or (N, 3), and a mask of points on the radar."""
+        pts = np.asarray(points, dtype=np.float64)
+        px = self.transform.to_pixel(pts)
+        col = np.floor(px[:, 0] / self.bin_px).astype(np.int64)
+        row = np.floor(px[:, 1] / self.bin_px).astype(np.int64)
+        _, rows, cols = self.shape
+        on = (col >= 0) & (col < cols) & (row >= 0) & (row < rows)
+        level = np.zeros(len(pts), dtype=np.int64)
+        if self.shape[0] > 1 and pts.shape[1] >= 3:
+            level = self.transform.level(pts).astype(np.int64)
+        cell = (level * rows + row) * cols + col
+        cell[~on] = 0
+        return cell, on
+
+    def add(self, points: np.ndarray, callout_ids: np.ndarray) -> None:
+        """Count world points with their callout ids (-1 outside every callout)."""
+        cell, on = self.cell_index(points)
+        slot = np.asarray(callout_ids, dtype=np.int64) + 1
+        self.rows += len(slot)
+        self.off_radar += int(len(slot) - on.sum())
+        self.callout_counts += np.bincount(slot, minlength=len(self.callout_counts))
+        cell, slot = cell[on], slot[on]
+        self.totals += np.bincount(cell, minlength=self.cells)
+        keys, counts = np.unique(slot * self.cells + cell, return_counts=True)
+        self._merge(keys, counts.astype(np.int64))
+
+    def _merge(self, keys: np.ndarray, counts: np.ndarray) -> None:
+        if len(self.keys) == 0:
+            self.keys, self.key_counts = keys, counts
+            return
+        merged, inverse = np.unique(np.concatenate([self.keys, keys]), return_inverse=True)
+        # float64 weights are exact for counts below 2**53
+        total = np.bincount(inverse, weights=np.concatenate([self.key_counts, counts]), minlength=len(merged))
+        self.keys, self.key_counts = merged, total.astype(np.int64)
+
+    def merge(self, other: "HeatmapAccumulator") -> None:
+        """Add another accumulator's counts (same callouts, map and bin size)."""
+        if not self.compatible(other.names, other.map_metadata, other.bin_px) or other.shape != self.shape:
+            raise ValueError("Heatmaps were built for different callouts, maps or bin sizes")
+        self.totals += other.totals
+        self.callout_counts += other.callout_counts
+        self._merge(other.keys, other.key_counts)
+        self.rows += other.rows
+        self.off_radar += other.off_radar
+        self.sources.extend(s for s in other.sources if s not in self.sources)
+
+    def _slot(self, callout) -> int:
+        if callout == OUTSIDE:
+            return 0
+        if isinstance(callout, str):
+            try:
+                return self.names.index(callout) + 1
+            except ValueError:
+                raise KeyError(f"Unknown callout {callout!r}") from None
+        return int(callout) + 1
+
+    def grid(self, callout=None, level: int = UPPER) -> np.ndarray:
+        """(rows, cols) counts on one radar level: all positions, or one callout by name or id.
+
+        Row 0 is the top of the radar, as in pixel space. ``OUTSIDE`` gives
+        positions outside every callout.
+        """
+        if level >= self.shape[0]:
+            raise ValueError(f"This map has no {'lower' if level == LOWER else str(level)} level")
+        if callout is None:
+            flat = self.totals
+        else:
+            base = self._slot(callout) * self.cells
+            lo, hi = np.searchsorted(self.keys, [base, base + self.cells])
+            flat = np.zeros(self.cells, dtype=np.int64)
+            flat[self.keys[lo:hi] - base] = self.key_counts[lo:hi]
+        return flat.reshape(self.shape)[level]
+
+    def callout_totals(self) -> List[Dict]:
+        """Positions per callout, most visited first, with positions outside every callout as ``OUTSIDE``."""
+        rows = [{"callout": OUTSIDE, "count": int(self.callout_counts[0])}]
+        rows += [{"callout": n, "count": int(c)} for n, c in zip(self.names, self.callout_counts[1:].tolist())]
+        return sorted(rows, key=lambda r: r["count"], reverse=True)
+
+    def save(self, path: str | Path) -> None:
+        """Write the accumulator as a compressed ``.npz``; ``load`` continues from it."""
+        p = Path(path)
+        p.parent.mkdir(parents=True, exist_ok=True)
+        with open(p, "wb") as f:
+            np.savez_compressed(
+                f,
+                names=np.asarray(self.names, dtype=object).astype(str),
+                map_metadata=np.asarray(json.dumps(self.map_metadata, sort_keys=True)),
+                bin_px=np.int64(self.bin_px),
+                radar_size=np.asarray(self.radar_size, dtype=np.int64),
+                totals=self.totals,
+                callout_counts=self.callout_counts,
+                keys=self.keys,
+                key_counts=self.key_counts,
+                rows=np.int64(self.rows),
+                off_radar=np.int64(self.off_radar),
+                sources=np.asarray(self.sources, dtype=object).astype(str),
+            )
+
+    @classmethod
+    def load(cls, path: str | Path) -> "HeatmapAccumulator":
+        with np.load(path) as data:
+            acc = cls(
+                data["names"].tolist(),
+                json.loads(str(data["map_metadata"])),
+                bin_px=int(data["bin_px"]),
+                radar_size=tuple(data["radar_size"].tolist()),
+            )
+            acc.totals = data["totals"]
+            acc.callout_counts = data["callout_counts"]
+            acc.keys = data["keys"]
+            acc.key_counts = data["key_counts"]
+            acc.rows = int(data["rows"])
+            acc.off_radar = int(data["off_radar"])
+            acc.sources = data["sources"].tolist()
+        return acc
+
+
+def heatmap_path_for(callouts_json: str | Path) -> Path:
+    """``out/de_mirage_callouts.json`` -> ``out/de_mirage_heatmap.npz``."""
+    p = Path(callouts_json)
+    stem = p.name[: -len("_callouts.json")] if p.name.endswith("_callouts.json") else p.stem
+    return p.with_name(stem + HEATMAP_SUFFIX)
+
+
+def _z_column(columns: Sequence[str], z_col: Optional[str]) -> Optional[str]:
+    if z_col:
+        if z_col not in columns:
+            raise ValueError(f"Z column {z_col!r} not in {list(columns)}")
+        return z_col
+    return {c.lower(): c for c in columns}.get("z")
+
+
+def accumulate_positions(
+    acc: HeatmapAccumulator,
+    positions: str | Path,
+    index,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    x_col: Optional[str] = None,
+    y_col: Optional[str] = None,
+    z_col: Optional[str] = None,
+    snap_distance: Optional[float] = None,
+    summary: Optional[StreamSummary] = None,
+) -> Iterator[ChunkStats]:
+    """Stream a position table into ``acc`` one chunk at a time, yielding each chunk's timing.
+
+    ``index`` is a ``CalloutIndex`` or ``partition.CalloutPartition`` with
+    the accumulator's callout names. Z (``z_col``, default ``z``/``Z``) picks
+    the radar level on two-level maps. ``snap_distance`` works as in ``label``.
+    """
+    t_start = time.perf_counter()
+    chunks = iter_position_chunks(positions, chunk_size=chunk_size)
+    i = 0
+    try:
+        while True:
+            t0 = time.perf_counter()
+            chunk = next(chunks, None)
+            t1 = time.perf_counter()
+            if chunk is None:
+                break
+            columns = list(chunk.columns)
+            xc, yc = resolve_xy_columns(columns, x_col, y_col)
+            zc = _z_column(columns, z_col)
+            cols = [xc, yc] + ([zc] if zc else [])
+            pts = np.column_stack([np.asarray(chunk.columns[c], dtype=np.float64) for c in cols])
+            ids = index.lookup(pts)
+            if snap_distance is not None:
+                gap = np.flatnonzero(ids < 0)
+                if len(gap):
+                    # A CalloutPartition resolves lookups itself but snaps through its CalloutIndex
+                    ids[gap] = getattr(index, "index", index).nearest(pts[gap], max_distance=snap_distance)[0]
+            acc.add(pts, ids)
+            stats = ChunkStats(index=i, rows=len(chunk), read_s=t1 - t0, label_s=time.perf_counter() - t1)
+            if summary is not None:
+                summary.chunks.append(stats)
+                summary.wall_s = time.perf_counter() - t_start
+            yield stats
+            i += 1
+    finally:
+        if summary is not None:
+            summary.wall_s = time.perf_counter() - t_start
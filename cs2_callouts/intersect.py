@@ -0,0 +1,248 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .lookup import CalloutIndex, expand_ranges
+
+# Segments whose candidate pairs are gathered at once; bounds memory for long segment batches
+SEGMENT_BATCH = 65_536
+
+# Intervals shorter than this (in segment parameter) are grazing contacts and are dropped
+_MIN_SPAN = 1e-12
+
+
+@dataclass
+class SegmentHits:
+    """Callout intervals along each query segment (or polyline), ordered by entry.
+
+    ``t_enter``/``t_exit`` are segment parameters in [0, 1] (start to end).
+    For polylines they are in vertex units: ``k + t`` lies on the segment
+    from vertex ``k`` to ``k + 1``. A path that leaves a callout and comes
+    back produces two hits.
+    """
+
+    segment: np.ndarray  # int64 query index
+    callout: np.ndarray  # int64 callout id
+    t_enter: np.ndarray
+    t_exit: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.segment)
+
+    @classmethod
+    def empty(cls) -> "SegmentHits":
+        return cls(np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64), np.zeros(0), np.zeros(0))
+
+    def _take(self, idx: np.ndarray) -> "SegmentHits":
+        return SegmentHits(self.segment[idx], self.callout[idx], self.t_enter[idx], self.t_exit[idx])
+
+    def sequences(self, names: Sequence[str], count: Optional[int] = None) -> List[List[str]]:
+        """Ordered callout names crossed by each query (``count`` queries, default: up to the last hit)."""
+        n = count if count is not None else (int(self.segment.max()) + 1 if len(self) else 0)
+        out: List[List[str]] = [[] for _ in range(n)]
+        for seg, cid in zip(self.segment.tolist(), self.callout.tolist()):
+            out[seg].append(names[cid])
+        return out
+
+
+def _as_segments(starts, ends) -> Tuple[np.ndarray, np.ndarray]:
+    a = np.asarray(starts, dtype=np.float64)
+    b = np.asarray(ends, dtype=np.float64)
+    if a.ndim == 1:
+        a, b = a[None, :], b[None, :]
+    if a.shape != b.shape or a.ndim != 2 or a.shape[1] not in (2, 3):
+        raise ValueError(f"Expected matching (N, 2) or (N, 3) segment endpoints, got {a.shape} and {b.shape}")
+    return a, b
+
+
+def segment_candidates(index: CalloutIndex, a: np.ndarray, b: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """(segment, polygon) pairs whose bounding box the segment passes through, grouped by segment.
+
+    Polygons overlapping each segment's bounding box come from the grid
+    (``CalloutIndex.box_candidates``) and are then checked with a slab test
+    against the polygon bounding box.
+    """
+    seg_idx, poly_idx = index.box_candidates(np.minimum(a[:, :2], b[:, :2]), np.maximum(a[:, :2], b[:, :2]))
+
+    # Slab test: the parameter range inside the bbox must be non-empty within [0, 1]
+    p = a[seg_idx, :2]
+    d = b[seg_idx, :2] - p
+    bb = index.bboxes[poly_idx]
+    t0 = np.zeros(len(seg_idx))
+    t1 = np.ones(len(seg_idx))
+    for axis in (0, 1):
+        da = d[:, axis]
+        moving = da != 0
+        safe = np.where(moving, da, 1.0)
+        ta = (bb[:, axis] - p[:, axis]) / safe
+        tb = (bb[:, axis + 2] - p[:, axis]) / safe
+        t0 = np.where(moving, np.maximum(t0, np.minimum(ta, tb)), t0)
+        t1 = np.where(moving, np.minimum(t1, np.maximum(ta, tb)), t1)
+        inside_slab = (p[:, axis] >= bb[:, axis]) & (p[:, axis] <= bb[:, axis + 2])
+        t1 = np.where(moving | inside_slab, t1, -1.0)
+    keep = t0 <= t1
+    return seg_idx[keep], poly_idx[keep]
+
+
+def _pair_intervals(
+    index: CalloutIndex, a: np.ndarray, b: np.ndarray, seg_idx: np.ndarray, poly_idx: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Inside intervals ``(pair, t_enter, t_exit)`` of each (segment, polygon) pair.
+
+    Every polygon edge is classified by which side of the segment's line its
+    endpoints fall on; edges that change side are crossings at parameter
+    ``t`` along the infinite line. Crossings before the start give the
+    even-odd inside state at ``t = 0``, and each crossing in [0, 1] toggles
+    it, so entries and exits alternate per pair. This is the same parity
+    rule as ``CalloutIndex.contains_pairs`` and does not assume convexity.
+    """
+    ax, ay, dx, dy, _, _ = index._edge_arrays()
+    pair_parts, t_parts = [], []
+    start_inside = np.zeros(len(seg_idx), dtype=bool)
+    for start, stop, owner, e in index._pair_chunks(poly_idx):
+        segs = seg_idx[start:stop][owner]
+        px, py = a[segs, 0], a[segs, 1]
+        rx, ry = b[segs, 0] - px, b[segs, 1] - py
+        qx, qy = ax[e] - px, ay[e] - py
+        side_a = rx * qy - ry * qx
+        r_cross_d = rx * dy[e] - ry * dx[e]
+        crossing = (side_a > 0) != (side_a + r_cross_d > 0)
+        # Sides differ only when r x d is non-zero
+        t = (qx * dy[e] - qy * dx[e]) / np.where(crossing, r_cross_d, 1.0)
+        before = crossing & (t < 0)
+        start_inside[start:stop] = (np.bincount(owner, weights=before, minlength=stop - start).astype(np.int64) & 1) == 1
+        within = np.flatnonzero(crossing & (t >= 0) & (t <= 1))
+        pair_parts.append(owner[within] + start)
+        t_parts.append(t[within])
+    pair = np.concatenate(pair_parts) if pair_parts else np.zeros(0, dtype=np.int64)
+    t = np.concatenate(t_parts) if t_parts else np.zeros(0)
+
+    order = np.lexsort((t, pair))
+    pair, t = pair[order], t[order]
+    first = np.r_[True, pair[1:] != pair[:-1]] if len(pair) else np.zeros(0, dtype=bool)
+    rank = np.arange(len(pair)) - np.maximum.accumulate(np.where(first, np.arange(len(pair)), 0))
+    inside_before = start_inside[pair] ^ ((rank & 1) == 1)
+    n_cross = np.bincount(pair, minlength=len(seg_idx))
+    end_inside = start_inside ^ ((n_cross & 1) == 1)
+
+    starts_in = np.flatnonzero(start_inside)
+    ends_in = np.flatnonzero(end_inside)
+    enter_pair = np.concatenate([starts_in, pair[~inside_before]])
+    enter_t = np.concatenate([np.zeros(len(starts_in)), t[~inside_before]])
+    exit_pair = np.concatenate([pair[inside_before], ends_in])
+    exit_t = np.concatenate([t[inside_before], np.ones(len(ends_in))])
+    eo = np.lexsort((enter_t, enter_pair))
+    xo = np.lexsort((exit_t, exit_pair))
+    return enter_pair[eo], enter_t[eo], exit_t[xo]
+
+
+def _clip_to_zspans(
+    index: CalloutIndex, a: np.ndarray, b: np.ndarray, seg: np.ndarray, callout: np.ndarray,
+    t_enter: np.ndarray, t_exit: np.ndarray, z_margin: float,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Narrow intervals to where the segment's Z is inside the callout's Z span (NaN spans pass)."""
+    zs = index.zspans[callout]
+    known = ~np.isnan(zs).any(axis=1)
+    z0 = a[seg, 2]
+    dz = b[seg, 2] - z0
+    zlo, zhi = zs[:, 0] - z_margin, zs[:, 1] + z_margin
+    moving = known & (dz != 0)
+    safe = np.where(moving, dz, 1.0)
+    ta, tb = (zlo - z0) / safe, (zhi - z0) / safe
+    t_enter = np.where(moving, np.maximum(t_enter, np.minimum(ta, tb)), t_enter)
+    t_exit = np.where(moving, np.minimum(t_exit, np.maximum(ta, tb)), t_exit)
+    level = known & (dz == 0) & ((z0 < zlo) | (z0 > zhi))
+    t_exit = np.where(level, -1.0, t_exit)
+    return t_enter, t_exit
+
+
+def intersect_segments(
+    index: CalloutIndex,
+    starts,
+    ends,
+    use_z: bool = True,
+    z_margin: float = 0.0,
+) -> SegmentHits:
+    """Callouts crossed by each segment ``starts[i] -> ends[i]``, with entry/exit parameters.
+
+    Endpoints are (N, 2) or (N, 3). With Z and ``use_z``, intervals are
+    clipped to each callout's ``z_min``/``z_max`` (widened by ``z_margin``)
+    when the index has them, so a smoke arcing high over a callout does not
+    count as passing through it. Segments of zero length report the callout
+    containing their point as a full [0, 1] hit.
+    """
+    a, b = _as_segments(starts, ends)
+    parts: List[SegmentHits] = []
+    for s0 in range(0, len(a), SEGMENT_BATCH):
+        sa, sb = a[s0:s0 + SEGMENT_BATCH], b[s0:s0 + SEGMENT_BATCH]
+        seg_idx, poly_idx = segment_candidates(index, sa, sb)
+        if len(seg_idx) == 0:
+            continue
+        pair, t_enter, t_exit = _pair_intervals(index, sa, sb, seg_idx, poly_idx)
+        seg, callout = seg_idx[pair], poly_idx[pair]
+        point_hit = np.zeros(len(seg), dtype=bool)
+
+        # Zero-length segments have no side to classify edges by; test their point directly
+        d = sb[seg_idx, :2] - sa[seg_idx, :2]
+        still = np.flatnonzero((d[:, 0] == 0) & (d[:, 1] == 0))
+        if len(still):
+            hit = still[index.contains_pairs(sa[:, :2], seg_idx[still], poly_idx[still])]
+            seg = np.concatenate([seg, seg_idx[hit]])
+            callout = np.concatenate([callout, poly_idx[hit]])
+            t_enter = np.concatenate([t_enter, np.zeros(len(hit))])
+            t_exit = np.concatenate([t_exit, np.ones(len(hit))])
+            point_hit = np.concatenate([point_hit, np.ones(len(hit), dtype=bool)])
+
+        if use_z and a.shape[1] == 3 and index.zspans is not None:
+            t_enter, t_exit = _clip_to_zspans(index, sa, sb, seg, callout, t_enter, t_exit, z_margin)
+        keep = ((t_exit - t_enter) > _MIN_SPAN) | (point_hit & (t_exit >= t_enter))
+        parts.append(SegmentHits(seg[keep] + s0, callout[keep], t_enter[keep], t_exit[keep]))
+    if not parts:
+        return SegmentHits.empty()
+    hits = SegmentHits(*(np.concatenate([getattr(h, f) for h in parts]) for f in ("segment", "callout", "t_enter", "t_exit")))
+    return hits._take(np.lexsort((hits.callout, hits.t_enter, hits.segment)))
+
+
+def intersect_polylines(
+    index: CalloutIndex,
+    polylines: Sequence,
+    use_z: bool = True,
+    z_margin: float = 0.0,
+) -> SegmentHits:
+    """Callouts crossed by each polyline (a (V, 2) or (V, 3) array, e.g. a grenade trajectory).
+
+    Consecutive vertices form segments that are queried in one batch;
+    intervals of the same callout that meet at a shared vertex are merged,
+    so a path through a callout yields one hit. Parameters are in vertex
+    units (see ``SegmentHits``).
+    """
+    paths = [np.asarray(p, dtype=np.float64) for p in polylines]
+    if not paths:
+        return SegmentHits.empty()
+    dims = {p.shape[1] for p in paths if p.ndim == 2}
+    if len(dims) > 1 or any(p.ndim != 2 for p in paths):
+        raise ValueError("Polylines must all be (V, 2) or all be (V, 3) arrays")
+    lengths = np.array([max(len(p) - 1, 0) for p in paths], dtype=np.int64)
+    verts = np.concatenate(paths)
+    vstart = np.cumsum([0] + [len(p) for p in paths[:-1]])
+    owner, first_vertex = expand_ranges(vstart, lengths)
+    local = first_vertex - vstart[owner]
+    if len(first_vertex) == 0:
+        return SegmentHits.empty()
+    hits = intersect_segments(index, verts[first_vertex], verts[first_vertex + 1], use_z=use_z, z_margin=z_margin)
+    line = owner[hits.segment]
+    t_enter = local[hits.segment] + hits.t_enter
+    t_exit = local[hits.segment] + hits.t_exit
+
+    # Merge runs of the same callout that continue across a vertex
+    order = np.lexsort((t_enter, hits.callout, line))
+    line, callout, t_enter, t_exit = line[order], hits.callout[order], t_enter[order], t_exit[order]
+    cont = np.zeros(len(line), dtype=bool)
+    cont[1:] = (line[1:] == line[:-1]) & (callout[1:] == callout[:-1]) & (t_enter[1:] <= t_exit[:-1] + 1e-9)
+    run_start = np.flatnonzero(~cont)
+    t_last = np.maximum.reduceat(t_exit, run_start) if len(run_start) else t_exit
+    merged = SegmentHits(line[run_start], callout[run_start], t_enter[run_start], t_last)
+    return merged._take(np.lexsort((merged.callout, merged.t_enter, merged.segment)))
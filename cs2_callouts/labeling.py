@@ -0,0 +1,429 @@
+from __future__ import annotations
+
+import csv
+import gzip
+import io
+import multiprocessing
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from itertools import islice
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .lookup import CalloutIndex, SharedCalloutIndex, SharedIndexSpec, attach_shared_index
+
+DEFAULT_CHUNK_SIZE = 250_000
+
+
+@dataclass
+class PositionChunk:
+    """A fixed-size slice of a position table, column-oriented."""
+
+    columns: Dict[str, np.ndarray]
+    start: int = 0
+
+    def __len__(self) -> int:
+        for col in self.columns.values():
+            return len(col)
+        return 0
+
+
+@dataclass
+class ChunkStats:
+    index: int
+    rows: int
+    read_s: float = 0.0
+    label_s: float = 0.0
+    write_s: float = 0.0
+
+    @property
+    def total_s(self) -> float:
+        return self.read_s + self.label_s + self.write_s
+
+    @property
+    def rows_per_s(self) -> float:
+        return self.rows / self.total_s if self.total_s > 0 else float("inf")
+
+
+@dataclass
+class StreamSummary:
+    chunks: List[ChunkStats] = field(default_factory=list)
+    wall_s: float = 0.0
+
+    @property
+    def rows(self) -> int:
+        return sum(c.rows for c in self.chunks)
+
+    @property
+    def rows_per_s(self) -> float:
+        return self.rows / self.wall_s if self.wall_s > 0 else float("inf")
+
+    def latency_percentiles(self, qs: Sequence[float] = (50, 99)) -> Dict[str, float]:
+        if not self.chunks:
+            return {f"p{int(q)}": 0.0 for q in qs}
+        lat = np.array([c.total_s for c in self.chunks])
+        return {f"p{int(q)}": float(np.percentile(lat, q)) for q in qs}
+
+
+def _is_parquet(path: Path) -> bool:
+    return path.suffix.lower() in (".parquet", ".pq")
+
+
+def _optional_pyarrow():
+    """pyarrow if installed; it speeds up CSV I/O but is only required for Parquet."""
+    try:
+        import pyarrow
+        import pyarrow.csv  # noqa: F401
+        import pyarrow.parquet  # noqa: F401
+    except ImportError:
+        return None
+    return pyarrow
+
+
+def _require_pyarrow():
+    try:
+        import pyarrow  # noqa: F401
+        import pyarrow.parquet  # noqa: F401
+    except ImportError as e:
+        raise RuntimeError("Parquet support requires pyarrow (pip install pyarrow)") from e
+    return pyarrow
+
+
+def _open_text(path: Path, mode: str):
+    if path.suffix.lower() == ".gz":
+        return io.TextIOWrapper(gzip.open(path, mode + "b"), encoding="utf-8-sig" if mode == "r" else "utf-8", newline="")
+    return open(path, mode, encoding="utf-8-sig" if mode == "r" else "utf-8", newline="")
+
+
+def _iter_csv(path: Path, chunk_size: int, columns: Optional[Sequence[str]]) -> Iterator[PositionChunk]:
+    with _open_text(path, "r") as f:
+        reader = csv.reader(f)
+        header = next(reader, None)
+        if header is None:
+            return
+        wanted = [i for i, h in enumerate(header) if columns is None or h in columns]
+        start = 0
+        while True:
+            rows = list(islice(reader, chunk_size))
+            if not rows:
+                return
+            cols = list(zip(*rows))
+            yield PositionChunk({header[i]: np.array(cols[i], dtype=object) for i in wanted}, start=start)
+            start += len(rows)
+
+
+def _iter_arrow_batches(batches, chunk_size: int) -> Iterator[PositionChunk]:
+    """Re-slice Arrow record batches of arbitrary size into chunks of exactly ``chunk_size`` rows."""
+    import pyarrow as pa
+
+    pending = []
+    pending_rows = 0
+    start = 0
+
+    def emit(table) -> PositionChunk:
+        return PositionChunk(
+            {name: table.column(name).to_numpy(zero_copy_only=False) for name in table.column_names}, start=start
+        )
+
+    for batch in batches:
+        pending.append(batch)
+        pending_rows += batch.num_rows
+        while pending_rows >= chunk_size:
+            table = pa.Table.from_batches(pending)
+            yield emit(table.slice(0, chunk_size))
+            start += chunk_size
+            rest = table.slice(chunk_size)
+            pending = rest.to_batches()
+            pending_rows = rest.num_rows
+    if pending_rows:
+        yield emit(pa.Table.from_batches(pending))
+
+
+def _iter_arrow_csv(path: Path, chunk_size: int, columns: Optional[Sequence[str]]) -> Iterator[PositionChunk]:
+    pa = _optional_pyarrow()
+    convert = pa.csv.ConvertOptions(include_columns=list(columns) if columns else None)
+    stream = pa.input_stream(str(path), compression="detect")
+    reader = pa.csv.open_csv(stream, convert_options=convert)
+    try:
+        yield from _iter_arrow_batches(reader, chunk_size)
+    finally:
+        stream.close()
+
+
+def _iter_parquet(path: Path, chunk_size: int, columns: Optional[Sequence[str]]) -> Iterator[PositionChunk]:
+    pa = _require_pyarrow()
+    pf = pa.parquet.ParquetFile(path)
+    yield from _iter_arrow_batches(pf.iter_batches(batch_size=chunk_size, columns=list(columns) if columns else None), chunk_size)
+
+
+def iter_position_chunks(
+    path: str | Path,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    columns: Optional[Sequence[str]] = None,
+) -> Iterator[PositionChunk]:
+    """Stream an awpy-style position table (CSV, CSV.gz or Parquet) in chunks of ``chunk_size`` rows.
+
+    CSV goes through pyarrow's streaming reader when it is installed and the
+    stdlib csv module otherwise (columns are then object arrays of strings).
+    """
+    p = Path(path)
+    if _is_parquet(p):
+        return _iter_parquet(p, chunk_size, columns)
+    if _optional_pyarrow() is not None:
+        return _iter_arrow_csv(p, chunk_size, columns)
+    return _iter_csv(p, chunk_size, columns)
+
+
+def resolve_xy_columns(columns: Sequence[str], x_col: Optional[str] = None, y_col: Optional[str] = None) -> Tuple[str, str]:
+    """Pick the X/Y columns, accepting awpy's ``X``/``Y`` as well as ``x``/``y``."""
+    lower = {c.lower(): c for c in columns}
+    x = x_col or lower.get("x")
+    y = y_col or lower.get("y")
+    if not x or x not in columns or not y or y not in columns:
+        raise ValueError(f"Could not find X/Y columns in {list(columns)}; pass them explicitly")
+    return x, y
+
+
+def _chunk_xy(chunk: PositionChunk, x_col: str, y_col: str) -> np.ndarray:
+    return np.column_stack(
+        [np.asarray(chunk.columns[x_col], dtype=np.float64), np.asarray(chunk.columns[y_col], dtype=np.float64)]
+    )
+
+
+def _with_labels(chunk: PositionChunk, labels: np.ndarray, label_col: str) -> PositionChunk:
+    cols = dict(chunk.columns)
+    cols[label_col] = labels
+    return PositionChunk(cols, start=chunk.start)
+
+
+def label_chunk(
+    chunk: PositionChunk,
+    index: CalloutIndex,
+    x_col: str,
+    y_col: str,
+    label_col: str = "callout",
+    snap_distance: Optional[float] = None,
+) -> PositionChunk:
+    """Return ``chunk`` with a ``label_col`` column of callout names ("" when unlabelled).
+
+    ``snap_distance`` labels points in gaps between callouts with the nearest
+    one when it is at most that far away (see ``CalloutIndex.nearest``).
+    """
+    labels = index.label(_chunk_xy(chunk, x_col, y_col), snap_distance=snap_distance)
+    return _with_labels(chunk, labels, label_col)
+
+
+# Per-process state of parallel labeling workers, set by _init_worker
+_worker_index: Optional[CalloutIndex] = None
+_worker_shm = None
+
+
+def _init_worker(spec: SharedIndexSpec) -> None:
+    global _worker_index, _worker_shm
+    _worker_index, _worker_shm = attach_shared_index(spec)
+
+
+def _lookup_in_worker(xy: np.ndarray, snap_distance: Optional[float]) -> np.ndarray:
+    if snap_distance is None:
+        return _worker_index.lookup(xy).astype(np.int32)
+    return _worker_index.nearest(xy, max_distance=snap_distance)[0].astype(np.int32)
+
+
+def _arrow_table(pa, chunk: PositionChunk):
+    return pa.table({name: pa.array(col.tolist() if col.dtype == object else col) for name, col in chunk.columns.items()})
+
+
+class CsvChunkWriter:
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._pa = _optional_pyarrow()
+        self._header: Optional[List[str]] = None
+        if self._pa is not None:
+            compression = "gzip" if self.path.suffix.lower() == ".gz" else None
+            self._stream = self._pa.output_stream(str(self.path), compression=compression)
+            self._arrow_writer = None
+        else:
+            self._f = _open_text(self.path, "w")
+            self._writer = csv.writer(self._f)
+
+    def write(self, chunk: PositionChunk) -> None:
+        if self._pa is not None:
+            table = _arrow_table(self._pa, chunk)
+            if self._arrow_writer is None:
+                self._arrow_writer = self._pa.csv.CSVWriter(self._stream, table.schema)
+            self._arrow_writer.write_table(table)
+            return
+        if self._header is None:
+            self._header = list(chunk.columns)
+            self._writer.writerow(self._header)
+        self._writer.writerows(zip(*(chunk.columns[c].tolist() for c in self._header)))
+
+    def close(self) -> None:
+        if self._pa is not None:
+            if self._arrow_writer is not None:
+                self._arrow_writer.close()
+            self._stream.close()
+        else:
+            self._f.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class ParquetChunkWriter:
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._pa = _require_pyarrow()
+        self._writer = None
+
+    def write(self, chunk: PositionChunk) -> None:
+        table = _arrow_table(self._pa, chunk)
+        if self._writer is None:
+            self._writer = self._pa.parquet.ParquetWriter(self.path, table.schema)
+        self._writer.write_table(table)
+
+    def close(self) -> None:
+        if self._writer is not None:
+            self._writer.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def open_chunk_writer(path: str | Path):
+    """Incremental writer chosen by extension (.parquet or CSV/CSV.gz)."""
+    return ParquetChunkWriter(path) if _is_parquet(Path(path)) else CsvChunkWriter(path)
+
+
+def stream_label(
+    positions: str | Path,
+    index: CalloutIndex,
+    out_path: str | Path | None = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    x_col: Optional[str] = None,
+    y_col: Optional[str] = None,
+    label_col: str = "callout",
+    summary: Optional[StreamSummary] = None,
+    workers: int = 1,
+    snap_distance: Optional[float] = None,
+) -> Iterator[Tuple[PositionChunk, ChunkStats]]:
+    """Label a position table chunk by chunk, optionally writing each chunk as it is done.
+
+    Only one chunk is held in memory at a time. Yields the labelled chunk with
+    its timing; pass a ``StreamSummary`` to collect totals. ``index`` may also
+    be a ``partition.CalloutPartition`` (in-process only). With ``workers`` > 1
+    see ``stream_label_parallel``.
+    """
+    if workers > 1:
+        yield from stream_label_parallel(
+            positions, index, out_path=out_path, chunk_size=chunk_size, x_col=x_col, y_col=y_col,
+            label_col=label_col, summary=summary, workers=workers, snap_distance=snap_distance,
+        )
+        return
+    t_start = time.perf_counter()
+    writer = open_chunk_writer(out_path) if out_path else None
+    try:
+        chunks = iter_position_chunks(positions, chunk_size=chunk_size)
+        i = 0
+        while True:
+            t0 = time.perf_counter()
+            chunk = next(chunks, None)
+            t1 = time.perf_counter()
+            if chunk is None:
+                break
+            xc, yc = resolve_xy_columns(list(chunk.columns), x_col, y_col)
+            labelled = label_chunk(chunk, index, xc, yc, label_col=label_col, snap_distance=snap_distance)
+            t2 = time.perf_counter()
+            if writer is not None:
+                writer.write(labelled)
+            t3 = time.perf_counter()
+            stats = ChunkStats(index=i, rows=len(chunk), read_s=t1 - t0, label_s=t2 - t1, write_s=t3 - t2)
+            if summary is not None:
+                summary.chunks.append(stats)
+                summary.wall_s = time.perf_counter() - t_start
+            yield labelled, stats
+            i += 1
+    finally:
+        if writer is not None:
+            writer.close()
+        if summary is not None:
+            summary.wall_s = time.perf_counter() - t_start
+
+
+def stream_label_parallel(
+    positions: str | Path,
+    index: CalloutIndex,
+    out_path: str | Path | None = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    x_col: Optional[str] = None,
+    y_col: Optional[str] = None,
+    label_col: str = "callout",
+    summary: Optional[StreamSummary] = None,
+    workers: Optional[int] = None,
+    prefetch: int = 2,
+    snap_distance: Optional[float] = None,
+) -> Iterator[Tuple[PositionChunk, ChunkStats]]:
+    """``stream_label`` with the point lookups spread over a process pool.
+
+    The index is published once into shared memory and every worker maps it
+    zero-copy at start-up, so only each chunk's (N, 2) coordinates and the
+    int32 callout ids cross process boundaries. The parent reads and writes;
+    chunks come back in input order and at most ``workers * prefetch`` are in
+    flight, which keeps memory bounded. ``label_s`` in the stats is the time
+    spent waiting on the pool for that chunk.
+    """
+    workers = workers or multiprocessing.cpu_count()
+    t_start = time.perf_counter()
+    writer = open_chunk_writer(out_path) if out_path else None
+    with SharedCalloutIndex(index) as shared, multiprocessing.Pool(
+        workers, initializer=_init_worker, initargs=(shared.spec,)
+    ) as pool:
+        try:
+            in_flight: deque = deque()
+            chunks = iter_position_chunks(positions, chunk_size=chunk_size)
+
+            def finish(i: int) -> Tuple[PositionChunk, ChunkStats]:
+                chunk, pending, read_s = in_flight.popleft()
+                t1 = time.perf_counter()
+                labelled = _with_labels(chunk, index.names_for(pending.get()), label_col)
+                t2 = time.perf_counter()
+                if writer is not None:
+                    writer.write(labelled)
+                t3 = time.perf_counter()
+                stats = ChunkStats(index=i, rows=len(chunk), read_s=read_s, label_s=t2 - t1, write_s=t3 - t2)
+                if summary is not None:
+                    summary.chunks.append(stats)
+                    summary.wall_s = time.perf_counter() - t_start
+                return labelled, stats
+
+            done = 0
+            while True:
+                t0 = time.perf_counter()
+                chunk = next(chunks, None)
+                read_s = time.perf_counter() - t0
+                if chunk is None:
+                    break
+                xc, yc = resolve_xy_columns(list(chunk.columns), x_col, y_col)
+                in_flight.append((chunk, pool.apply_async(_lookup_in_worker, (_chunk_xy(chunk, xc, yc), snap_distance)), read_s))
+                if len(in_flight) >= workers * prefetch:
+                    yield finish(done)
+                    done += 1
+            while in_flight:
+                yield finish(done)
+                done += 1
+        finally:
+            if writer is not None:
+                writer.close()
+            if summary is not None:
+                summary.wall_s = time.perf_counter() - t_start
@@ -0,0 +1,545 @@
+from __future__ import annotations
+
+import json
+from dataclasses import dataclass, field
+from multiprocessing import shared_memory
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+# Upper bound on (point, polygon edge) pairs tested at once; keeps lookup memory flat
+MAX_EDGE_PAIRS = 4_000_000
+
+# nearest() buckets candidates on the lookup grid split this many times per axis, within a cell budget
+NEAR_SUBDIVISION = 4
+MAX_NEAR_CELLS = 1 << 16
+
+# Relative slack on bound comparisons; lower and upper bounds coincide when the nearest point is an extreme vertex
+_BOUND_SLACK = 1e-9
+
+# CalloutIndex fields that are published into shared memory, in layout order
+_SHARED_FIELDS = ("vertices", "offsets", "bboxes", "areas", "cell_offsets", "cell_items")
+
+
+def expand_ranges(starts: np.ndarray, counts: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Concatenate ranges [starts[i], starts[i] + counts[i]) without a Python loop.
+
+    Returns ``(owner, values)`` where ``owner[k]`` is the range index that
+    produced ``values[k]``.
+    """
+    counts = np.asarray(counts, dtype=np.int64)
+    total = int(counts.sum())
+    owner = np.repeat(np.arange(len(counts), dtype=np.int64), counts)
+    if total == 0:
+        return owner, np.zeros(0, dtype=np.int64)
+    first = np.cumsum(counts) - counts
+    values = np.asarray(starts, dtype=np.int64)[owner] + (np.arange(total, dtype=np.int64) - first[owner])
+    return owner, values
+
+
+def group_starts(keys: np.ndarray) -> np.ndarray:
+    """Start index of every run of equal consecutive values in ``keys``."""
+    if len(keys) == 0:
+        return np.zeros(0, dtype=np.int64)
+    return np.flatnonzero(np.r_[True, keys[1:] != keys[:-1]])
+
+
+def next_vertex(offsets: np.ndarray) -> np.ndarray:
+    """Index of the following vertex of each polygon vertex (closing the ring)."""
+    n = int(offsets[-1])
+    nxt = np.arange(1, n + 1, dtype=np.int64)
+    counts = np.diff(offsets)
+    nonempty = counts > 0
+    nxt[offsets[1:][nonempty] - 1] = offsets[:-1][nonempty]
+    return nxt
+
+
+@dataclass
+class CalloutIndex:
+    """Flat-array point-in-callout index over processed ``polygon_2d`` data.
+
+    Polygons are stored as one (V, 2) vertex array with (P + 1,) offsets.
+    A uniform grid maps each cell to the polygons whose bounding box touches
+    it (``cell_offsets``/``cell_items``), so a query only tests polygons
+    sharing the point's cell. All state is plain NumPy arrays.
+    """
+
+    names: List[str]
+    vertices: np.ndarray
+    offsets: np.ndarray
+    bboxes: np.ndarray
+    areas: np.ndarray
+    grid_origin: np.ndarray
+    cell_size: float
+    grid_shape: Tuple[int, int]
+    cell_offsets: np.ndarray
+    cell_items: np.ndarray
+    # (P, 2) world Z range of each callout volume, NaN where unknown; only segment queries use it
+    zspans: Optional[np.ndarray] = None
+    # Per-cell candidate lists for nearest(); built on first use
+    _near: Optional[Tuple[int, np.ndarray, np.ndarray]] = field(default=None, init=False, repr=False, compare=False)
+    _edges: Optional[Tuple[np.ndarray, ...]] = field(default=None, init=False, repr=False, compare=False)
+    _extremes: Optional[np.ndarray] = field(default=None, init=False, repr=False, compare=False)
+
+    @classmethod
+    def from_polygons(
+        cls,
+        names: Sequence[str],
+        polygons: Sequence[Sequence[Sequence[float]]],
+        cell_size: Optional[float] = None,
+        zspans: Optional[Sequence[Sequence[float]]] = None,
+    ) -> "CalloutIndex":
+        counts = np.array([len(p) for p in polygons], dtype=np.int64)
+        offsets = np.zeros(len(polygons) + 1, dtype=np.int64)
+        np.cumsum(counts, out=offsets[1:])
+        if offsets[-1]:
+            vertices = np.array([pt[:2] for p in polygons for pt in p], dtype=np.float64).reshape(-1, 2)
+        else:
+            vertices = np.zeros((0, 2), dtype=np.float64)
+
+        bboxes = np.full((len(polygons), 4), np.nan, dtype=np.float64)
+        areas = np.zeros(len(polygons), dtype=np.float64)
+        valid = counts >= 3
+        if valid.any():
+            starts = offsets[:-1][valid]
+            bboxes[valid, :2] = np.minimum.reduceat(vertices, starts, axis=0)
+            bboxes[valid, 2:] = np.maximum.reduceat(vertices, starts, axis=0)
+            nxt = next_vertex(offsets)
+            cross = vertices[:, 0] * vertices[nxt, 1] - vertices[nxt, 0] * vertices[:, 1]
+            areas[valid] = np.abs(0.5 * np.add.reduceat(cross, starts))
+
+        if valid.any():
+            lo = np.nanmin(bboxes[:, :2], axis=0)
+            hi = np.nanmax(bboxes[:, 2:], axis=0)
+        else:
+            lo = np.zeros(2)
+            hi = np.ones(2)
+        if cell_size is None:
+            # Roughly 4 cells per polygon along the longer axis
+            span = float(max(hi - lo))
+            cell_size = max(span / max(2.0 * np.sqrt(max(int(valid.sum()), 1)), 1.0), 1.0)
+        shape = (
+            int(np.floor((hi[0] - lo[0]) / cell_size)) + 1,
+            int(np.floor((hi[1] - lo[1]) / cell_size)) + 1,
+        )
+
+        buckets: Dict[int, List[int]] = {}
+        for p in np.flatnonzero(valid).tolist():
+            cx0, cy0 = np.floor((bboxes[p, :2] - lo) / cell_size).astype(int)
+            cx1, cy1 = np.floor((bboxes[p, 2:] - lo) / cell_size).astype(int)
+            for cy in range(cy0, min(cy1, shape[1] - 1) + 1):
+                for cx in range(cx0, min(cx1, shape[0] - 1) + 1):
+                    buckets.setdefault(cy * shape[0] + cx, []).append(p)
+        ncells = shape[0] * shape[1]
+        cell_counts = np.zeros(ncells, dtype=np.int64)
+        for c, items in buckets.items():
+            cell_counts[c] = len(items)
+        cell_offsets = np.zeros(ncells + 1, dtype=np.int64)
+        np.cumsum(cell_counts, out=cell_offsets[1:])
+        cell_items = np.zeros(int(cell_offsets[-1]), dtype=np.int64)
+        for c, items in buckets.items():
+            cell_items[cell_offsets[c]:cell_offsets[c + 1]] = items
+
+        return cls(
+            names=[str(n) for n in names],
+            vertices=vertices,
+            offsets=offsets,
+            bboxes=bboxes,
+            areas=areas,
+            grid_origin=np.asarray(lo, dtype=np.float64),
+            cell_size=float(cell_size),
+            grid_shape=shape,
+            cell_offsets=cell_offsets,
+            cell_items=cell_items,
+            zspans=None if zspans is None else np.asarray(zspans, dtype=np.float64).reshape(len(polygons), 2),
+        )
+
+    @classmethod
+    def from_output(cls, data: Dict, polygon_key: str = "polygon_2d", cell_size: Optional[float] = None) -> "CalloutIndex":
+        """Build from the dict written by ``pipeline.process_callouts``."""
+        items = data.get("callouts", [])
+        names = [it.get("name") or it.get("placename") or "?" for it in items]
+        polys = [it.get(polygon_key) or it.get("polygon_2d") or [] for it in items]
+        zspans = None
+        if any("z_min" in it for it in items):
+            zspans = [[it.get("z_min", np.nan), it.get("z_max", np.nan)] for it in items]
+        return cls.from_polygons(names, polys, cell_size=cell_size, zspans=zspans)
+
+    @classmethod
+    def from_json(cls, path: str | Path, polygon_key: str = "polygon_2d", cell_size: Optional[float] = None) -> "CalloutIndex":
+        data = json.loads(Path(path).read_text(encoding="utf-8-sig"))
+        return cls.from_output(data, polygon_key=polygon_key, cell_size=cell_size)
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    @property
+    def nbytes(self) -> int:
+        arrays = (self.vertices, self.offsets, self.bboxes, self.areas, self.cell_offsets, self.cell_items, self.zspans)
+        return int(sum(a.nbytes for a in arrays if a is not None))
+
+    def candidates(self, xy: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """(point, polygon) pairs whose grid cell and bounding box both contain the point."""
+        nx, ny = self.grid_shape
+        cell = np.floor((xy - self.grid_origin) / self.cell_size).astype(np.int64)
+        in_grid = (cell[:, 0] >= 0) & (cell[:, 0] < nx) & (cell[:, 1] >= 0) & (cell[:, 1] < ny)
+        pts = np.flatnonzero(in_grid)
+        cid = cell[pts, 1] * nx + cell[pts, 0]
+        owner, slots = expand_ranges(self.cell_offsets[cid], self.cell_offsets[cid + 1] - self.cell_offsets[cid])
+        pt_idx = pts[owner]
+        poly_idx = self.cell_items[slots]
+        bb = self.bboxes[poly_idx]
+        p = xy[pt_idx]
+        keep = (p[:, 0] >= bb[:, 0]) & (p[:, 0] <= bb[:, 2]) & (p[:, 1] >= bb[:, 1]) & (p[:, 1] <= bb[:, 3])
+        return pt_idx[keep], poly_idx[keep]
+
+    def box_candidates(self, lo: np.ndarray, hi: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Unique (box, polygon) pairs whose bounding boxes overlap, for boxes [lo, hi] given as (K, 2) corners.
+
+        Polygons come from the grid cells under each box; results are grouped by box.
+        """
+        nx, ny = self.grid_shape
+        c0 = np.maximum(np.floor((lo - self.grid_origin) / self.cell_size).astype(np.int64), 0)
+        c1 = np.minimum(np.floor((hi - self.grid_origin) / self.cell_size).astype(np.int64), [nx - 1, ny - 1])
+        w = c1[:, 0] - c0[:, 0] + 1
+        h = c1[:, 1] - c0[:, 1] + 1
+        counts = np.where((w > 0) & (h > 0), w * h, 0)
+        box, k = expand_ranges(np.zeros(len(lo), dtype=np.int64), counts)
+        wb = w[box]
+        cid = (c0[box, 1] + k // wb) * nx + c0[box, 0] + k % wb
+        owner, slots = expand_ranges(self.cell_offsets[cid], self.cell_offsets[cid + 1] - self.cell_offsets[cid])
+        npoly = max(len(self.names), 1)
+        keys = np.unique(box[owner] * npoly + self.cell_items[slots])
+        box_idx, poly_idx = keys // npoly, keys % npoly
+        bb = self.bboxes[poly_idx]
+        keep = (
+            (bb[:, 0] <= hi[box_idx, 0]) & (bb[:, 2] >= lo[box_idx, 0])
+            & (bb[:, 1] <= hi[box_idx, 1]) & (bb[:, 3] >= lo[box_idx, 1])
+        )
+        return box_idx[keep], poly_idx[keep]
+
+    def _pair_chunks(self, poly_idx: np.ndarray):
+        """Yield ``(start, stop, owner, e)``: pair ranges whose expanded edges stay below MAX_EDGE_PAIRS.
+
+        ``e`` holds every edge start vertex of pairs ``start:stop`` and ``owner``
+        the pair (relative to ``start``) it belongs to, in contiguous runs.
+        """
+        counts = self.offsets[poly_idx + 1] - self.offsets[poly_idx]
+        edge_cum = np.cumsum(counts)
+        start = 0
+        while start < len(poly_idx):
+            base = edge_cum[start - 1] if start else 0
+            stop = max(int(np.searchsorted(edge_cum, base + MAX_EDGE_PAIRS, side="right")), start + 1)
+            owner, e = expand_ranges(self.offsets[poly_idx[start:stop]], counts[start:stop])
+            yield start, stop, owner, e
+            start = stop
+
+    def contains_pairs(self, xy: np.ndarray, pt_idx: np.ndarray, poly_idx: np.ndarray) -> np.ndarray:
+        """Even-odd point-in-polygon test for each (point, polygon) pair, vectorized over edges."""
+        inside = np.zeros(len(pt_idx), dtype=bool)
+        if len(pt_idx) == 0:
+            return inside
+        ax, ay, dx, dy, _, by = self._edge_arrays()
+        for start, stop, owner, e in self._pair_chunks(poly_idx):
+            pts = pt_idx[start:stop][owner]
+            px, py = xy[pts, 0], xy[pts, 1]
+            ey0, edy = ay[e], dy[e]
+            rel = py - ey0
+            straddle = (ey0 > py) != (by[e] > py)
+            # Only straddling edges are used, and those have a non-zero dy
+            x_cross = ax[e] + rel * dx[e] / np.where(straddle, edy, 1.0)
+            hits = straddle & (px < x_cross)
+            crossings = np.bincount(owner, weights=hits, minlength=stop - start)
+            inside[start:stop] = (crossings.astype(np.int64) & 1) == 1
+        return inside
+
+    def lookup(self, points: np.ndarray) -> np.ndarray:
+        """Callout id for every point (N, 2+), or -1 when no polygon contains it.
+
+        Overlapping hulls are resolved in favour of the smallest polygon.
+        """
+        xy = np.asarray(points, dtype=np.float64)[:, :2]
+        out = np.full(len(xy), -1, dtype=np.int64)
+        pt_idx, poly_idx = self.candidates(xy)
+        hit = self.contains_pairs(xy, pt_idx, poly_idx)
+        pt_idx, poly_idx = pt_idx[hit], poly_idx[hit]
+        if len(pt_idx):
+            order = np.lexsort((self.areas[poly_idx], pt_idx))
+            pt_sorted = pt_idx[order]
+            first = np.ones(len(order), dtype=bool)
+            first[1:] = pt_sorted[1:] != pt_sorted[:-1]
+            out[pt_sorted[first]] = poly_idx[order][first]
+        return out
+
+    def _edge_arrays(self) -> Tuple[np.ndarray, ...]:
+        """Per-vertex edge start, direction, 1/|edge|^2 (0 for degenerate edges) and end Y; cached."""
+        if self._edges is None:
+            nxt = next_vertex(self.offsets)
+            d = self.vertices[nxt] - self.vertices
+            len2 = d[:, 0] * d[:, 0] + d[:, 1] * d[:, 1]
+            inv = np.divide(1.0, len2, out=np.zeros_like(len2), where=len2 > 0)
+            self._edges = (
+                self.vertices[:, 0].copy(),
+                self.vertices[:, 1].copy(),
+                d[:, 0].copy(),
+                d[:, 1].copy(),
+                inv,
+                self.vertices[nxt, 1],
+            )
+        return self._edges
+
+    def boundary_distance_pairs(self, xy: np.ndarray, pt_idx: np.ndarray, poly_idx: np.ndarray) -> np.ndarray:
+        """Unsigned distance from each pair's point to its polygon's boundary (min over edges)."""
+        dist = np.full(len(pt_idx), np.inf)
+        if len(pt_idx) == 0:
+            return dist
+        ax, ay, dx, dy, inv, _ = self._edge_arrays()
+        for start, stop, owner, e in self._pair_chunks(poly_idx):
+            pts = pt_idx[start:stop][owner]
+            apx = xy[pts, 0] - ax[e]
+            apy = xy[pts, 1] - ay[e]
+            ex, ey = dx[e], dy[e]
+            t = (apx * ex + apy * ey) * inv[e]
+            np.clip(t, 0.0, 1.0, out=t)
+            apx -= t * ex
+            apy -= t * ey
+            d2 = apx * apx + apy * apy
+            # Each pair's edges are one contiguous run
+            dist[start:stop] = np.sqrt(np.minimum.reduceat(d2, group_starts(owner)))
+        return dist
+
+    def _extreme_vertices(self) -> np.ndarray:
+        """(P, 4, 2) vertices at min x, max x, min y and max y of each polygon (NaN if invalid)."""
+        out = np.full((len(self.names), 4, 2), np.nan)
+        counts = np.diff(self.offsets)
+        for i in np.flatnonzero(counts >= 3).tolist():
+            v = self.vertices[self.offsets[i]:self.offsets[i + 1]]
+            out[i] = v[[v[:, 0].argmin(), v[:, 0].argmax(), v[:, 1].argmin(), v[:, 1].argmax()]]
+        return out
+
+    @staticmethod
+    def _bbox_min_distance(lo: np.ndarray, hi: np.ndarray, bboxes: np.ndarray) -> np.ndarray:
+        """Lower bound: distance between rectangles [lo, hi] (K, 2) and every bbox, (K, P)."""
+        dx = np.maximum(0.0, np.maximum(bboxes[None, :, 0] - hi[:, None, 0], lo[:, None, 0] - bboxes[None, :, 2]))
+        dy = np.maximum(0.0, np.maximum(bboxes[None, :, 1] - hi[:, None, 1], lo[:, None, 1] - bboxes[None, :, 3]))
+        return np.hypot(dx, dy)
+
+    def _near_candidates(self, lo: np.ndarray, hi: np.ndarray, extremes: np.ndarray) -> List[np.ndarray]:
+        """Polygons that can be nearest to some point in each rectangle [lo, hi].
+
+        Every polygon has a vertex on each side of its bbox, so the farthest
+        rectangle corner's distance to those vertices bounds the nearest
+        distance from above; polygons whose bbox is farther than that bound
+        from the rectangle are dropped.
+        """
+        valid = np.flatnonzero(np.diff(self.offsets) >= 3)
+        if len(valid) == 0:
+            return [valid for _ in range(len(lo))]
+        bb = self.bboxes[valid]
+        ex = extremes[valid]  # (P, 4, 2)
+        # Farthest point of the rectangle from each extreme vertex, per axis
+        far_x = np.maximum(np.abs(ex[None, :, :, 0] - lo[:, None, None, 0]), np.abs(ex[None, :, :, 0] - hi[:, None, None, 0]))
+        far_y = np.maximum(np.abs(ex[None, :, :, 1] - lo[:, None, None, 1]), np.abs(ex[None, :, :, 1] - hi[:, None, None, 1]))
+        upper = np.hypot(far_x, far_y).min(axis=2).min(axis=1)  # (K,)
+        lower = self._bbox_min_distance(lo, hi, bb)  # (K, P)
+        keep = lower <= upper[:, None] * (1.0 + _BOUND_SLACK) + _BOUND_SLACK
+        return [valid[row] for row in keep]
+
+    def _near_index(self) -> Tuple[int, np.ndarray, np.ndarray]:
+        """``(k, offsets, items)``: nearest-candidate lists on the lookup grid subdivided k times."""
+        if self._near is None:
+            nx, ny = self.grid_shape
+            k = NEAR_SUBDIVISION
+            while k > 1 and nx * ny * k * k > MAX_NEAR_CELLS:
+                k //= 2
+            size = self.cell_size / k
+            cx, cy = np.meshgrid(np.arange(nx * k), np.arange(ny * k))
+            cells = np.column_stack([cx.ravel(), cy.ravel()])  # cell id = cy * (nx * k) + cx
+            lo = self.grid_origin + cells * size
+            if self._extremes is None:
+                self._extremes = self._extreme_vertices()
+            step = max(1, MAX_EDGE_PAIRS // max(4 * len(self.names), 1))
+            lists: List[np.ndarray] = []
+            for i in range(0, len(lo), step):
+                lists.extend(self._near_candidates(lo[i:i + step], lo[i:i + step] + size, self._extremes))
+            offsets = np.zeros(len(lists) + 1, dtype=np.int64)
+            np.cumsum([len(x) for x in lists], out=offsets[1:])
+            items = np.concatenate(lists).astype(np.int64) if lists else np.zeros(0, dtype=np.int64)
+            self._near = (k, offsets, items)
+        return self._near
+
+    def _nearest_pairs(self, xy: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Candidate (point, polygon) pairs for the nearest query of every point, grouped by point."""
+        k, near_offsets, near_items = self._near_index()
+        nx, ny = self.grid_shape[0] * k, self.grid_shape[1] * k
+        cell = np.floor((xy - self.grid_origin) / (self.cell_size / k)).astype(np.int64)
+        in_grid = (cell[:, 0] >= 0) & (cell[:, 0] < nx) & (cell[:, 1] >= 0) & (cell[:, 1] < ny)
+        pts = np.flatnonzero(in_grid)
+        cid = cell[pts, 1] * nx + cell[pts, 0]
+        owner, slots = expand_ranges(near_offsets[cid], near_offsets[cid + 1] - near_offsets[cid])
+        pt_parts, poly_parts = [pts[owner]], [near_items[slots]]
+        outside = np.flatnonzero(~in_grid)
+        if len(outside):
+            # Rare: points beyond the grid pair with every polygon, pruned chunk by chunk
+            valid = np.flatnonzero(np.diff(self.offsets) >= 3)
+            step = max(1, MAX_EDGE_PAIRS // max(len(valid), 1))
+            for i in range(0, len(outside), step):
+                chunk = outside[i:i + step]
+                pt_chunk, poly_chunk, _ = self._prune_pairs(xy, np.repeat(chunk, len(valid)), np.tile(valid, len(chunk)))
+                pt_parts.append(pt_chunk)
+                poly_parts.append(poly_chunk)
+        return np.concatenate(pt_parts), np.concatenate(poly_parts)
+
+    def _prune_pairs(self, xy: np.ndarray, pt_idx: np.ndarray, poly_idx: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Drop pairs whose bbox is farther from the point than some other candidate's extreme vertex.
+
+        Pairs must be grouped by point; also returns the start of each point's run.
+        """
+        if self._extremes is None:
+            self._extremes = self._extreme_vertices()
+        px, py = xy[pt_idx, 0], xy[pt_idx, 1]
+        ex = self._extremes[poly_idx]  # (K, 4, 2)
+        upper2 = np.full(len(pt_idx), np.inf)
+        for j in range(4):
+            dx = ex[:, j, 0] - px
+            dy = ex[:, j, 1] - py
+            np.minimum(upper2, dx * dx + dy * dy, out=upper2)
+        bb = self.bboxes[poly_idx]
+        gx = np.maximum(0.0, np.maximum(bb[:, 0] - px, px - bb[:, 2]))
+        gy = np.maximum(0.0, np.maximum(bb[:, 1] - py, py - bb[:, 3]))
+        lower2 = gx * gx + gy * gy
+        runs = group_starts(pt_idx)
+        best = np.minimum.reduceat(upper2, runs) * (1.0 + _BOUND_SLACK) + _BOUND_SLACK
+        keep = lower2 <= np.repeat(best, np.diff(np.r_[runs, len(pt_idx)]))
+        pt_idx, poly_idx = pt_idx[keep], poly_idx[keep]
+        return pt_idx, poly_idx, group_starts(pt_idx)
+
+    def nearest(self, points: np.ndarray, max_distance: Optional[float] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """Nearest callout and signed distance to its boundary for every point.
+
+        Points inside a callout get the ``lookup`` result and a negative
+        distance (depth below the boundary); points outside get the callout
+        with the closest edge and a positive distance. With ``max_distance``,
+        outside points farther than that get id -1 (distance is still set).
+        """
+        xy = np.asarray(points, dtype=np.float64)[:, :2]
+        ids = self.lookup(xy)
+        dist = np.full(len(xy), np.inf)
+        inside = np.flatnonzero(ids >= 0)
+        if len(inside):
+            dist[inside] = -self.boundary_distance_pairs(xy, inside, ids[inside])
+        outside = np.flatnonzero(ids < 0)
+        if len(outside):
+            sub = xy[outside]
+            pt_idx, poly_idx = self._nearest_pairs(sub)
+            if len(pt_idx):
+                pt_idx, poly_idx, runs = self._prune_pairs(sub, pt_idx, poly_idx)
+                d = self.boundary_distance_pairs(sub, pt_idx, poly_idx)
+                # Closest pair per point: first pair of each run that attains the run minimum
+                best = np.minimum.reduceat(d, runs)
+                lengths = np.diff(np.r_[runs, len(d)])
+                hit = np.flatnonzero(d == np.repeat(best, lengths))
+                first = hit[np.r_[True, pt_idx[hit[1:]] != pt_idx[hit[:-1]]]]
+                ids[outside[pt_idx[first]]] = poly_idx[first]
+                dist[outside[pt_idx[first]]] = d[first]
+            if max_distance is not None:
+                far = outside[dist[outside] > max_distance]
+                ids[far] = -1
+        return ids, dist
+
+    def names_for(self, ids: np.ndarray, missing: str = "") -> np.ndarray:
+        """Map callout ids from ``lookup`` to names, ``missing`` for -1."""
+        ids = np.asarray(ids)
+        table = np.array(self.names + [missing], dtype=object)
+        return table[np.where(ids >= 0, ids, len(self.names))]
+
+    def label(self, points: np.ndarray, missing: str = "", snap_distance: Optional[float] = None) -> np.ndarray:
+        """Callout names for every point, ``missing`` where nothing matches.
+
+        With ``snap_distance``, points outside every callout but within that
+        distance of one take the nearest callout's name.
+        """
+        if snap_distance is None:
+            return self.names_for(self.lookup(points), missing=missing)
+        return self.names_for(self.nearest(points, max_distance=snap_distance)[0], missing=missing)
+
+
+@dataclass
+class SharedIndexSpec:
+    """Picklable description of a CalloutIndex published in shared memory.
+
+    Only the block name, the array layout and the small scalar fields travel
+    to workers; the arrays themselves are mapped from the shared block.
+    """
+
+    shm_name: str
+    names: List[str]
+    grid_origin: Tuple[float, float]
+    cell_size: float
+    grid_shape: Tuple[int, int]
+    layout: Dict[str, Tuple[int, Tuple[int, ...], str]]  # field -> (byte offset, shape, dtype)
+
+
+class SharedCalloutIndex:
+    """Owns a shared-memory copy of a CalloutIndex for worker processes.
+
+    The arrays are copied once into a single block; workers call
+    ``attach_shared_index(spec)`` to get a CalloutIndex whose arrays are
+    zero-copy views of it. Use as a context manager so the block is unlinked.
+    """
+
+    def __init__(self, index: CalloutIndex):
+        layout: Dict[str, Tuple[int, Tuple[int, ...], str]] = {}
+        offset = 0
+        for name in _SHARED_FIELDS:
+            arr = np.ascontiguousarray(getattr(index, name))
+            offset = (offset + 63) // 64 * 64  # cache-line align every array
+            layout[name] = (offset, arr.shape, arr.dtype.str)
+            offset += arr.nbytes
+        self.shm = shared_memory.SharedMemory(create=True, size=max(offset, 1))
+        for name, (start, shape, dtype) in layout.items():
+            view = np.ndarray(shape, dtype=np.dtype(dtype), buffer=self.shm.buf, offset=start)
+            view[...] = getattr(index, name)
+        self.spec = SharedIndexSpec(
+            shm_name=self.shm.name,
+            names=list(index.names),
+            grid_origin=(float(index.grid_origin[0]), float(index.grid_origin[1])),
+            cell_size=index.cell_size,
+            grid_shape=tuple(index.grid_shape),
+            layout=layout,
+        )
+
+    def close(self) -> None:
+        if self.shm is not None:
+            self.shm.close()
+            self.shm.unlink()
+            self.shm = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def attach_shared_index(spec: SharedIndexSpec) -> Tuple[CalloutIndex, shared_memory.SharedMemory]:
+    """CalloutIndex backed by the shared block in ``spec``.
+
+    Keep the returned SharedMemory referenced for as long as the index is used.
+    """
+    # Pool workers share the parent's resource tracker, so attaching does not take ownership
+    shm = shared_memory.SharedMemory(name=spec.shm_name)
+    arrays = {}
+    for name, (start, shape, dtype) in spec.layout.items():
+        view = np.ndarray(shape, dtype=np.dtype(dtype), buffer=shm.buf, offset=start)
+        view.flags.writeable = False
+        arrays[name] = view
+    index = CalloutIndex(
+        names=list(spec.names),
+        grid_origin=np.asarray(spec.grid_origin, dtype=np.float64),
+        cell_size=spec.cell_size,
+        grid_shape=tuple(spec.grid_shape),
+        **arrays,
+    )
+    return index, shm
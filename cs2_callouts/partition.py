@@ -0,0 +1,233 @@
+from __future__ import annotations
+
+import hashlib
+import json
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from .geometry import polygon_area
+from .lookup import CalloutIndex
+
+PARTITION_SUFFIX = "_partition.npz"
+
+# Default raster resolution in game units; boundary cells fall back to exact tests
+DEFAULT_CELL_SIZE = 16.0
+# Callouts not listed in the zones file
+DEFAULT_PRIORITY = 0.0
+
+
+def load_priorities(path: str | Path) -> Dict[str, float]:
+    """``{name: priority}`` from an ``inferno.json``-style file (``{"zones": [{"name", "priority"}, ...]}``)."""
+    data = json.loads(Path(path).read_text(encoding="utf-8-sig"))
+    zones = data.get("zones", data.get("callouts", [])) if isinstance(data, dict) else data
+    return {str(z["name"]): float(z["priority"]) for z in zones if "name" in z and z.get("priority") is not None}
+
+
+def geometry_digest(index: CalloutIndex) -> str:
+    """Hash of the index's flat vertices and offsets; a saved partition is only valid for the same geometry."""
+    h = hashlib.sha256()
+    h.update(np.ascontiguousarray(index.vertices, dtype=np.float64).tobytes())
+    h.update(np.ascontiguousarray(index.offsets, dtype=np.int64).tobytes())
+    return h.hexdigest()
+
+
+def resolution_order(
+    index: CalloutIndex,
+    priorities: Optional[Dict[str, float]] = None,
+    default_priority: float = DEFAULT_PRIORITY,
+) -> np.ndarray:
+    """(P,) rank per callout, 0 winning: higher priority first, then smaller area, then lower id."""
+    prio = np.array([(priorities or {}).get(n, default_priority) for n in index.names], dtype=np.float64)
+    area = np.array(
+        [abs(polygon_area(index.vertices[index.offsets[i]:index.offsets[i + 1]])) for i in range(len(index.names))]
+    )
+    order = np.lexsort((np.arange(len(index.names)), area, -prio))
+    rank = np.empty(len(order), dtype=np.int64)
+    rank[order] = np.arange(len(order))
+    return rank
+
+
+@dataclass
+class CalloutPartition:
+    """Overlap-free callout map: a label raster resolved once by priority.
+
+    Every raster cell that no hull boundary passes through stores the
+    winning callout id (or -1), so a lookup is one array read. Cells a
+    boundary crosses store ``-2 - b`` pointing at boundary list ``b``: the
+    callouts overlapping that cell in resolution order. Those points are
+    tested one candidate per round and drop out at their first hit, so no
+    query compares candidates.
+    """
+
+    index: CalloutIndex
+    rank: np.ndarray  # (P,) 0 wins
+    origin: np.ndarray  # (2,) world XY of the raster corner
+    cell_size: float
+    labels: np.ndarray  # (ny, nx) int32
+    boundary_offsets: np.ndarray  # (B + 1,)
+    boundary_items: np.ndarray  # callout ids, each list in rank order
+
+    @property
+    def names(self) -> List[str]:
+        return self.index.names
+
+    @property
+    def boundary_fraction(self) -> float:
+        return float((self.labels <= -2).mean()) if self.labels.size else 0.0
+
+    @classmethod
+    def build(
+        cls,
+        index: CalloutIndex,
+        priorities: Optional[Dict[str, float]] = None,
+        cell_size: float = DEFAULT_CELL_SIZE,
+        default_priority: float = DEFAULT_PRIORITY,
+    ) -> "CalloutPartition":
+        rank = resolution_order(index, priorities, default_priority)
+        valid = np.diff(index.offsets) >= 3
+        if valid.any():
+            lo = np.nanmin(index.bboxes[valid, :2], axis=0)
+            hi = np.nanmax(index.bboxes[valid, 2:], axis=0)
+        else:
+            lo, hi = np.zeros(2), np.zeros(2)
+        nx = int(np.floor((hi[0] - lo[0]) / cell_size)) + 1
+        ny = int(np.floor((hi[1] - lo[1]) / cell_size)) + 1
+        cx, cy = np.meshgrid(np.arange(nx), np.arange(ny))
+        cell_lo = lo + np.column_stack([cx.ravel(), cy.ravel()]) * cell_size
+        centers = cell_lo + cell_size / 2.0
+
+        cell_idx, poly_idx = index.box_candidates(cell_lo, cell_lo + cell_size)
+        # A boundary within half a diagonal of the center may cross the cell; such cells stay exact
+        d = index.boundary_distance_pairs(centers, cell_idx, poly_idx)
+        near = d <= cell_size * np.sqrt(0.5) * (1.0 + 1e-9)
+        boundary_cell = np.zeros(nx * ny, dtype=bool)
+        boundary_cell[cell_idx[near]] = True
+
+        inside = index.contains_pairs(centers, cell_idx, poly_idx) & ~boundary_cell[cell_idx]
+        labels = np.full(nx * ny, -1, dtype=np.int64)
+        if inside.any():
+            ci, pi = cell_idx[inside], poly_idx[inside]
+            order = np.lexsort((rank[pi], ci))
+            ci, pi = ci[order], pi[order]
+            first = np.r_[True, ci[1:] != ci[:-1]]
+            labels[ci[first]] = pi[first]
+
+        bcells = np.flatnonzero(boundary_cell)
+        labels[bcells] = -2 - np.arange(len(bcells))
+        in_b = boundary_cell[cell_idx]
+        bi, bp = cell_idx[in_b], poly_idx[in_b]
+        order = np.lexsort((rank[bp], bi))
+        bi, bp = bi[order], bp[order]
+        counts = np.bincount(np.searchsorted(bcells, bi), minlength=len(bcells))
+        offsets = np.zeros(len(bcells) + 1, dtype=np.int64)
+        np.cumsum(counts, out=offsets[1:])
+        return cls(
+            index=index,
+            rank=rank,
+            origin=np.asarray(lo, dtype=np.float64),
+            cell_size=float(cell_size),
+            labels=labels.reshape(ny, nx).astype(np.int32),
+            boundary_offsets=offsets,
+            boundary_items=bp.astype(np.int64),
+        )
+
+    def lookup(self, points: np.ndarray) -> np.ndarray:
+        """Winning callout id per point, -1 outside every callout."""
+        xy = np.asarray(points, dtype=np.float64)[:, :2]
+        out = np.full(len(xy), -1, dtype=np.int64)
+        ny, nx = self.labels.shape
+        cell = np.floor((xy - self.origin) / self.cell_size).astype(np.int64)
+        in_grid = np.flatnonzero((cell[:, 0] >= 0) & (cell[:, 0] < nx) & (cell[:, 1] >= 0) & (cell[:, 1] < ny))
+        lab = self.labels[cell[in_grid, 1], cell[in_grid, 0]].astype(np.int64)
+        out[in_grid] = np.maximum(lab, -1)
+
+        exact = lab <= -2
+        pts = in_grid[exact]
+        b = -2 - lab[exact]
+        pos = self.boundary_offsets[b]
+        end = self.boundary_offsets[b + 1]
+        # Round k tests each pending point's k-th candidate; a hit resolves the point
+        while len(pts):
+            live = pos < end
+            pts, pos, end = pts[live], pos[live], end[live]
+            if not len(pts):
+                break
+            cand = self.boundary_items[pos]
+            hit = self.index.contains_pairs(xy, pts, cand)
+            out[pts[hit]] = cand[hit]
+            pts, pos, end = pts[~hit], pos[~hit] + 1, end[~hit]
+        return out
+
+    def names_for(self, ids: np.ndarray, missing: str = "") -> np.ndarray:
+        return self.index.names_for(ids, missing=missing)
+
+    def label(self, points: np.ndarray, missing: str = "", snap_distance: Optional[float] = None) -> np.ndarray:
+        """Callout names per point; ``snap_distance`` gaps are resolved with ``CalloutIndex.nearest``."""
+        ids = self.lookup(points)
+        if snap_distance is not None:
+            gap = np.flatnonzero(ids < 0)
+            if len(gap):
+                ids[gap] = self.index.nearest(np.asarray(points, dtype=np.float64)[gap], max_distance=snap_distance)[0]
+        return self.names_for(ids, missing=missing)
+
+    # -- persistence ---------------------------------------------------
+
+    def save(self, path: str | Path) -> None:
+        """Write the raster and boundary lists; the polygons stay in ``<map>_callouts.json``."""
+        p = Path(path)
+        p.parent.mkdir(parents=True, exist_ok=True)
+        with open(p, "wb") as f:
+            np.savez_compressed(
+                f,
+                names=np.asarray(self.names, dtype=object).astype(str),
+                digest=np.str_(geometry_digest(self.index)),
+                rank=self.rank,
+                origin=self.origin,
+                cell_size=np.float64(self.cell_size),
+                labels=self.labels,
+                boundary_offsets=self.boundary_offsets,
+                boundary_items=self.boundary_items,
+            )
+
+    @classmethod
+    def load(cls, path: str | Path, index: CalloutIndex) -> "CalloutPartition":
+        """Load a saved partition for ``index``; ValueError if it was built for other callouts."""
+        with np.load(path) as data:
+            names = data["names"].tolist()
+            digest = str(data["digest"]) if "digest" in data.files else None
+            if names != list(index.names) or digest != geometry_digest(index):
+                raise ValueError(f"{path} was built for a different callouts file; rebuild it")
+            return cls(
+                index=index,
+                rank=data["rank"],
+                origin=data["origin"],
+                cell_size=float(data["cell_size"]),
+                labels=data["labels"],
+                boundary_offsets=data["boundary_offsets"],
+                boundary_items=data["boundary_items"],
+            )
+
+
+def partition_path_for(callouts_json: str | Path) -> Path:
+    """``out/de_mirage_callouts.json`` -> ``out/de_mirage_partition.npz``."""
+    p = Path(callouts_json)
+    stem = p.name[: -len("_callouts.json")] if p.name.endswith("_callouts.json") else p.stem
+    return p.with_name(stem + PARTITION_SUFFIX)
+
+
+def build_partition_file(
+    callouts_json: str | Path,
+    zones_json: str | Path | None = None,
+    out_path: str | Path | None = None,
+    cell_size: float = DEFAULT_CELL_SIZE,
+    polygon_key: str = "polygon_2d",
+) -> Tuple[CalloutPartition, Path]:
+    index = CalloutIndex.from_json(callouts_json, polygon_key=polygon_key)
+    priorities = load_priorities(zones_json) if zones_json else None
+    part = CalloutPartition.build(index, priorities=priorities, cell_size=cell_size)
+    out = Path(out_path) if out_path else partition_path_for(callouts_json)
+    part.save(out)
+    return part, out
@@ -15,9 +15,16 @@ from .geometry import (
     choose_global_order,
     convex_hull,
     polygon_area,
+    polygon_deviation,
     to_xy,
     zspan_xyspan_ratio,
 )
+from .profiling import record_model, stage
+
+# Callout instances the auto rotation-order search samples
+ORDER_SAMPLES = 6
+# Default allowed float32 vs float64 hull deviation in compare_precision, game units
+PRECISION_TOLERANCE = 0.05
 
 
 @dataclass
@@ -96,7 +103,15 @@ def resolve_model_file(model_path: str, index: Dict[str, Path]) -> Optional[Path
     return None
 
 
-def load_vertices_cache(callouts: Iterable[Callout], index: Dict[str, Path]) -> Dict[str, np.ndarray]:
+def _load_model(fp: Path, float32: bool = False) -> Optional[np.ndarray]:
+    try:
+        with stage("glb_load"):
+            return load_vertices(fp, dtype=np.float32 if float32 else np.float64)
+    except Exception:
+        return None
+
+
+def load_vertices_cache(callouts: Iterable[Callout], index: Dict[str, Path], float32: bool = False) -> Dict[str, np.ndarray]:
     cache: Dict[str, np.ndarray] = {}
     for c in callouts:
         mid = _normalize_model_id(c.model)
@@ -105,14 +120,15 @@ def load_vertices_cache(callouts: Iterable[Callout], index: Dict[str, Path]) ->
         fp = resolve_model_file(c.model, index)
         if not fp:
             continue
-        try:
-            cache[mid] = load_vertices(fp)
-        except Exception:
+        verts = _load_model(fp, float32)
+        if verts is None:
             continue
+        cache[mid] = verts
+        record_model(mid, verts)
     return cache
 
 
-def choose_order_auto(callouts: List[Callout], vcache: Dict[str, np.ndarray], limit: int = 6) -> str:
+def choose_order_auto(callouts: List[Callout], vcache: Dict[str, np.ndarray], limit: int = ORDER_SAMPLES) -> str:
     samples: List[Tuple[np.ndarray, Sequence[float], Sequence[float], Sequence[float]]] = []
     for c in callouts:
         mid = _normalize_model_id(c.model)
@@ -131,13 +147,56 @@ def process_callouts(
     callouts: List[Callout],
     models_root: str | Path,
     rotation_order: str = "auto",
+    simplify_tolerance: Optional[float] = None,
+    max_vertices: Optional[int] = None,
+    stream: bool = False,
+    float32: bool = False,
 ) -> Dict:
-    index = build_model_index(models_root)
-    vcache = load_vertices_cache(callouts, index)
-    order = rotation_order
-    if rotation_order == "auto":
-        order = choose_order_auto(callouts, vcache)
+    """Turn extracted callouts into 2D hull records.
+
+    With ``simplify_tolerance`` or ``max_vertices`` each record also gets a
+    ``polygon_2d_simplified`` ring and stats (see ``simplify.simplify_callouts``).
+    ``stream`` loads one model at a time and frees it once its callouts are
+    hulled, so peak memory follows the largest model instead of all of them;
+    the output is the same.
+
+    ``float32`` loads and transforms vertices in single precision, halving
+    the model arrays and the transform bandwidth; only the 2D points handed
+    to the hull are widened to float64. ``compare_precision`` checks the
+    result against the float64 run.
+    """
+    with stage("index_models"):
+        index = build_model_index(models_root)
+    if stream:
+        results, missing_models, order = _stream_hull_records(callouts, index, rotation_order, float32)
+    else:
+        with stage("load_models"):
+            vcache = load_vertices_cache(callouts, index, float32=float32)
+        order = rotation_order
+        if rotation_order == "auto":
+            with stage("rotation_search"):
+                order = choose_order_auto(callouts, vcache)
+
+        with stage("hulls"):
+            results, missing_models = _hull_records(callouts, vcache, index, order)
+
+    out = {
+        "rotation_order": order,
+        "count": len(results),
+        "missing_models": missing_models,
+        "callouts": results,
+    }
+    if simplify_tolerance is not None or max_vertices is not None:
+        from .simplify import simplify_callouts
 
+        with stage("simplify"):
+            simplify_callouts(out, tolerance=simplify_tolerance, max_vertices=max_vertices)
+    return out
+
+
+def _hull_records(
+    callouts: List[Callout], vcache: Dict[str, np.ndarray], index: Dict[str, Path], order: str
+) -> Tuple[List[Dict], List[Dict]]:
     results = []
     missing_models = []
     for c in callouts:
@@ -147,31 +206,135 @@ def process_callouts(
             fp = resolve_model_file(c.model, index)
             missing_models.append({"placename": c.placename, "model": c.model, "resolved": str(fp) if fp else None})
             continue
-        world = apply_srt(verts, c.scales, c.angles, c.origin, order=order)
-        poly2d = convex_hull(to_xy(world))
-        bbox = bbox2d(poly2d)
-        record = {
-            "name": c.placename,
-            "model": c.model,
-            "origin": [float(x) for x in c.origin],
-            "angles": [float(x) for x in c.angles],
-            "scales": [float(x) for x in c.scales],
-            "rotation_order": order,
-            "vertices_count": int(len(verts)),
-            "polygon_2d": [[float(x), float(y)] for x, y in poly2d.tolist()],
-            "bbox_2d": {"min_x": bbox[0], "min_y": bbox[1], "max_x": bbox[2], "max_y": bbox[3]},
-            "zspan_xyspan_ratio": zspan_xyspan_ratio(world),
-            "source": c.source_file,
-        }
-        results.append(record)
+        results.append(_hull_record(c, verts, order))
+    return results, missing_models
 
-    out = {
+
+def _stream_hull_records(
+    callouts: List[Callout], index: Dict[str, Path], rotation_order: str, float32: bool = False
+) -> Tuple[List[Dict], List[Dict], str]:
+    """``_hull_records`` one model at a time; returns ``(results, missing_models, order)``.
+
+    Callouts are grouped by resolved model file. Each group's vertices are
+    loaded, every instance is hulled, and the array is dropped before the
+    next file is read. The few models the rotation search samples are kept
+    only until their group runs. Records come back in callout order.
+    """
+    resolved: Dict[str, Optional[Path]] = {}
+    groups: Dict[Path, List[int]] = {}
+    for i, c in enumerate(callouts):
+        mid = _normalize_model_id(c.model)
+        if mid not in resolved:
+            resolved[mid] = resolve_model_file(c.model, index)
+        if resolved[mid] is not None:
+            groups.setdefault(resolved[mid], []).append(i)
+
+    loaded: Dict[Path, Optional[np.ndarray]] = {}
+    order = rotation_order
+    if rotation_order == "auto":
+        with stage("rotation_search"):
+            # Load exactly the models choose_order_auto would sample from a full cache
+            samples: Dict[str, np.ndarray] = {}
+            taken = 0
+            for c in callouts:
+                mid = _normalize_model_id(c.model)
+                fp = resolved[mid]
+                if fp is None:
+                    continue
+                if fp not in loaded:
+                    loaded[fp] = _load_model(fp, float32)
+                if loaded[fp] is None:
+                    continue
+                samples[mid] = loaded[fp]
+                taken += 1
+                if taken >= ORDER_SAMPLES:
+                    break
+            order = choose_order_auto(callouts, samples)
+
+    records: List[Optional[Dict]] = [None] * len(callouts)
+    for fp, members in groups.items():
+        with stage("load_models"):
+            verts = loaded.pop(fp) if fp in loaded else _load_model(fp, float32)
+        if verts is None:
+            continue
+        # Keyed by model id as in load_vertices_cache; one array per file, so ids sharing it are counted once
+        record_model(_normalize_model_id(callouts[members[0]].model), verts)
+        with stage("hulls"):
+            for i in members:
+                records[i] = _hull_record(callouts[i], verts, order)
+        del verts
+
+    results = []
+    missing_models = []
+    for c, record in zip(callouts, records):
+        if record is None:
+            fp = resolved[_normalize_model_id(c.model)]
+            missing_models.append({"placename": c.placename, "model": c.model, "resolved": str(fp) if fp else None})
+        else:
+            results.append(record)
+    return results, missing_models, order
+
+
+def _hull_record(c: Callout, verts: np.ndarray, order: str) -> Dict:
+    world = apply_srt(verts, c.scales, c.angles, c.origin, order=order)
+    poly2d = convex_hull(to_xy(world))
+    bbox = bbox2d(poly2d)
+    return {
+        "name": c.placename,
+        "model": c.model,
+        "origin": [float(x) for x in c.origin],
+        "angles": [float(x) for x in c.angles],
+        "scales": [float(x) for x in c.scales],
         "rotation_order": order,
-        "count": len(results),
-        "missing_models": missing_models,
-        "callouts": results,
+        "vertices_count": int(len(verts)),
+        "polygon_2d": [[float(x), float(y)] for x, y in poly2d.tolist()],
+        "bbox_2d": {"min_x": bbox[0], "min_y": bbox[1], "max_x": bbox[2], "max_y": bbox[3]},
+        "zspan_xyspan_ratio": zspan_xyspan_ratio(world),
+        "z_min": float(world[:, 2].min()),
+        "z_max": float(world[:, 2].max()),
+        "source": c.source_file,
+    }
+
+
+def compare_precision(reference: Dict, candidate: Dict, tolerance: float = PRECISION_TOLERANCE) -> Dict:
+    """Compare two ``process_callouts`` outputs (float64 ``reference``, float32 ``candidate``) hull by hull.
+
+    Reports the largest polygon deviation (``geometry.polygon_deviation``,
+    game units) and relative area difference, the worst callout, and
+    ``ok`` when both runs chose the same rotation order, hulled the same
+    callouts and every deviation is within ``tolerance``.
+    """
+    ref = reference.get("callouts", [])
+    cand = candidate.get("callouts", [])
+    same_set = [(r["name"], r["model"]) for r in ref] == [(c["name"], c["model"]) for c in cand]
+    max_dev = 0.0
+    max_area = 0.0
+    worst = None
+    over = 0
+    if same_set:
+        for r, c in zip(ref, cand):
+            a = np.asarray(r["polygon_2d"], dtype=np.float64).reshape(-1, 2)
+            b = np.asarray(c["polygon_2d"], dtype=np.float64).reshape(-1, 2)
+            dev = polygon_deviation(a, b)
+            area_ref = abs(polygon_area(a))
+            area_err = abs(abs(polygon_area(b)) - area_ref) / area_ref if area_ref else 0.0
+            if dev > tolerance:
+                over += 1
+            if dev > max_dev or worst is None:
+                max_dev, worst = dev, r["name"]
+            max_area = max(max_area, area_err)
+    same_order = reference.get("rotation_order") == candidate.get("rotation_order")
+    return {
+        "callouts": len(ref),
+        "same_callouts": same_set,
+        "same_rotation_order": same_order,
+        "tolerance": tolerance,
+        "max_deviation": max_dev,
+        "max_area_error": max_area,
+        "worst": worst,
+        "over_tolerance": over,
+        "ok": same_set and same_order and over == 0,
     }
-    return out
 
 
 def write_json(data: Dict, out_path: str | Path, pretty: bool = True) -> None:
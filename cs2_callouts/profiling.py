@@ -0,0 +1,274 @@
+from __future__ import annotations
+
+import json
+import sys
+import time
+import tracemalloc
+from contextlib import contextmanager, nullcontext
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Sequence
+
+TIMINGS_SUFFIX = "_timings.json"
+# Allocation sites kept per stage in memory mode
+TOP_ALLOCATIONS = 5
+
+_NULL = nullcontext()
+_active: Optional["Profiler"] = None
+
+
+@dataclass
+class StageStats:
+    calls: int = 0
+    wall: float = 0.0
+    cpu: float = 0.0
+
+    # Memory mode only
+    traced_peak: int = 0  # largest tracemalloc peak over all calls, bytes
+    traced_delta: int = 0  # traced bytes still held after the last call
+    rss_peak: Optional[int] = None  # process peak RSS when the stage last ended, bytes
+    top: Optional[List[Dict]] = None  # allocation sites still held when the stage first ended
+
+    def as_dict(self) -> Dict:
+        out = {"calls": self.calls, "wall_s": round(self.wall, 6), "cpu_s": round(self.cpu, 6)}
+        if self.top is not None:
+            out.update(
+                traced_peak_bytes=self.traced_peak,
+                traced_delta_bytes=self.traced_delta,
+                rss_peak_bytes=self.rss_peak,
+                top_allocations=self.top,
+            )
+        return out
+
+
+def peak_rss() -> Optional[int]:
+    """Peak resident set size of this process in bytes; None where ``resource`` is unavailable (Windows)."""
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return int(peak) if sys.platform == "darwin" else int(peak) * 1024
+
+
+def _top_allocations(limit: int = TOP_ALLOCATIONS) -> List[Dict]:
+    # Filtering the statistics is much cheaper than Snapshot.filter_traces on a process with trimesh loaded
+    stats = tracemalloc.take_snapshot().statistics("lineno")
+    out = []
+    for s in stats:
+        where = s.traceback[0].filename
+        if where == tracemalloc.__file__ or where.startswith("<frozen importlib"):
+            continue
+        out.append({"where": f"{where}:{s.traceback[0].lineno}", "size_bytes": s.size, "count": s.count})
+        if len(out) == limit:
+            break
+    return out
+
+
+class Profiler:
+    """Wall/CPU time and call counts per named stage, plus VRF subprocess totals.
+
+    Stages nest: a ``stage("hulls")`` entered inside ``stage("process")`` is
+    recorded as ``process/hulls``. Repeated stages (one per model, say)
+    accumulate into one entry with a call count.
+
+    With ``memory`` (tracemalloc must be tracing) each stage also records
+    its tracemalloc peak, the traced bytes it left allocated, the process
+    peak RSS and the top allocation sites. ``record_model`` tracks the
+    bytes each cached model array holds.
+    """
+
+    def __init__(self, command: str = "", memory: bool = False):
+        self.command = command
+        self.memory = memory
+        self.stages: Dict[str, StageStats] = {}
+        self.subprocesses: Dict[str, StageStats] = {}
+        self.models: Dict[str, int] = {}
+        self._stack: List[str] = []
+        # tracemalloc has one peak counter; each open stage keeps the highest peak seen before its children reset it
+        self._peaks: List[int] = [0]
+        self._started = time.perf_counter()
+        self._cpu_started = time.process_time()
+        self.cprofile = None  # cProfile.Profile when run with cprofile=True
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        self._stack.append(name)
+        key = "/".join(self._stack)
+        if self.memory:
+            current, peak = tracemalloc.get_traced_memory()
+            self._peaks[-1] = max(self._peaks[-1], peak)
+            self._peaks.append(0)
+            tracemalloc.reset_peak()
+        wall0, cpu0 = time.perf_counter(), time.process_time()
+        try:
+            yield
+        finally:
+            stats = self.stages.setdefault(key, StageStats())
+            stats.calls += 1
+            stats.wall += time.perf_counter() - wall0
+            stats.cpu += time.process_time() - cpu0
+            if self.memory:
+                self._record_memory(stats, current)
+            self._stack.pop()
+
+    def _record_memory(self, stats: StageStats, entered_with: int) -> None:
+        now, peak = tracemalloc.get_traced_memory()
+        peak = max(peak, self._peaks.pop())
+        self._peaks[-1] = max(self._peaks[-1], peak)
+        stats.traced_peak = max(stats.traced_peak, peak)
+        stats.traced_delta = now - entered_with
+        stats.rss_peak = peak_rss()
+        # Snapshots take about a second once trimesh is imported; repeated stages keep their first one
+        if stats.top is None:
+            stats.top = _top_allocations()
+
+    def record_model(self, model_id: str, nbytes: int) -> None:
+        self.models[model_id] = int(nbytes)
+
+    def record_subprocess(self, kind: str, seconds: float) -> None:
+        stats = self.subprocesses.setdefault(kind, StageStats())
+        stats.calls += 1
+        stats.wall += seconds
+
+    def report(self) -> Dict:
+        sub_calls = sum(s.calls for s in self.subprocesses.values())
+        sub_wall = sum(s.wall for s in self.subprocesses.values())
+        out = {
+            "command": self.command,
+            "wall_s": round(time.perf_counter() - self._started, 6),
+            "cpu_s": round(time.process_time() - self._cpu_started, 6),
+            "stages": {k: v.as_dict() for k, v in self.stages.items()},
+            "vrf_subprocesses": {
+                "calls": sub_calls,
+                "wall_s": round(sub_wall, 6),
+                "by_kind": {k: v.as_dict() for k, v in self.subprocesses.items()},
+            },
+        }
+        if self.memory:
+            traced_peak = self._peaks[0]
+            if tracemalloc.is_tracing():
+                traced_peak = max(traced_peak, tracemalloc.get_traced_memory()[1])
+            out["memory"] = {
+                "rss_peak_bytes": peak_rss(),
+                "traced_peak_bytes": traced_peak,
+                "model_cache": {
+                    "models": len(self.models),
+                    "total_bytes": sum(self.models.values()),
+                    "bytes_per_model": dict(sorted(self.models.items(), key=lambda kv: kv[1], reverse=True)),
+                },
+            }
+        return out
+
+    def write(self, path: str | Path) -> Path:
+        p = Path(path)
+        p.parent.mkdir(parents=True, exist_ok=True)
+        p.write_text(json.dumps(self.report(), indent=2), encoding="utf-8")
+        return p
+
+    def summary_lines(self, top: int = 8) -> List[str]:
+        """The slowest stages by wall time, for the console."""
+        ranked = sorted(self.stages.items(), key=lambda kv: kv[1].wall, reverse=True)[:top]
+        lines = [f"{k:<48} {v.wall:9.3f}s wall {v.cpu:9.3f}s cpu {v.calls:6d}x" for k, v in ranked]
+        if self.memory:
+            lines = [
+                f"{line} {v.traced_peak / 2**20:9.1f} MB peak" for line, (_, v) in zip(lines, ranked)
+            ]
+        report = self.report()
+        sub = report["vrf_subprocesses"]
+        if sub["calls"]:
+            lines.append(f"{'VRF subprocesses':<48} {sub['wall_s']:9.3f}s wall {'':>14} {sub['calls']:6d}x")
+        if self.memory:
+            mem = report["memory"]
+            rss = f"{mem['rss_peak_bytes'] / 2**20:.1f} MB" if mem["rss_peak_bytes"] is not None else "n/a"
+            cache = mem["model_cache"]
+            lines.append(
+                f"Peak RSS {rss}, traced peak {mem['traced_peak_bytes'] / 2**20:.1f} MB; "
+                f"model cache {cache['models']} models, {cache['total_bytes'] / 2**20:.1f} MB"
+            )
+        return lines
+
+
+def active_profiler() -> Optional[Profiler]:
+    return _active
+
+
+def stage(name: str):
+    """Time ``name`` under the active profiler; a shared no-op context when profiling is off."""
+    return _active.stage(name) if _active is not None else _NULL
+
+
+def record_model(model_id: str, vertices) -> None:
+    """Note the bytes a cached model's vertex array holds (memory mode only)."""
+    if _active is not None and _active.memory:
+        _active.record_model(model_id, vertices.nbytes)
+
+
+def record_subprocess(args: Sequence[str], seconds: float) -> None:
+    """Count one VRF CLI run, grouped as list/export/decompile by its arguments."""
+    if _active is None:
+        return
+    kind = "list" if "--vpk_list" in args else "export" if "--gltf_export_format" in args else "decompile"
+    _active.record_subprocess(kind, seconds)
+
+
+def timings_path_for(output: str | Path) -> Path:
+    """``out/de_mirage_callouts.json`` -> ``out/de_mirage_timings.json``, ``radar.png`` -> ``radar_timings.json``."""
+    p = Path(output)
+    stem = p.name[: -len("_callouts.json")] if p.name.endswith("_callouts.json") else p.stem
+    return p.with_name(stem + TIMINGS_SUFFIX)
+
+
+@contextmanager
+def profiling(
+    command: str, enabled: bool = True, cprofile: bool = False, memory: bool = False
+) -> Iterator[Optional[Profiler]]:
+    """Activate a Profiler for one CLI command; yields None when disabled.
+
+    Nested commands (``pipeline`` invoking ``extract``) reuse the outer
+    profiler, so their stages land in one report. The caller writes the
+    report once it knows where the outputs went (``finish_profile``). With
+    ``cprofile`` the whole block also runs under cProfile; its stats are
+    attached as ``profiler.cprofile``. ``memory`` traces allocations with
+    tracemalloc for the block, which slows it down noticeably.
+    """
+    global _active
+    if not enabled or _active is not None:
+        yield None
+        return
+    started_tracing = memory and not tracemalloc.is_tracing()
+    if started_tracing:
+        tracemalloc.start()
+    prof = Profiler(command, memory=memory)
+    _active = prof
+    cp = None
+    if cprofile:
+        import cProfile
+
+        cp = cProfile.Profile()
+        cp.enable()
+    try:
+        yield prof
+    finally:
+        if cp is not None:
+            cp.disable()
+            prof.cprofile = cp
+        if memory:
+            prof._peaks[0] = max(prof._peaks[0], tracemalloc.get_traced_memory()[1])
+        if started_tracing:
+            tracemalloc.stop()
+        _active = None
+
+
+def finish_profile(prof: Optional[Profiler], path: str | Path, echo=print) -> Optional[Path]:
+    """Write the timings JSON to ``path`` (plus a ``.prof`` beside it when cProfile ran) and print the top stages."""
+    if prof is None:
+        return None
+    path = prof.write(path)
+    if prof.cprofile is not None:
+        prof.cprofile.dump_stats(str(path.with_suffix(".prof")))
+        echo(f"cProfile stats: {path.with_suffix('.prof')} (inspect with python -m pstats)")
+    for line in prof.summary_lines():
+        echo(line)
+    echo(f"Timings: {path}")
+    return path
@@ -0,0 +1,206 @@
+from __future__ import annotations
+
+from functools import lru_cache
+from typing import Dict, Optional, Sequence, Tuple
+
+import numpy as np
+from PIL import Image, ImageDraw, ImageFont
+
+from .render import callout_polygons, color_for_name, flatten_polygons, polygon_centroids
+from .transform import transform_for
+
+DEFAULT_SIZE = 1024
+# Density ramp from sparse to dense (dark purple -> red -> yellow), as (stop, r, g, b)
+HEAT_STOPS = np.array(
+    [
+        [0.0, 40, 10, 90],
+        [0.35, 150, 30, 110],
+        [0.65, 230, 80, 40],
+        [1.0, 255, 240, 120],
+    ],
+    dtype=np.float64,
+)
+
+
+def fit_to_canvas(vertices: np.ndarray, size: Tuple[int, int], padding: float = 0.05) -> np.ndarray:
+    """Map world XY into canvas pixels (Y down) when no radar transform is available."""
+    mn = vertices.min(axis=0)
+    span = np.maximum(vertices.max(axis=0) - mn, 1e-9)
+    w, h = size
+    k = min(w, h) * (1.0 - 2 * padding) / float(span.max())
+    out = np.empty_like(vertices)
+    out[:, 0] = (vertices[:, 0] - mn[0]) * k + w * padding
+    out[:, 1] = h - ((vertices[:, 1] - mn[1]) * k + h * padding)
+    return out
+
+
+def _rgb255(color: Sequence[float]) -> Tuple[int, int, int]:
+    r, g, b = (int(round(c * 255)) for c in color[:3])
+    return (r, g, b)
+
+
+@lru_cache(maxsize=4096)
+def _label_sprite(name: str) -> Image.Image:
+    """Pre-rendered label (text on a translucent white box); reused across images in a batch."""
+    font = ImageFont.load_default()
+    left, top, right, bottom = font.getbbox(name)
+    sprite = Image.new("RGBA", (right - left + 2, bottom - top + 2), (255, 255, 255, 153))
+    ImageDraw.Draw(sprite).text((1 - left, 1 - top), name, font=font, fill=(0, 0, 0, 255))
+    return sprite
+
+
+def _paste_centered(image: Image.Image, sprite: Image.Image, cx: float, cy: float) -> None:
+    x = int(round(cx - sprite.width / 2.0))
+    y = int(round(cy - sprite.height / 2.0))
+    # alpha_composite rejects negative destinations, so crop the sprite at the image edges
+    sx0, sy0 = max(0, -x), max(0, -y)
+    sx1 = min(sprite.width, image.width - x)
+    sy1 = min(sprite.height, image.height - y)
+    if sx1 <= sx0 or sy1 <= sy0:
+        return
+    image.alpha_composite(sprite, dest=(x + sx0, y + sy0), source=(sx0, sy0, sx1, sy1))
+
+
+def density_image(grid: np.ndarray, alpha: float = 0.8, log: bool = True) -> Image.Image:
+    """Colour a (rows, cols) count grid with ``HEAT_STOPS``; empty cells are transparent.
+
+    Counts are normalised to the busiest cell, after ``log1p`` by default so
+    a few hot spots do not wash out the rest. Opacity grows with density up
+    to ``alpha``. One pixel per cell: the caller scales it onto the radar.
+    """
+    g = np.asarray(grid, dtype=np.float64)
+    if log:
+        g = np.log1p(g)
+    peak = float(g.max()) if g.size else 0.0
+    v = g / peak if peak > 0 else g
+    rgba = np.empty(v.shape + (4,), dtype=np.uint8)
+    for ch in range(3):
+        rgba[..., ch] = np.interp(v, HEAT_STOPS[:, 0], HEAT_STOPS[:, ch + 1]).astype(np.uint8)
+    a = np.where(v > 0, 0.25 + 0.75 * np.sqrt(v), 0.0) * max(0.0, min(1.0, alpha))
+    rgba[..., 3] = np.round(a * 255).astype(np.uint8)
+    return Image.fromarray(rgba, "RGBA")
+
+
+def render_overlay_image(
+    vertices_px: np.ndarray,
+    offsets: np.ndarray,
+    names: Sequence[str],
+    radar: Optional[Image.Image] = None,
+    size: Optional[Tuple[int, int]] = None,
+    alpha: float = 0.35,
+    linewidth: float = 1.0,
+    labels: bool = True,
+    radar_alpha: float = 0.7,
+    density: Optional[Image.Image] = None,
+    background: Optional[Tuple[int, int, int]] = (255, 255, 255),
+) -> Image.Image:
+    """Draw pixel-space polygons over a radar image and return a new RGBA image.
+
+    ``vertices_px``/``offsets`` are in pixel space of the full-size radar, or
+    of a DEFAULT_SIZE square when no radar is given (see ``render.flatten_polygons`` and ``transform.RadarTransform``). ``size``
+    resizes the output, e.g. for thumbnails; coordinates are scaled to match.
+    ``density`` (see ``density_image``) is an RGBA layer covering the whole
+    radar, stretched to the output and composited between the radar and
+    the callouts. ``background`` is the opaque colour under everything;
+    ``None`` leaves the canvas transparent, for overlays stacked on a base
+    layer elsewhere.
+    Inputs are never modified, so this is safe to call from worker pools.
+    """
+    base_size = radar.size if radar is not None else (DEFAULT_SIZE, DEFAULT_SIZE)
+    out_size = size or base_size
+    sx = out_size[0] / float(base_size[0])
+    sy = out_size[1] / float(base_size[1])
+
+    canvas = Image.new("RGBA", out_size, tuple(background) + (255,) if background is not None else (0, 0, 0, 0))
+    if radar is not None:
+        under = radar.convert("RGBA")
+        if under.size != out_size:
+            under = under.resize(out_size, Image.BILINEAR)
+        if radar_alpha < 1.0:
+            under.putalpha(under.getchannel("A").point(lambda a: int(a * radar_alpha)))
+        canvas = Image.alpha_composite(canvas, under)
+    if density is not None:
+        layer = density.convert("RGBA")
+        if layer.size != out_size:
+            layer = layer.resize(out_size, Image.BILINEAR)
+        canvas = Image.alpha_composite(canvas, layer)
+
+    pts = np.asarray(vertices_px, dtype=np.float64) * np.array([sx, sy])
+    counts = np.diff(offsets)
+    drawn = np.flatnonzero(counts >= 3)
+    colors = {i: _rgb255(color_for_name(names[i])) for i in drawn.tolist()}
+
+    # Fills: "over" compositing per polygon, restricted to its bounding box, on premultiplied
+    # colour so a transparent canvas works too (on an opaque one coverage stays 1)
+    rgba = np.asarray(canvas, dtype=np.float32)
+    cover = rgba[:, :, 3:] / 255.0
+    rgb = rgba[:, :, :3] * cover
+    height, width = rgb.shape[:2]
+    fill_alpha = max(0.0, min(1.0, alpha))
+    for i in drawn.tolist():
+        poly = pts[offsets[i]:offsets[i + 1]]
+        x0, y0 = np.floor(poly.min(axis=0)).astype(int)
+        x1, y1 = np.ceil(poly.max(axis=0)).astype(int) + 1
+        x0, y0 = max(x0, 0), max(y0, 0)
+        x1, y1 = min(x1, width), min(y1, height)
+        if x1 <= x0 or y1 <= y0:
+            continue
+        mask = Image.new("L", (x1 - x0, y1 - y0), 0)
+        ImageDraw.Draw(mask).polygon([tuple(p) for p in (poly - (x0, y0)).tolist()], fill=255)
+        m = np.asarray(mask, dtype=np.float32)[:, :, None] * (fill_alpha / 255.0)
+        region = rgb[y0:y1, x0:x1]
+        region += (np.array(colors[i], dtype=np.float32) - region) * m
+        cover[y0:y1, x0:x1] += (1.0 - cover[y0:y1, x0:x1]) * m
+
+    rgb = np.divide(rgb, cover, out=np.zeros_like(rgb), where=cover > 0)
+    rgba = np.concatenate([rgb, cover * 255.0], axis=2)
+    out = Image.fromarray(np.clip(rgba + 0.5, 0, 255).astype(np.uint8), "RGBA")
+    draw = ImageDraw.Draw(out, "RGBA")
+    line_width = max(1, int(round(linewidth * min(sx, sy))))
+    for i in drawn.tolist():
+        poly = [tuple(p) for p in pts[offsets[i]:offsets[i + 1]].tolist()]
+        draw.line(poly + [poly[0]], fill=colors[i] + (255,), width=line_width)
+
+    if labels:
+        centers = polygon_centroids(pts, offsets)
+        for i in drawn.tolist():
+            cx, cy = centers[i].tolist()
+            _paste_centered(out, _label_sprite(names[i]), cx, cy)
+
+    return out
+
+
+def render_callouts_image(
+    data: Dict,
+    radar: Optional[Image.Image] = None,
+    map_metadata: Optional[Dict] = None,
+    size: Optional[Tuple[int, int]] = None,
+    alpha: float = 0.35,
+    linewidth: float = 1.0,
+    labels: bool = True,
+    pixel_scale: float = 1.0,
+    polygon_key: str = "polygon_2d",
+    density: Optional[Image.Image] = None,
+) -> Image.Image:
+    """Render a processed ``<map>_callouts.json`` payload without matplotlib.
+
+    With ``map_metadata`` polygons go through the awpy radar transform;
+    otherwise they are fitted to the canvas (and any radar is stretched over it).
+    ``pixel_scale`` maps full-size radar pixels onto ``radar`` when it is a
+    downsampled variant (see ``AssetCache.radar_image``). ``density`` is
+    passed through to ``render_overlay_image``.
+    """
+    items = data.get("callouts", [])
+    names = [it.get("name") or it.get("placename") or "?" for it in items]
+    vertices, offsets = flatten_polygons(callout_polygons(items, polygon_key))
+    if len(vertices) == 0:
+        raise ValueError("No polygon data to render")
+    if map_metadata:
+        vertices_px = transform_for(map_metadata).scaled(pixel_scale).to_pixel(vertices)
+    else:
+        canvas = radar.size if radar is not None else (DEFAULT_SIZE, DEFAULT_SIZE)
+        vertices_px = fit_to_canvas(vertices, canvas)
+    return render_overlay_image(
+        vertices_px, offsets, names, radar=radar, size=size, alpha=alpha, linewidth=linewidth, labels=labels,
+        density=density,
+    )
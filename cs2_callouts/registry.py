@@ -0,0 +1,282 @@
+from __future__ import annotations
+
+import sys
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from .graph import GRAPH_SUFFIX, CalloutGraph
+from .lookup import CalloutIndex
+from .partition import PARTITION_SUFFIX, CalloutPartition
+from .transform import RadarTransform, transform_for
+
+CALLOUTS_SUFFIX = "_callouts.json"
+
+
+@dataclass
+class CalloutMap:
+    """One processed map: callout polygons with their lookup index and radar transform."""
+
+    name: str
+    index: CalloutIndex
+    metadata: Optional[Dict]  # map-data.json entry (pos_x, pos_y, scale, ...) or None
+    source: Path
+    stamp: Tuple  # (mtime_ns, size) of ``source``, the graph and the partition (None if absent) when loaded
+    graph: Optional[CalloutGraph] = None  # from <map>_graph.json when it has been built
+    partition: Optional[CalloutPartition] = None  # from <map>_partition.npz; resolves overlaps by priority
+
+    @property
+    def names(self) -> List[str]:
+        return self.index.names
+
+    def route(self, src, dst) -> List[str]:
+        """Shortest callout route from the precomputed graph (``cs2_callouts graph``)."""
+        if self.graph is None:
+            raise ValueError(f"No callout graph for {self.name}; run the graph command first")
+        return self.graph.route(src, dst)
+
+    def polygon(self, i: int) -> np.ndarray:
+        """(V, 2) world-space hull of callout ``i``."""
+        return self.index.vertices[self.index.offsets[i]:self.index.offsets[i + 1]]
+
+    @property
+    def resolver(self):
+        """The partition when one was built (priority-resolved, faster), else the index."""
+        return self.partition if self.partition is not None else self.index
+
+    def lookup(self, points: np.ndarray, space: str = "world") -> np.ndarray:
+        return self.resolver.lookup(self.to_world(points, space))
+
+    def label(self, points: np.ndarray, missing: str = "", space: str = "world") -> np.ndarray:
+        return self.resolver.label(self.to_world(points, space), missing=missing)
+
+    @property
+    def transform(self) -> RadarTransform:
+        """World <-> radar transform; needs map-data.json metadata for this map."""
+        if not self.metadata:
+            raise ValueError(f"No radar metadata for {self.name}")
+        return transform_for(self.metadata)
+
+    def to_pixel(self, points: np.ndarray) -> np.ndarray:
+        """World XY to radar pixels."""
+        return self.transform.to_pixel(points)
+
+    def to_world(self, points: np.ndarray, space: str = "world") -> np.ndarray:
+        """XY in ``space`` ("world", "pixel" or "normalized") as world XY."""
+        if space == "world":
+            return np.asarray(points, dtype=np.float64)[:, :2]
+        if space == "pixel":
+            return self.transform.to_world(points)
+        if space == "normalized":
+            return self.transform.from_normalized(points)
+        raise ValueError(f"Unknown coordinate space {space!r}")
+
+    @property
+    def nbytes(self) -> int:
+        """Approximate resident size: index and route arrays plus callout name strings."""
+        size = self.index.nbytes + sum(sys.getsizeof(n) for n in self.index.names)
+        if self.graph is not None:
+            size += self.graph.dist.nbytes + self.graph.next_hop.nbytes
+        if self.partition is not None:
+            p = self.partition
+            size += p.labels.nbytes + p.boundary_offsets.nbytes + p.boundary_items.nbytes
+        return size
+
+
+@dataclass
+class RegistryStats:
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    reloads: int = 0  # misses caused by a changed file rather than a cold or evicted map
+    entries: int = 0
+    bytes: int = 0
+    evicted: List[str] = field(default_factory=list)
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def as_dict(self) -> Dict:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "reloads": self.reloads,
+            "entries": self.entries,
+            "bytes": self.bytes,
+            "hit_rate": round(self.hit_rate, 4),
+        }
+
+
+class CalloutMaps:
+    """Lazily loaded, LRU-bounded set of processed maps from ``<out_dir>/<map>_callouts.json``.
+
+    ``maps["de_mirage"]`` loads the map on first use and returns the cached
+    CalloutMap afterwards. When ``check_files`` is on, each access also
+    stats the callouts file and its ``_graph.json`` and ``_partition.npz``
+    companions, and reloads the map when any of them was changed, added or
+    removed. Once the loaded
+    maps exceed ``max_entries`` or ``max_bytes`` (see ``CalloutMap.nbytes``),
+    the least recently used ones are evicted; the map just requested is
+    always kept, even if it alone is over budget. Safe to share between threads.
+    """
+
+    def __init__(
+        self,
+        out_dir: str | Path = "out",
+        map_data: str | Path | None = None,
+        max_entries: Optional[int] = None,
+        max_bytes: Optional[int] = None,
+        cache_dir: str | Path | None = None,
+        check_files: bool = True,
+        polygon_key: str = "polygon_2d",
+    ):
+        self.out_dir = Path(out_dir)
+        self.map_data = map_data
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.polygon_key = polygon_key  # e.g. "polygon_2d_simplified" for fewer vertices per lookup
+        self.cache_dir = cache_dir
+        self.check_files = check_files
+        self._maps: "OrderedDict[str, CalloutMap]" = OrderedDict()
+        self._lock = threading.RLock()
+        self._stats = RegistryStats()
+
+    def path_for(self, map_name: str) -> Path:
+        if not map_name or "/" in map_name or "\\" in map_name or map_name.startswith("."):
+            raise KeyError(map_name)
+        return self.out_dir / f"{map_name}{CALLOUTS_SUFFIX}"
+
+    def available(self) -> List[str]:
+        """Maps with a processed callouts file in ``out_dir``."""
+        return sorted(p.name[: -len(CALLOUTS_SUFFIX)] for p in self.out_dir.glob(f"*{CALLOUTS_SUFFIX}"))
+
+    def loaded(self) -> List[str]:
+        """Currently cached maps, least recently used first."""
+        with self._lock:
+            return list(self._maps)
+
+    def __contains__(self, map_name: str) -> bool:
+        with self._lock:
+            return map_name in self._maps
+
+    def __len__(self) -> int:
+        return len(self._maps)
+
+    def __getitem__(self, map_name: str) -> CalloutMap:
+        return self.get(map_name)
+
+    @staticmethod
+    def _file_stamp(path: Path) -> Optional[Tuple[int, int]]:
+        try:
+            st = path.stat()
+        except FileNotFoundError:
+            return None
+        return (st.st_mtime_ns, st.st_size)
+
+    def _stamp(self, map_name: str, path: Path) -> Tuple:
+        """(mtime_ns, size) of the callouts file, graph and partition; KeyError without a callouts file."""
+        source = self._file_stamp(path)
+        if source is None:
+            raise KeyError(map_name)
+        graph = self._file_stamp(self.out_dir / f"{map_name}{GRAPH_SUFFIX}")
+        partition = self._file_stamp(self.out_dir / f"{map_name}{PARTITION_SUFFIX}")
+        return (source, graph, partition)
+
+    def _load(self, map_name: str, path: Path, stamp: Tuple) -> CalloutMap:
+        from .assets import get_asset_cache
+
+        metadata = get_asset_cache(self.cache_dir).map_metadata(map_name, self.map_data)
+        index = CalloutIndex.from_json(path, polygon_key=self.polygon_key)
+        graph_path = self.out_dir / f"{map_name}{GRAPH_SUFFIX}"
+        graph = CalloutGraph.load(graph_path) if graph_path.exists() else None
+        if graph is not None and graph.names != list(index.names):
+            graph = None  # stale: built for an older callouts file
+        partition = None
+        partition_path = self.out_dir / f"{map_name}{PARTITION_SUFFIX}"
+        if partition_path.exists():
+            try:
+                partition = CalloutPartition.load(partition_path, index)
+            except ValueError:
+                partition = None  # stale: built for an older callouts file
+        return CalloutMap(
+            name=map_name, index=index, metadata=metadata, source=path, stamp=stamp, graph=graph, partition=partition
+        )
+
+    def get(self, map_name: str) -> CalloutMap:
+        """The map's CalloutMap, loading (or reloading) it if needed. KeyError if it has no file."""
+        path = self.path_for(map_name)
+        with self._lock:
+            cached = self._maps.get(map_name)
+            if cached is not None and (not self.check_files or cached.stamp == self._stamp(map_name, path)):
+                self._maps.move_to_end(map_name)
+                self._stats.hits += 1
+                return cached
+            stamp = self._stamp(map_name, path)
+            # Indexes are built under the lock so concurrent first requests load a map only once
+            entry = self._load(map_name, path, stamp)
+            self._stats.misses += 1
+            if cached is not None:
+                self._stats.reloads += 1
+            self._maps[map_name] = entry
+            self._maps.move_to_end(map_name)
+            self._enforce_budget(keep=map_name)
+            return entry
+
+    def _total_bytes(self) -> int:
+        return sum(m.nbytes for m in self._maps.values())
+
+    def _enforce_budget(self, keep: str) -> None:
+        while len(self._maps) > 1:
+            over_entries = self.max_entries is not None and len(self._maps) > self.max_entries
+            over_bytes = self.max_bytes is not None and self._total_bytes() > self.max_bytes
+            if not (over_entries or over_bytes):
+                break
+            victim = next(iter(self._maps))
+            if victim == keep:
+                break
+            self._evict(victim)
+
+    def _evict(self, map_name: str) -> None:
+        del self._maps[map_name]
+        self._stats.evictions += 1
+        self._stats.evicted.append(map_name)
+        del self._stats.evicted[:-32]  # keep only the most recent names
+
+    def evict(self, map_name: str) -> bool:
+        with self._lock:
+            if map_name not in self._maps:
+                return False
+            self._evict(map_name)
+            return True
+
+    def clear(self) -> None:
+        with self._lock:
+            self._maps.clear()
+
+    def preload(self, names: Optional[List[str]] = None) -> List[str]:
+        names = self.available() if names is None else list(names)
+        for name in names:
+            self.get(name)
+        return names
+
+    @property
+    def stats(self) -> RegistryStats:
+        """Snapshot of hit/miss/eviction counters plus the current entry count and size."""
+        with self._lock:
+            s = self._stats
+            return RegistryStats(
+                hits=s.hits,
+                misses=s.misses,
+                evictions=s.evictions,
+                reloads=s.reloads,
+                entries=len(self._maps),
+                bytes=self._total_bytes(),
+                evicted=list(s.evicted),
+            )
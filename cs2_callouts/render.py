@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+import json
+import zlib
+from pathlib import Path
+from typing import Dict, List, Sequence, Tuple
+
+import numpy as np
+
+from .transform import transform_for
+
+
+def load_output(path: str | Path) -> Dict:
+    """Read a ``<map>_callouts.json`` written by the pipeline (a UTF-8 BOM is tolerated)."""
+    return json.loads(Path(path).read_text(encoding="utf-8-sig"))
+
+
+def color_for_name(name: str) -> Tuple[float, float, float]:
+    # Deterministic pastel; crc32 rather than hash() so colors are stable across processes
+    h = zlib.crc32(name.encode("utf-8")) % 360
+    s = 0.5
+    v = 0.95
+    c = v * s
+    x = c * (1 - abs(((h / 60) % 2) - 1))
+    m = v - c
+    if   0 <= h < 60:  r,g,b = c,x,0
+    elif 60 <= h <120: r,g,b = x,c,0
+    elif 120<= h<180: r,g,b = 0,c,x
+    elif 180<= h<240: r,g,b = 0,x,c
+    elif 240<= h<300: r,g,b = x,0, c
+    else:             r,g,b = c,0, x
+    return (r+m, g+m, b+m)
+
+
+def callout_polygons(items: Sequence[Dict], polygon_key: str = "polygon_2d") -> List[List[List[float]]]:
+    """Each callout's ``polygon_key`` ring (e.g. ``polygon_2d_simplified``), falling back to ``polygon_2d``."""
+    return [it.get(polygon_key) or it.get("polygon_2d") or [] for it in items]
+
+
+def flatten_polygons(polys: Sequence[Sequence[Sequence[float]]]) -> Tuple[np.ndarray, np.ndarray]:
+    """Pack ragged polygons into one (V, 2) vertex array plus (P + 1,) start offsets."""
+    counts = np.fromiter((len(p) for p in polys), dtype=np.int64, count=len(polys))
+    offsets = np.zeros(len(polys) + 1, dtype=np.int64)
+    np.cumsum(counts, out=offsets[1:])
+    if offsets[-1] == 0:
+        return np.zeros((0, 2), dtype=np.float64), offsets
+    vertices = np.array([pt for p in polys for pt in p], dtype=np.float64).reshape(-1, 2)
+    return vertices, offsets
+
+
+def split_polygons(vertices: np.ndarray, offsets: np.ndarray) -> List[np.ndarray]:
+    """Inverse of flatten_polygons; returns views into ``vertices``."""
+    return [vertices[offsets[i]:offsets[i + 1]] for i in range(len(offsets) - 1)]
+
+
+def polygon_centroids(vertices: np.ndarray, offsets: np.ndarray) -> np.ndarray:
+    """Vertex-mean centroid of every polygon, (P, 2). Empty polygons get (0, 0)."""
+    counts = np.diff(offsets)
+    out = np.zeros((len(counts), 2), dtype=np.float64)
+    nonempty = counts > 0
+    if not nonempty.any():
+        return out
+    sums = np.add.reduceat(vertices, offsets[:-1][nonempty], axis=0)
+    out[nonempty] = sums / counts[nonempty, None]
+    return out
+
+
+def game_to_pixel(vertices: np.ndarray, map_metadata: Dict) -> np.ndarray:
+    """awpy radar transform applied to all vertices at once (Y is inverted); see ``transform.RadarTransform``."""
+    if len(vertices) == 0:
+        return np.zeros((0, 2), dtype=np.float64)
+    return transform_for(map_metadata).to_pixel(vertices)
+
+
+def use_noninteractive_backend() -> None:
+    """Force the Agg backend; used when the figure only goes to a file."""
+    import matplotlib
+
+    matplotlib.use("Agg", force=True)
+
+
+def draw_callouts(
+    ax,
+    vertices: np.ndarray,
+    offsets: np.ndarray,
+    names: Sequence[str],
+    alpha: float = 0.35,
+    linewidth: float = 1.0,
+    labels: bool = True,
+    min_vertices: int = 1,
+) -> None:
+    """Draw all callout polygons as a single PolyCollection plus centroid labels."""
+    from matplotlib.collections import PolyCollection
+
+    counts = np.diff(offsets)
+    keep = np.flatnonzero(counts >= max(1, min_vertices))
+    if len(keep) == 0:
+        return
+    polys = split_polygons(vertices, offsets)
+    colors = np.array([color_for_name(names[i]) for i in keep], dtype=np.float64)
+    facecolors = np.column_stack([colors, np.full(len(keep), alpha)])
+    coll = PolyCollection(
+        [polys[i] for i in keep],
+        closed=True,
+        facecolors=facecolors,
+        edgecolors=colors,
+        linewidths=linewidth,
+    )
+    ax.add_collection(coll)
+    if labels:
+        centers = polygon_centroids(vertices, offsets)[keep]
+        bbox = dict(boxstyle="round,pad=0.1", fc="white", ec="none", alpha=0.6)
+        for (cx, cy), i in zip(centers.tolist(), keep.tolist()):
+            ax.text(cx, cy, names[i], fontsize=7, color="black", ha="center", va="center", bbox=bbox)
@@ -0,0 +1,200 @@
+from __future__ import annotations
+
+import http.client
+import json
+import os
+import socket
+import socketserver
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+from .registry import CalloutMaps
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+# Largest request body accepted, in bytes (about 1M points as JSON)
+MAX_BODY_BYTES = 64 * 1024 * 1024
+
+
+def _points_array(points) -> np.ndarray:
+    """(N, 2) or (N, 3) float array from a request's ``points``; ValueError for anything else."""
+    message = "points must be a list of [x, y] or [x, y, z]"
+    if not isinstance(points, list):
+        raise ValueError(message)
+    try:
+        arr = np.asarray(points, dtype=np.float64)
+    except (TypeError, ValueError):
+        raise ValueError(message) from None
+    if arr.size == 0:
+        return np.empty((0, 2))
+    if arr.ndim == 1 and arr.size in (2, 3):
+        arr = arr[None, :]
+    if arr.ndim != 2 or arr.shape[1] not in (2, 3):
+        raise ValueError(message)
+    return arr
+
+
+def lookup_request(maps: CalloutMaps, payload: Dict) -> Dict:
+    """Answer one lookup payload ``{"map": ..., "points": [[x, y, z], ...]}``.
+
+    ``z`` is accepted for forward compatibility but hulls are 2D, so only
+    ``x``/``y`` are tested. An optional ``"space"`` of ``"pixel"`` or
+    ``"normalized"`` gives points in radar coordinates instead of world units.
+    Returns callout names (None outside every callout).
+    """
+    if not isinstance(payload, dict):
+        raise ValueError("request body must be a JSON object")
+    map_name = payload.get("map")
+    if not isinstance(map_name, str):
+        raise ValueError("map must be a map name string")
+    callout_map = maps.get(map_name)
+    space = payload.get("space", "world")
+    if not isinstance(space, str):
+        raise ValueError("space must be one of \"world\", \"pixel\" or \"normalized\"")
+    xy = _points_array(payload.get("points", []))[:, :2]
+    ids = callout_map.lookup(xy, space=space).tolist()
+    names = callout_map.names
+    return {
+        "map": map_name,
+        "ids": ids,
+        "callouts": [names[i] if i >= 0 else None for i in ids],
+    }
+
+
+class CalloutRequestHandler(BaseHTTPRequestHandler):
+    """``GET /health``, ``GET /maps`` and ``POST /lookup`` (one map, a batch of points)."""
+
+    protocol_version = "HTTP/1.1"  # keep-alive, so clients can reuse one connection
+    server_version = "cs2-callouts"
+    # Headers and body go out in separate writes; without TCP_NODELAY each response waits on a delayed ACK
+    disable_nagle_algorithm = True
+
+    def _send_json(self, status: int, body: Dict) -> None:
+        data = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        maps: CalloutMaps = self.server.maps
+        if self.path == "/health":
+            self._send_json(200, {"status": "ok"})
+        elif self.path == "/maps":
+            self._send_json(200, {"maps": maps.available(), "loaded": maps.loaded(), "stats": maps.stats.as_dict()})
+        else:
+            self._send_json(404, {"error": f"unknown path {self.path}"})
+
+    def do_POST(self):
+        if self.path != "/lookup":
+            self._send_json(404, {"error": f"unknown path {self.path}"})
+            return
+        length = int(self.headers.get("Content-Length") or 0)
+        if length > MAX_BODY_BYTES:
+            self._send_json(413, {"error": "request body too large"})
+            self.close_connection = True
+            return
+        try:
+            payload = json.loads(self.rfile.read(length) or b"{}")
+            self._send_json(200, lookup_request(self.server.maps, payload))
+        except KeyError as e:
+            self._send_json(404, {"error": f"unknown map {e.args[0]!r}"})
+        except ValueError as e:
+            self._send_json(400, {"error": str(e)})
+        except Exception as e:
+            # Answer instead of dropping the socket, so a keep-alive client can keep using it
+            self._send_json(500, {"error": f"internal error: {type(e).__name__}: {e}"})
+
+    def address_string(self) -> str:
+        # Unix socket peers have no (host, port) address
+        return self.client_address[0] if isinstance(self.client_address, tuple) else "unix"
+
+    def log_message(self, format, *args):
+        if getattr(self.server, "verbose", False):
+            super().log_message(format, *args)
+
+
+class ThreadingUnixHTTPServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+    def server_bind(self):
+        socketserver.UnixStreamServer.server_bind(self)
+        self.server_name = "localhost"
+        self.server_port = 0
+
+
+def make_server(
+    maps: CalloutMaps,
+    host: str = DEFAULT_HOST,
+    port: int = DEFAULT_PORT,
+    unix_socket: Optional[str] = None,
+    verbose: bool = False,
+):
+    """HTTP server over TCP, or over ``unix_socket`` when given; call ``serve_forever``."""
+    if unix_socket:
+        if os.path.exists(unix_socket):
+            os.unlink(unix_socket)
+        server = ThreadingUnixHTTPServer(unix_socket, CalloutRequestHandler)
+    else:
+        server = ThreadingHTTPServer((host, port), CalloutRequestHandler)
+    server.maps = maps
+    server.verbose = verbose
+    return server
+
+
+class _UnixHTTPConnection(http.client.HTTPConnection):
+    def __init__(self, path: str, timeout: float = 30.0):
+        super().__init__("localhost", timeout=timeout)
+        self._unix_path = path
+
+    def connect(self):
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.settimeout(self.timeout)
+        self.sock.connect(self._unix_path)
+
+
+class _TCPHTTPConnection(http.client.HTTPConnection):
+    def connect(self):
+        super().connect()
+        # http.client sends bodies over 2000 bytes separately from the headers
+        self.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+
+class CalloutClient:
+    """Minimal keep-alive client for the ``serve`` endpoint (one connection, not thread-safe)."""
+
+    def __init__(self, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT, unix_socket: Optional[str] = None, timeout: float = 30.0):
+        if unix_socket:
+            self._conn = _UnixHTTPConnection(unix_socket, timeout=timeout)
+        else:
+            self._conn = _TCPHTTPConnection(host, port, timeout=timeout)
+
+    def _request(self, method: str, path: str, body: Optional[Dict] = None) -> Dict:
+        data = json.dumps(body).encode("utf-8") if body is not None else None
+        headers = {"Content-Type": "application/json"} if data is not None else {}
+        self._conn.request(method, path, body=data, headers=headers)
+        resp = self._conn.getresponse()
+        payload = json.loads(resp.read() or b"{}")
+        if resp.status != 200:
+            raise RuntimeError(f"{method} {path} failed ({resp.status}): {payload.get('error')}")
+        return payload
+
+    def lookup(self, map_name: str, points: Sequence[Sequence[float]]) -> List[Optional[str]]:
+        """Callout name for each point, None where no callout contains it."""
+        pts = points.tolist() if isinstance(points, np.ndarray) else [list(p) for p in points]
+        return self._request("POST", "/lookup", {"map": map_name, "points": pts})["callouts"]
+
+    def maps(self) -> Dict:
+        return self._request("GET", "/maps")
+
+    def close(self) -> None:
+        self._conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,159 @@
+from __future__ import annotations
+
+import heapq
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from .geometry import polygon_area
+
+SIMPLIFIED_KEY = "polygon_2d_simplified"
+# Deviations up to this many game units are float noise (e.g. dropping a collinear vertex)
+DEVIATION_EPS = 1e-6
+
+
+@dataclass
+class SimplifyStats:
+    vertices_before: int
+    vertices_after: int
+    area_before: float
+    area_after: float
+    max_deviation: float  # farthest original vertex from the simplified outline, game units
+
+    @property
+    def area_error(self) -> float:
+        """Relative area change, (after - before) / before."""
+        return (self.area_after - self.area_before) / self.area_before if self.area_before else 0.0
+
+    def as_dict(self) -> Dict:
+        return {
+            "vertices_before": self.vertices_before,
+            "vertices_after": self.vertices_after,
+            "area_error": round(self.area_error, 6),
+            "max_deviation": round(self.max_deviation, 4),
+        }
+
+
+def _triangle_area(pts: np.ndarray, a: int, b: int, c: int) -> float:
+    (ax, ay), (bx, by), (cx, cy) = pts[a], pts[b], pts[c]
+    return 0.5 * abs((bx - ax) * (cy - ay) - (cx - ax) * (by - ay))
+
+
+def _chord_deviation(pts: np.ndarray, a: int, b: int) -> float:
+    """Largest distance from the original vertices strictly between ``a`` and ``b`` to segment a-b."""
+    n = len(pts)
+    span = (b - a) % n
+    if span < 2:
+        return 0.0
+    between = pts[np.arange(a + 1, a + span) % n]
+    d = pts[b] - pts[a]
+    len2 = float(d @ d)
+    rel = between - pts[a]
+    t = np.clip(rel @ d / len2, 0.0, 1.0) if len2 > 0 else np.zeros(len(between))
+    return float(np.hypot(*(rel - t[:, None] * d).T).max())
+
+
+def _visvalingam(
+    pts: np.ndarray, prev: List[int], nxt: List[int], alive: List[bool], count: int,
+    tolerance: Optional[float], target: int,
+) -> Tuple[int, float]:
+    """Drop the vertex forming the smallest triangle with its neighbours until ``count <= target``.
+
+    With ``tolerance``, a vertex is only dropped if every original vertex it
+    would cut off stays within that distance of the new edge; blocked
+    vertices are retried when a neighbour changes. Returns the new count and
+    the largest deviation accepted.
+    """
+    version = [0] * len(pts)
+    heap = [(_triangle_area(pts, prev[i], i, nxt[i]), i, 0) for i in range(len(pts)) if alive[i]]
+    heapq.heapify(heap)
+    worst = 0.0
+    while heap and count > target:
+        _, i, ver = heapq.heappop(heap)
+        if not alive[i] or ver != version[i]:
+            continue
+        dev = _chord_deviation(pts, prev[i], nxt[i])
+        if tolerance is not None and dev > tolerance + DEVIATION_EPS:
+            continue
+        alive[i] = False
+        count -= 1
+        worst = max(worst, dev)
+        p, q = prev[i], nxt[i]
+        nxt[p], prev[q] = q, p
+        for j in (p, q):
+            version[j] += 1
+            heapq.heappush(heap, (_triangle_area(pts, prev[j], j, nxt[j]), j, version[j]))
+    return count, worst
+
+
+def simplify_polygon(
+    poly, tolerance: float = 0.0, max_vertices: Optional[int] = None
+) -> Tuple[np.ndarray, SimplifyStats]:
+    """Visvalingam-Whyatt simplification of one closed ring, kept within ``tolerance`` game units.
+
+    Vertices go smallest effective area first, but only while every original
+    vertex stays within ``tolerance`` of the simplified outline (so
+    collinear points always go, even at 0: deviations within
+    ``DEVIATION_EPS`` are float noise). For convex hulls the result lies
+    inside the original and covers all of it but a band at most
+    ``tolerance`` wide. ``max_vertices`` is a hard budget: if the tolerance
+    alone does not reach it, removal continues past the tolerance and
+    ``max_deviation`` in the stats reports by how much.
+    """
+    pts = np.asarray(poly, dtype=np.float64).reshape(-1, 2)
+    n = len(pts)
+    area0 = abs(polygon_area(pts))
+    if n <= 3:
+        return pts.copy(), SimplifyStats(n, n, area0, area0, 0.0)
+    prev = [(i - 1) % n for i in range(n)]
+    nxt = [(i + 1) % n for i in range(n)]
+    alive = [True] * n
+    count, worst = _visvalingam(pts, prev, nxt, alive, n, tolerance, 3)
+    if max_vertices is not None and count > max(max_vertices, 3):
+        count, _ = _visvalingam(pts, prev, nxt, alive, count, None, max(max_vertices, 3))
+        # Forced removals can exceed the tolerance; measure the final outline against every original vertex
+        keep = [i for i in range(n) if alive[i]]
+        worst = max(_chord_deviation(pts, a, b) for a, b in zip(keep, keep[1:] + keep[:1]))
+    out = pts[[i for i in range(n) if alive[i]]]
+    return out, SimplifyStats(n, len(out), area0, abs(polygon_area(out)), worst)
+
+
+def simplify_callouts(
+    data: Dict,
+    tolerance: Optional[float] = 0.0,
+    max_vertices: Optional[int] = None,
+    polygon_key: str = "polygon_2d",
+    out_key: str = SIMPLIFIED_KEY,
+) -> Dict:
+    """Add ``out_key`` polygons and per-callout stats to a ``process_callouts`` payload, in place.
+
+    The original ``polygon_key`` polygons are kept. Returns the summary that
+    is also stored under ``data["simplification"]``. With ``tolerance=None``
+    (only a ``max_vertices`` budget) simplification runs at tolerance 0 and
+    ``over_tolerance`` is None rather than a count.
+    """
+    before = after = over = 0
+    worst_area = 0.0
+    for item in data.get("callouts", []):
+        simplified, stats = simplify_polygon(item.get(polygon_key) or [], tolerance or 0.0, max_vertices)
+        item[out_key] = [[float(x), float(y)] for x, y in simplified.tolist()]
+        item["simplification"] = stats.as_dict()
+        before += stats.vertices_before
+        after += stats.vertices_after
+        if tolerance is not None:
+            over += stats.max_deviation > tolerance + DEVIATION_EPS
+        worst_area = max(worst_area, abs(stats.area_error))
+    summary = {
+        "tolerance": tolerance,
+        "max_vertices": max_vertices,
+        "polygon_key": out_key,
+        "vertices_before": before,
+        "vertices_after": after,
+        "reduction": round(1.0 - after / before, 4) if before else 0.0,
+        "max_abs_area_error": round(worst_area, 6),
+        # callouts where the vertex budget forced a larger deviation; None without a tolerance
+        "over_tolerance": int(over) if tolerance is not None else None,
+    }
+    data["simplification"] = summary
+    return summary
@@ -0,0 +1,228 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+from PIL import Image
+
+from .raster import DEFAULT_SIZE, render_overlay_image
+
+TILE_SIZE = 256
+MANIFEST_NAME = "tiles.json"
+# Bump when tile rendering changes so previously written tiles are re-rendered
+RENDER_VERSION = 3
+# Tiles are drawn this many tile pixels beyond their edges and cropped, so labels and outlines
+# crossing an edge continue on the neighbouring tile
+LABEL_MARGIN = 64
+
+
+@dataclass
+class TileJob:
+    z: int
+    x: int
+    y: int
+    window: Tuple[float, float, float, float]  # x0, y0, x1, y1 in base pixel space
+    polygons: np.ndarray  # indices of polygons whose bbox touches the window plus LABEL_MARGIN
+    digest: str = ""
+
+    @property
+    def key(self) -> str:
+        return f"{self.z}/{self.x}/{self.y}"
+
+
+def _polygon_bboxes(vertices: np.ndarray, offsets: np.ndarray) -> np.ndarray:
+    """(P, 4) min_x, min_y, max_x, max_y per polygon in pixel space; empty polygons get NaN."""
+    out = np.full((len(offsets) - 1, 4), np.nan, dtype=np.float64)
+    counts = np.diff(offsets)
+    nonempty = counts > 0
+    if nonempty.any():
+        starts = offsets[:-1][nonempty]
+        out[nonempty, :2] = np.minimum.reduceat(vertices, starts, axis=0)
+        out[nonempty, 2:] = np.maximum.reduceat(vertices, starts, axis=0)
+    return out
+
+
+def plan_tiles(
+    vertices_px: np.ndarray,
+    offsets: np.ndarray,
+    base_size: Tuple[int, int],
+    max_zoom: int,
+    sparse_from: int,
+) -> List[TileJob]:
+    """List the tiles to render for zoom levels 0..max_zoom.
+
+    Levels below ``sparse_from`` are rendered in full; from ``sparse_from`` on
+    only tiles whose window intersects a polygon bounding box are kept.
+    Bounding boxes are grown by ``LABEL_MARGIN`` tile pixels, so a tile also
+    gets the polygons whose labels can reach into it.
+    """
+    bboxes = _polygon_bboxes(vertices_px, offsets)
+    valid = np.flatnonzero(~np.isnan(bboxes[:, 0]) & (np.diff(offsets) >= 3))
+    bb = bboxes[valid]
+    width, height = base_size
+    jobs: List[TileJob] = []
+    for z in range(max_zoom + 1):
+        n = 2 ** z
+        tw, th = width / float(n), height / float(n)
+        mx, my = LABEL_MARGIN * tw / TILE_SIZE, LABEL_MARGIN * th / TILE_SIZE
+        grown = bb + np.array([-mx, -my, mx, my])
+        # Tile ranges covered by each polygon bbox, computed for all polygons at once
+        tx0 = np.clip(np.floor(grown[:, 0] / tw), 0, n - 1).astype(np.int64)
+        tx1 = np.clip(np.floor(grown[:, 2] / tw), 0, n - 1).astype(np.int64)
+        ty0 = np.clip(np.floor(grown[:, 1] / th), 0, n - 1).astype(np.int64)
+        ty1 = np.clip(np.floor(grown[:, 3] / th), 0, n - 1).astype(np.int64)
+        inside = (grown[:, 2] >= 0) & (grown[:, 0] <= width) & (grown[:, 3] >= 0) & (grown[:, 1] <= height)
+        touched: Dict[Tuple[int, int], List[int]] = {}
+        for k in np.flatnonzero(inside).tolist():
+            for ty in range(ty0[k], ty1[k] + 1):
+                for tx in range(tx0[k], tx1[k] + 1):
+                    touched.setdefault((tx, ty), []).append(int(valid[k]))
+        if z < sparse_from:
+            cells = [(tx, ty) for ty in range(n) for tx in range(n)]
+        else:
+            cells = sorted(touched, key=lambda c: (c[1], c[0]))
+        for tx, ty in cells:
+            jobs.append(
+                TileJob(
+                    z=z,
+                    x=tx,
+                    y=ty,
+                    window=(tx * tw, ty * th, (tx + 1) * tw, (ty + 1) * th),
+                    polygons=np.array(touched.get((tx, ty), []), dtype=np.int64),
+                )
+            )
+    return jobs
+
+
+def _tile_digest(job: TileJob, radar_digest: str, vertices_px: np.ndarray, offsets: np.ndarray, names: Sequence[str], style: Dict) -> str:
+    """Hash everything that affects a tile's pixels, so unchanged tiles can be skipped."""
+    h = hashlib.sha256()
+    h.update(json.dumps({"v": RENDER_VERSION, "key": job.key, "radar": radar_digest, "style": style}, sort_keys=True).encode("utf-8"))
+    for i in job.polygons.tolist():
+        h.update(names[i].encode("utf-8"))
+        h.update(np.ascontiguousarray(vertices_px[offsets[i]:offsets[i + 1]]).tobytes())
+    return h.hexdigest()
+
+
+def _render_tile(
+    job: TileJob,
+    radar: Optional[Image.Image],
+    vertices_px: np.ndarray,
+    offsets: np.ndarray,
+    names: Sequence[str],
+    style: Dict,
+) -> Image.Image:
+    x0, y0, x1, y1 = job.window
+    k = TILE_SIZE / (x1 - x0)
+    pad = LABEL_MARGIN
+    padded = TILE_SIZE + 2 * pad
+    # Always hand the renderer a base image in padded tile pixels, so it never rescales the
+    # vertices from its DEFAULT_SIZE fallback canvas. The margin is cropped off, so it stays blank.
+    under = Image.new("RGBA", (padded, padded), (255, 255, 255, 0))
+    if radar is not None:
+        under.paste(radar.resize((TILE_SIZE, TILE_SIZE), Image.BILINEAR, box=(x0, y0, x1, y1)), (pad, pad))
+    polys = [vertices_px[offsets[i]:offsets[i + 1]] for i in job.polygons.tolist()]
+    if polys:
+        sub_vertices = (np.vstack(polys) - (x0, y0)) * k + pad
+    else:
+        sub_vertices = np.zeros((0, 2), dtype=np.float64)
+    sub_offsets = np.zeros(len(polys) + 1, dtype=np.int64)
+    np.cumsum([len(p) for p in polys], out=sub_offsets[1:])
+    sub_names = [names[i] for i in job.polygons.tolist()]
+    img = render_overlay_image(
+        sub_vertices,
+        sub_offsets,
+        sub_names,
+        radar=under,
+        alpha=style["alpha"],
+        linewidth=style["linewidth"],
+        labels=style["labels"] and job.z >= style["label_min_zoom"],
+        # Without a radar the tile is a transparent overlay for the viewer's own base layer
+        background=None if radar is None else (255, 255, 255),
+    )
+    return img.crop((pad, pad, pad + TILE_SIZE, pad + TILE_SIZE))
+
+
+def build_tile_pyramid(
+    out_dir: str | Path,
+    vertices_px: np.ndarray,
+    offsets: np.ndarray,
+    names: Sequence[str],
+    radar: Optional[Image.Image] = None,
+    max_zoom: int = 4,
+    sparse_from: int = 2,
+    alpha: float = 0.35,
+    linewidth: float = 1.0,
+    labels: bool = True,
+    label_min_zoom: int = 2,
+    workers: Optional[int] = None,
+) -> Dict:
+    """Render an XYZ pyramid ``{z}/{x}/{y}.png`` under ``out_dir``.
+
+    ``vertices_px`` are in the pixel space of ``radar`` (or a DEFAULT_SIZE
+    square without one). A ``tiles.json`` manifest stores the content hash of
+    every tile; tiles whose hash matches the previous build are not rendered
+    again, and tiles that disappeared from the plan are deleted.
+    """
+    out = Path(out_dir)
+    out.mkdir(parents=True, exist_ok=True)
+    base_size = radar.size if radar is not None else (DEFAULT_SIZE, DEFAULT_SIZE)
+    if radar is not None:
+        radar = radar.convert("RGBA")
+        radar.load()
+        radar_digest = hashlib.sha256(radar.tobytes()).hexdigest()
+    else:
+        radar_digest = ""
+    style = {"alpha": alpha, "linewidth": linewidth, "labels": labels, "label_min_zoom": label_min_zoom}
+
+    manifest_path = out / MANIFEST_NAME
+    previous: Dict[str, str] = {}
+    if manifest_path.exists():
+        try:
+            previous = json.loads(manifest_path.read_text(encoding="utf-8")).get("tiles", {})
+        except (OSError, ValueError):
+            previous = {}
+
+    jobs = plan_tiles(vertices_px, offsets, base_size, max_zoom, sparse_from)
+    todo: List[TileJob] = []
+    for job in jobs:
+        job.digest = _tile_digest(job, radar_digest, vertices_px, offsets, names, style)
+        if previous.get(job.key) == job.digest and (out / f"{job.key}.png").exists():
+            continue
+        todo.append(job)
+
+    def work(job: TileJob) -> None:
+        img = _render_tile(job, radar, vertices_px, offsets, names, style)
+        path = out / f"{job.key}.png"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(".png.tmp")
+        img.save(tmp, format="PNG")
+        os.replace(tmp, path)
+
+    # PIL resize/encode and NumPy release the GIL, so threads parallelize without copying the radar
+    with ThreadPoolExecutor(max_workers=workers or os.cpu_count() or 1) as pool:
+        list(pool.map(work, todo))
+
+    current = {job.key: job.digest for job in jobs}
+    removed = 0
+    for key in set(previous) - set(current):
+        stale = out / f"{key}.png"
+        if stale.exists():
+            stale.unlink()
+            removed += 1
+
+    manifest = {
+        "tile_size": TILE_SIZE,
+        "max_zoom": max_zoom,
+        "sparse_from": sparse_from,
+        "base_size": list(base_size),
+        "tiles": current,
+    }
+    manifest_path.write_text(json.dumps(manifest, indent=2, sort_keys=True), encoding="utf-8")
+    return {"planned": len(jobs), "rendered": len(todo), "skipped": len(jobs) - len(todo), "removed": removed}
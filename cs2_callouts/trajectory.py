@@ -0,0 +1,369 @@
+from __future__ import annotations
+
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .labeling import (
+    DEFAULT_CHUNK_SIZE,
+    ChunkStats,
+    PositionChunk,
+    StreamSummary,
+    _chunk_xy,
+    iter_position_chunks,
+    open_chunk_writer,
+    resolve_xy_columns,
+)
+from .lookup import CalloutIndex
+
+# CS2 servers simulate 64 ticks per second
+TICKRATE = 64
+# Marks a player slot with no open visit
+_NO_VISIT = -2
+
+
+def _first_column(columns: Sequence[str], explicit: Optional[str], candidates: Sequence[str], what: str) -> str:
+    if explicit:
+        if explicit not in columns:
+            raise ValueError(f"Column {explicit!r} not in {list(columns)}")
+        return explicit
+    lower = {c.lower(): c for c in columns}
+    for name in candidates:
+        if name in lower:
+            return lower[name]
+    raise ValueError(f"Could not find a {what} column in {list(columns)}; pass it explicitly")
+
+
+def resolve_player_tick_columns(
+    columns: Sequence[str], player_col: Optional[str] = None, tick_col: Optional[str] = None
+) -> Tuple[str, str]:
+    """Pick the player and tick columns, preferring awpy's ``steamid`` and ``tick``."""
+    player = _first_column(columns, player_col, ("steamid", "player", "name"), "player")
+    tick = _first_column(columns, tick_col, ("tick",), "tick")
+    return player, tick
+
+
+@dataclass
+class Visits:
+    """Closed callout visits, column-oriented: one row per stay in one callout.
+
+    ``exit_tick`` is the tick the player was first seen in the next callout,
+    so consecutive visits tile the timeline. A visit ended by a gap in the
+    player's samples (death, disconnect, round reset) or by the end of the
+    stream exits on its last sampled tick instead. ``callout`` is -1 for
+    stretches outside every callout.
+    """
+
+    player: np.ndarray  # player keys as read (e.g. steamid)
+    callout: np.ndarray  # int32 callout ids, -1 outside every callout
+    enter_tick: np.ndarray  # int64
+    exit_tick: np.ndarray  # int64
+    samples: np.ndarray  # int64 position rows in the visit
+
+    def __len__(self) -> int:
+        return len(self.callout)
+
+    @property
+    def dwell_ticks(self) -> np.ndarray:
+        return self.exit_tick - self.enter_tick
+
+    @classmethod
+    def empty(cls) -> "Visits":
+        i64 = np.empty(0, dtype=np.int64)
+        return cls(np.empty(0, dtype=object), np.empty(0, dtype=np.int32), i64, i64.copy(), i64.copy())
+
+    def to_chunk(self, names: Sequence[str], missing: str = "") -> PositionChunk:
+        """As a table for ``open_chunk_writer``: player, callout name, ticks and sample count."""
+        lookup = np.asarray(list(names) + [missing], dtype=object)
+        return PositionChunk(
+            {
+                "player": self.player,
+                "callout": lookup[np.where(self.callout < 0, len(names), self.callout)],
+                "enter_tick": self.enter_tick,
+                "exit_tick": self.exit_tick,
+                "dwell_ticks": self.dwell_ticks,
+                "samples": self.samples,
+            }
+        )
+
+    def records(self, names: Sequence[str], missing: str = "") -> List[Dict]:
+        cols = self.to_chunk(names, missing).columns
+        keys = list(cols)
+        return [dict(zip(keys, row)) for row in zip(*(cols[k].tolist() for k in keys))]
+
+
+class VisitTracker:
+    """Turns per-tick callout ids into visits and aggregates dwell and transitions incrementally.
+
+    Feed it labelled samples chunk by chunk with ``update``; each call
+    returns the visits that closed within that chunk, and ``finish`` flushes
+    the visits still open at the end of the stream. Run-length encoding is
+    vectorized per chunk: samples are sorted by (player, tick), runs start
+    wherever the player, the callout or (with ``max_gap``) continuity
+    changes, and each player's last run is carried into the next chunk.
+    Samples of one player must arrive in tick order across chunks, as in an
+    awpy ticks export; order within a chunk does not matter.
+
+    Aggregates use slot ``len(names)`` for "outside every callout":
+    ``dwell_ticks`` and ``visit_counts`` per slot, and ``transitions[a, b]``
+    counting moves from slot ``a`` straight into slot ``b`` (moves across a
+    gap are not transitions).
+    """
+
+    def __init__(self, names: Sequence[str], max_gap: Optional[int] = None):
+        self.names = list(names)
+        self.max_gap = max_gap
+        slots = len(self.names) + 1
+        self.dwell_ticks = np.zeros(slots, dtype=np.int64)
+        self.visit_counts = np.zeros(slots, dtype=np.int64)
+        self.transitions = np.zeros((slots, slots), dtype=np.int64)
+        self.samples = 0
+        self._player_codes: Dict = {}
+        self._player_keys: List = []
+        # Open visit per player code
+        self._open_callout = np.empty(0, dtype=np.int32)
+        self._open_enter = np.empty(0, dtype=np.int64)
+        self._open_last = np.empty(0, dtype=np.int64)
+        self._open_samples = np.empty(0, dtype=np.int64)
+
+    @property
+    def players(self) -> List:
+        return list(self._player_keys)
+
+    def _codes(self, players: np.ndarray) -> np.ndarray:
+        keys, inverse = np.unique(players, return_inverse=True)
+        codes = np.empty(len(keys), dtype=np.int64)
+        for i, key in enumerate(keys.tolist()):
+            code = self._player_codes.get(key)
+            if code is None:
+                code = self._player_codes[key] = len(self._player_keys)
+                self._player_keys.append(key)
+            codes[i] = code
+        grow = len(self._player_keys) - len(self._open_callout)
+        if grow > 0:
+            self._open_callout = np.concatenate([self._open_callout, np.full(grow, _NO_VISIT, dtype=np.int32)])
+            self._open_enter = np.concatenate([self._open_enter, np.zeros(grow, dtype=np.int64)])
+            self._open_last = np.concatenate([self._open_last, np.zeros(grow, dtype=np.int64)])
+            self._open_samples = np.concatenate([self._open_samples, np.zeros(grow, dtype=np.int64)])
+        return codes[inverse.reshape(-1)]
+
+    def _gap(self, later: np.ndarray, earlier: np.ndarray) -> np.ndarray:
+        if self.max_gap is None:
+            return np.zeros(len(later), dtype=bool)
+        return (later - earlier) > self.max_gap
+
+    def _slots(self, callout: np.ndarray) -> np.ndarray:
+        return np.where(callout < 0, len(self.names), callout)
+
+    def _record(self, visits: Visits, to_callout: np.ndarray, moved: np.ndarray) -> None:
+        """Add closed visits to the aggregates; ``moved`` marks those followed directly by ``to_callout``."""
+        slots = len(self.names) + 1
+        src = self._slots(visits.callout)
+        self.dwell_ticks += np.bincount(src, weights=visits.dwell_ticks, minlength=slots).astype(np.int64)
+        self.visit_counts += np.bincount(src, minlength=slots)
+        pairs = src[moved] * slots + self._slots(to_callout[moved])
+        self.transitions += np.bincount(pairs, minlength=slots * slots).reshape(slots, slots)
+
+    def update(self, players, ticks, callout_ids) -> Visits:
+        """Consume one chunk of (player, tick, callout id) samples; returns the visits it closed."""
+        ids = np.asarray(callout_ids, dtype=np.int32)
+        if len(ids) == 0:
+            return Visits.empty()
+        codes = self._codes(np.asarray(players))
+        t = np.asarray(ticks, dtype=np.float64).astype(np.int64)
+        order = np.lexsort((t, codes))
+        p, t, c = codes[order], t[order], ids[order]
+        n = len(p)
+        self.samples += n
+
+        new_player = np.ones(n, dtype=bool)
+        new_player[1:] = p[1:] != p[:-1]
+        gap_before = np.zeros(n, dtype=bool)
+        gap_before[1:] = self._gap(t[1:], t[:-1])
+        brk = new_player.copy()
+        brk[1:] |= (c[1:] != c[:-1]) | gap_before[1:]
+        starts = np.flatnonzero(brk)
+        ends = np.append(starts[1:], n) - 1
+
+        run_p = p[starts]
+        run_c = c[starts]
+        run_enter = t[starts]
+        run_last = t[ends]
+        run_n = np.diff(np.append(starts, n))
+        run_gap_before = gap_before[starts]
+        first = new_player[starts]
+        last = np.append(run_p[1:] != run_p[:-1], True)
+
+        # A player's first run either extends the visit carried over from the previous chunk or closes it
+        fi = np.flatnonzero(first)
+        fp = run_p[fi]
+        open_c = self._open_callout[fp]
+        has_open = open_c != _NO_VISIT
+        open_gap = has_open & self._gap(run_enter[fi], self._open_last[fp])
+        merge = has_open & (open_c == run_c[fi]) & ~open_gap
+        run_enter[fi[merge]] = self._open_enter[fp[merge]]
+        run_n[fi[merge]] += self._open_samples[fp[merge]]
+        close = has_open & ~merge
+        cp = fp[close]
+        carried = Visits(
+            player=np.empty(len(cp), dtype=object),
+            callout=open_c[close],
+            enter_tick=self._open_enter[cp],
+            exit_tick=np.where(open_gap[close], self._open_last[cp], run_enter[fi[close]]),
+            samples=self._open_samples[cp],
+        )
+        self._record(carried, run_c[fi[close]], ~open_gap[close])
+
+        # Runs followed by another run of the same player close within this chunk
+        ci = np.flatnonzero(~last)
+        nxt = ci + 1
+        moved = ~run_gap_before[nxt]
+        closed = Visits(
+            player=np.empty(len(ci), dtype=object),
+            callout=run_c[ci],
+            enter_tick=run_enter[ci],
+            exit_tick=np.where(moved, run_enter[nxt], run_last[ci]),
+            samples=run_n[ci],
+        )
+        self._record(closed, run_c[nxt], moved)
+
+        li = np.flatnonzero(last)
+        lp = run_p[li]
+        self._open_callout[lp] = run_c[li]
+        self._open_enter[lp] = run_enter[li]
+        self._open_last[lp] = run_last[li]
+        self._open_samples[lp] = run_n[li]
+
+        out_codes = np.concatenate([cp, run_p[ci]])
+        out = Visits(
+            player=np.empty(0, dtype=object),
+            callout=np.concatenate([carried.callout, closed.callout]),
+            enter_tick=np.concatenate([carried.enter_tick, closed.enter_tick]),
+            exit_tick=np.concatenate([carried.exit_tick, closed.exit_tick]),
+            samples=np.concatenate([carried.samples, closed.samples]),
+        )
+        return self._ordered(out, out_codes)
+
+    def finish(self) -> Visits:
+        """Close every open visit at its last sampled tick and return them."""
+        codes = np.flatnonzero(self._open_callout != _NO_VISIT)
+        out = Visits(
+            player=np.empty(0, dtype=object),
+            callout=self._open_callout[codes],
+            enter_tick=self._open_enter[codes],
+            exit_tick=self._open_last[codes],
+            samples=self._open_samples[codes],
+        )
+        self._record(out, out.callout, np.zeros(len(codes), dtype=bool))
+        self._open_callout[codes] = _NO_VISIT
+        return self._ordered(out, codes)
+
+    def _ordered(self, visits: Visits, codes: np.ndarray) -> Visits:
+        order = np.lexsort((visits.enter_tick, codes))
+        keys = np.empty(len(self._player_keys), dtype=object)
+        keys[:] = self._player_keys
+        return Visits(
+            player=keys[codes[order]],
+            callout=visits.callout[order],
+            enter_tick=visits.enter_tick[order],
+            exit_tick=visits.exit_tick[order],
+            samples=visits.samples[order],
+        )
+
+    # -- summaries -----------------------------------------------------
+
+    def slot_names(self, missing: str = "") -> List[str]:
+        return self.names + [missing]
+
+    def dwell_table(self, tickrate: float = TICKRATE, missing: str = "") -> List[Dict]:
+        """Per-callout visits and total/mean dwell, longest total dwell first."""
+        rows = []
+        for name, ticks, visits in zip(self.slot_names(missing), self.dwell_ticks.tolist(), self.visit_counts.tolist()):
+            if visits:
+                rows.append({
+                    "callout": name,
+                    "visits": visits,
+                    "dwell_ticks": ticks,
+                    "dwell_s": round(ticks / tickrate, 3),
+                    "mean_dwell_s": round(ticks / tickrate / visits, 3),
+                })
+        return sorted(rows, key=lambda r: -r["dwell_ticks"])
+
+    def to_dict(self, tickrate: float = TICKRATE, missing: str = "") -> Dict:
+        """JSON-ready aggregates; the last entry of ``callouts`` is the outside slot."""
+        return {
+            "callouts": self.slot_names(missing),
+            "tickrate": tickrate,
+            "samples": int(self.samples),
+            "players": len(self._player_keys),
+            "dwell_ticks": self.dwell_ticks.tolist(),
+            "visit_counts": self.visit_counts.tolist(),
+            "transitions": self.transitions.tolist(),
+        }
+
+
+def stream_visits(
+    positions: str | Path,
+    index: CalloutIndex,
+    tracker: Optional[VisitTracker] = None,
+    out_path: str | Path | None = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    x_col: Optional[str] = None,
+    y_col: Optional[str] = None,
+    player_col: Optional[str] = None,
+    tick_col: Optional[str] = None,
+    max_gap: Optional[int] = None,
+    snap_distance: Optional[float] = None,
+    summary: Optional[StreamSummary] = None,
+) -> Iterator[Tuple[Visits, ChunkStats]]:
+    """Segment a position table into callout visits in one streaming pass.
+
+    Yields the visits closed by each chunk (the last item holds the visits
+    still open at the end) and, with ``out_path``, writes them as a table.
+    Pass a ``VisitTracker`` to read the dwell and transition aggregates
+    afterwards; one is created (with ``max_gap``) when omitted.
+    """
+    tracker = tracker or VisitTracker(index.names, max_gap=max_gap)
+    t_start = time.perf_counter()
+    writer = open_chunk_writer(out_path) if out_path else None
+    try:
+        chunks = iter_position_chunks(positions, chunk_size=chunk_size)
+        i = 0
+        while True:
+            t0 = time.perf_counter()
+            chunk = next(chunks, None)
+            t1 = time.perf_counter()
+            rows = 0
+            if chunk is None:
+                visits = tracker.finish()
+            else:
+                rows = len(chunk)
+                cols = list(chunk.columns)
+                xc, yc = resolve_xy_columns(cols, x_col, y_col)
+                pc, tc = resolve_player_tick_columns(cols, player_col, tick_col)
+                xy = _chunk_xy(chunk, xc, yc)
+                if snap_distance is None:
+                    ids = index.lookup(xy)
+                else:
+                    ids = index.nearest(xy, max_distance=snap_distance)[0]
+                visits = tracker.update(chunk.columns[pc], chunk.columns[tc], ids)
+            t2 = time.perf_counter()
+            if writer is not None and len(visits):
+                writer.write(visits.to_chunk(index.names))
+            t3 = time.perf_counter()
+            stats = ChunkStats(index=i, rows=rows, read_s=t1 - t0, label_s=t2 - t1, write_s=t3 - t2)
+            if summary is not None:
+                summary.chunks.append(stats)
+                summary.wall_s = time.perf_counter() - t_start
+            yield visits, stats
+            if chunk is None:
+                break
+            i += 1
+    finally:
+        if writer is not None:
+            writer.close()
+        if summary is not None:
+            summary.wall_s = time.perf_counter() - t_start
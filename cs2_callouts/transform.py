@@ -0,0 +1,162 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+# awpy radars are 1024x1024 and map-data.json positions are given for that size
+RADAR_SIZE = (1024, 1024)
+# map-data.json uses this value for maps without a lower radar
+NO_LOWER_LEVEL = -1000000.0
+
+UPPER = 0
+LOWER = 1
+
+
+def _as_points(points) -> np.ndarray:
+    pts = np.asarray(points, dtype=np.float64)
+    if pts.ndim == 1:
+        pts = pts[None, :]
+    if pts.ndim != 2 or pts.shape[1] < 2:
+        raise ValueError(f"Expected (N, 2) or (N, 3) points, got shape {pts.shape}")
+    return pts
+
+
+def _apply(m: np.ndarray, xy: np.ndarray) -> np.ndarray:
+    """Apply a 3x3 affine matrix to (N, 2+) points; extra columns are ignored."""
+    return xy[:, :2] @ m[:2, :2].T + m[:2, 2]
+
+
+def _about_center(m: np.ndarray, size: Tuple[int, int]) -> np.ndarray:
+    cx, cy = size[0] / 2.0, size[1] / 2.0
+    to_origin = np.array([[1.0, 0.0, -cx], [0.0, 1.0, -cy], [0.0, 0.0, 1.0]])
+    back = np.array([[1.0, 0.0, cx], [0.0, 1.0, cy], [0.0, 0.0, 1.0]])
+    return back @ m @ to_origin
+
+
+@dataclass(frozen=True, eq=False)
+class RadarTransform:
+    """World <-> radar pixel <-> normalized coordinates for one map, as 3x3 affine matrices.
+
+    The base mapping is awpy's ``px = (x - pos_x) / scale``,
+    ``py = (pos_y - y) / scale`` on a ``radar_size`` image. awpy itself ignores
+    ``rotate``/``zoom``; with ``apply_rotate`` a truthy ``rotate`` turns the
+    pixel frame 90 degrees clockwise about the image center, and with
+    ``apply_zoom`` pixels are scaled by ``zoom`` about the center, matching
+    radars exported with those overview settings. ``lower_level_max_units``
+    splits points by Z: at or below it they belong on the ``<map>_lower`` radar,
+    which shares the same pixel frame.
+    """
+
+    world_to_px: np.ndarray
+    px_to_world: np.ndarray
+    radar_size: Tuple[int, int] = RADAR_SIZE
+    lower_level_max_units: Optional[float] = None
+
+    @classmethod
+    def from_metadata(
+        cls,
+        map_metadata: Dict,
+        radar_size: Tuple[int, int] = RADAR_SIZE,
+        apply_rotate: bool = False,
+        apply_zoom: bool = False,
+    ) -> "RadarTransform":
+        scale = float(map_metadata["scale"])
+        pos_x = float(map_metadata["pos_x"])
+        pos_y = float(map_metadata["pos_y"])
+        m = np.array(
+            [[1.0 / scale, 0.0, -pos_x / scale], [0.0, -1.0 / scale, pos_y / scale], [0.0, 0.0, 1.0]]
+        )
+        # map-data.json positions are for RADAR_SIZE; rescale for other image sizes
+        m = np.diag([radar_size[0] / RADAR_SIZE[0], radar_size[1] / RADAR_SIZE[1], 1.0]) @ m
+        if apply_rotate and map_metadata.get("rotate"):
+            m = _about_center(np.array([[0.0, -1.0, 0.0], [1.0, 0.0, 0.0], [0.0, 0.0, 1.0]]), radar_size) @ m
+        zoom = map_metadata.get("zoom")
+        if apply_zoom and zoom:
+            m = _about_center(np.diag([float(zoom), float(zoom), 1.0]), radar_size) @ m
+        lower = map_metadata.get("lower_level_max_units")
+        if lower is not None and float(lower) <= NO_LOWER_LEVEL:
+            lower = None
+        return cls(
+            world_to_px=m,
+            px_to_world=np.linalg.inv(m),
+            radar_size=(int(radar_size[0]), int(radar_size[1])),
+            lower_level_max_units=None if lower is None else float(lower),
+        )
+
+    def scaled(self, factor: float) -> "RadarTransform":
+        """Same mapping onto a radar resized by ``factor`` (e.g. a cached downsampled variant)."""
+        s = np.diag([factor, factor, 1.0])
+        m = s @ self.world_to_px
+        size = (int(round(self.radar_size[0] * factor)), int(round(self.radar_size[1] * factor)))
+        return RadarTransform(m, np.linalg.inv(m), size, self.lower_level_max_units)
+
+    # -- forward -------------------------------------------------------
+
+    def to_pixel(self, points) -> np.ndarray:
+        """World (N, 2)/(N, 3) to radar pixels (N, 2); Z is ignored."""
+        return _apply(self.world_to_px, _as_points(points))
+
+    def to_normalized(self, points) -> np.ndarray:
+        """World to [0, 1] radar coordinates (origin top-left)."""
+        return self.pixel_to_normalized(self.to_pixel(points))
+
+    def pixel_to_normalized(self, pixels) -> np.ndarray:
+        return _as_points(pixels)[:, :2] / np.asarray(self.radar_size, dtype=np.float64)
+
+    # -- inverse -------------------------------------------------------
+
+    def to_world(self, pixels, z=None) -> np.ndarray:
+        """Radar pixels back to world XY, or XYZ when ``z`` (scalar or (N,)) is given."""
+        xy = _apply(self.px_to_world, _as_points(pixels))
+        if z is None:
+            return xy
+        return np.column_stack([xy, np.broadcast_to(np.asarray(z, dtype=np.float64), (len(xy),))])
+
+    def normalized_to_pixel(self, uv) -> np.ndarray:
+        return _as_points(uv)[:, :2] * np.asarray(self.radar_size, dtype=np.float64)
+
+    def from_normalized(self, uv, z=None) -> np.ndarray:
+        return self.to_world(self.normalized_to_pixel(uv), z=z)
+
+    # -- levels --------------------------------------------------------
+
+    @property
+    def has_lower_level(self) -> bool:
+        return self.lower_level_max_units is not None
+
+    def level(self, points) -> np.ndarray:
+        """UPPER/LOWER per point from its Z (needs (N, 3)); all UPPER on single-level maps."""
+        pts = _as_points(points)
+        out = np.zeros(len(pts), dtype=np.int8)
+        if self.has_lower_level:
+            if pts.shape[1] < 3:
+                raise ValueError("Level split needs (N, 3) points with Z")
+            out[pts[:, 2] <= self.lower_level_max_units] = LOWER
+        return out
+
+    def split_levels(self, points) -> Tuple[np.ndarray, np.ndarray]:
+        """Indices of points on the upper and on the lower radar."""
+        lvl = self.level(points)
+        return np.flatnonzero(lvl == UPPER), np.flatnonzero(lvl == LOWER)
+
+
+def _metadata_key(map_metadata: Dict) -> Tuple:
+    return tuple(sorted((k, v) for k, v in map_metadata.items() if isinstance(v, (int, float, str, type(None)))))
+
+
+@lru_cache(maxsize=64)
+def _cached_transform(key: Tuple, radar_size: Tuple[int, int], apply_rotate: bool, apply_zoom: bool) -> RadarTransform:
+    return RadarTransform.from_metadata(dict(key), radar_size=radar_size, apply_rotate=apply_rotate, apply_zoom=apply_zoom)
+
+
+def transform_for(
+    map_metadata: Dict,
+    radar_size: Tuple[int, int] = RADAR_SIZE,
+    apply_rotate: bool = False,
+    apply_zoom: bool = False,
+) -> RadarTransform:
+    """Per-map RadarTransform, built once per distinct metadata entry and reused."""
+    return _cached_transform(_metadata_key(map_metadata), tuple(radar_size), apply_rotate, apply_zoom)
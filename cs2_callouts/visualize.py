@@ -1,89 +1,57 @@
 from __future__ import annotations
 
 from pathlib import Path
-from typing import Dict, List, Tuple
-
-import json
-import math
 
 import click
-import matplotlib.pyplot as plt
-from matplotlib.patches import Polygon as MplPolygon
-
-
-def _load_output(path: str | Path) -> Dict:
-    p = Path(path)
-    return json.loads(p.read_text(encoding="utf-8-sig"))
-
-
-def _centroid(poly: List[List[float]]) -> Tuple[float, float]:
-    if not poly:
-        return (0.0, 0.0)
-    x = [pt[0] for pt in poly]
-    y = [pt[1] for pt in poly]
-    return (sum(x) / len(x), sum(y) / len(y))
-
-
-def _color_for_name(name: str) -> Tuple[float, float, float]:
-    # Deterministic pastel
-    h = abs(hash(name)) % 360
-    s = 0.5
-    v = 0.95
-    c = v * s
-    x = c * (1 - abs(((h / 60) % 2) - 1))
-    m = v - c
-    if   0 <= h < 60:  r,g,b = c,x,0
-    elif 60 <= h <120: r,g,b = x,c,0
-    elif 120<= h<180: r,g,b = 0,c,x
-    elif 180<= h<240: r,g,b = 0,x,c
-    elif 240<= h<300: r,g,b = x,0, c
-    else:             r,g,b = c,0, x
-    return (r+m, g+m, b+m)
 
 
 @click.command()
 @click.option("--json", "json_path", required=True, type=click.Path(exists=True), help="Path to <map>_callouts.json produced by the pipeline.")
 @click.option("--radar", default=None, type=click.Path(exists=True), help="Optional radar image to draw underneath; mapped to world bounds.")
+@click.option("--map-data", default=None, type=click.Path(exists=True), help="map-data.json placing the radar at its world position (default: searched like the CLI).")
 @click.option("--out", "out_path", default=None, type=click.Path(), help="Output image path (PNG). If omitted, shows an interactive window.")
 @click.option("--labels/--no-labels", default=True, show_default=True, help="Draw callout names at polygon centroids.")
 @click.option("--invert-y/--no-invert-y", default=False, show_default=True, help="Invert Y axis to match image pixel coordinates if needed.")
 @click.option("--alpha", default=0.35, show_default=True, help="Polygon fill alpha.")
 @click.option("--linewidth", default=1.0, show_default=True, help="Polygon edge line width.")
-def main(json_path: str, radar: str | None, out_path: str | None, labels: bool, invert_y: bool, alpha: float, linewidth: float):
-    data = _load_output(json_path)
+@click.option("--cache-dir", default=None, type=click.Path(file_okay=False), help="Asset cache for decoded radars (default: .cache/cs2_callouts).")
+def main(json_path: str, radar: str | None, map_data: str | None, out_path: str | None, labels: bool, invert_y: bool, alpha: float, linewidth: float, cache_dir: str | None):
+    from .assets import get_asset_cache
+    from .render import callout_polygons, draw_callouts, flatten_polygons, load_output, use_noninteractive_backend
+    if out_path:
+        use_noninteractive_backend()
+    import matplotlib.pyplot as plt
+
+    data = load_output(json_path)
     items = data.get("callouts", [])
-    polys = [it.get("polygon_2d") or [] for it in items]
+    polys = callout_polygons(items)
+    names = [it.get("name") or it.get("placename") or "?" for it in items]
+    vertices, offsets = flatten_polygons(polys)
 
     # Compute world bounds from polygons or bbox entries
-    xs: List[float] = []
-    ys: List[float] = []
-    for poly in polys:
-        for x, y in poly:
-            xs.append(float(x))
-            ys.append(float(y))
-    if not xs or not ys:
+    if len(vertices) == 0:
         click.echo("No polygon data to visualize.", err=True)
         raise SystemExit(1)
-    min_x, max_x = min(xs), max(xs)
-    min_y, max_y = min(ys), max(ys)
+    min_x, min_y = vertices.min(axis=0).tolist()
+    max_x, max_y = vertices.max(axis=0).tolist()
 
     fig, ax = plt.subplots(figsize=(8, 8))
 
     if radar:
-        img = plt.imread(radar)
-        ax.imshow(img, extent=[min_x, max_x, min_y, max_y], interpolation="bilinear")
-
-    for it in items:
-        poly = it.get("polygon_2d") or []
-        if len(poly) < 3:
-            continue
-        name = it.get("name") or it.get("placename") or "?"
-        color = _color_for_name(name)
-        patch = MplPolygon(poly, closed=True, facecolor=color + (alpha,), edgecolor=color, linewidth=linewidth)
-        ax.add_patch(patch)
-        if labels:
-            cx, cy = _centroid(poly)
-            ax.text(cx, cy, name, fontsize=7, color="black", ha="center", va="center", bbox=dict(boxstyle="round,pad=0.1", fc="white", ec="none", alpha=0.6))
+        cache = get_asset_cache(cache_dir)
+        img = cache.radar_array(radar)
+        extent = [min_x, max_x, min_y, max_y]
+        map_metadata = cache.map_metadata(Path(json_path).stem.replace("_callouts", ""), map_data)
+        if map_metadata:
+            from .transform import transform_for
+
+            # The radar's world rectangle: pixel (0, 0) is its top-left corner
+            h, w = img.shape[:2]
+            (left, top), (right, bottom) = transform_for(map_metadata, (w, h)).to_world([[0, 0], [w, h]]).tolist()
+            extent = [left, right, bottom, top]
+        ax.imshow(img, extent=extent, interpolation="bilinear")
+
+    draw_callouts(ax, vertices, offsets, names, alpha=alpha, linewidth=linewidth, labels=labels, min_vertices=3)
 
     ax.set_xlim(min_x, max_x)
     ax.set_ylim(min_y, max_y)
@@ -0,0 +1,52 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+MAP_DATA = ROOT / "map-data.json"
+
+
+def square(x0: float, y0: float, size: float):
+    return [[x0, y0], [x0 + size, y0], [x0 + size, y0 + size], [x0, y0 + size]]
+
+
+def callouts_payload(polygons, z_range=(-100.0, 100.0)):
+    """A minimal ``process_callouts`` payload with one callout per ``(name, polygon)``."""
+    return {
+        "rotation_order": "rz_rx_ry",
+        "count": len(polygons),
+        "callouts": [
+            {
+                "name": name,
+                "model": f"models/callouts/{name.lower()}.vmdl",
+                "polygon_2d": [[float(x), float(y)] for x, y in poly],
+                "z_min": z_range[0],
+                "z_max": z_range[1],
+            }
+            for name, poly in polygons
+        ],
+    }
+
+
+@pytest.fixture
+def row_payload():
+    """Three 100-unit squares along X: A and B share an edge, C stands 50 units apart."""
+    return callouts_payload([("A", square(0, 0, 100)), ("B", square(100, 0, 100)), ("C", square(250, 0, 100))])
+
+
+@pytest.fixture
+def callouts_json(tmp_path, row_payload):
+    path = tmp_path / "de_test_callouts.json"
+    path.write_text(json.dumps(row_payload), encoding="utf-8")
+    return path
+
+
+@pytest.fixture(scope="session")
+def synthetic_map(tmp_path_factory):
+    """A few GLB models and a ``callouts_found.json`` using them (see ``benchmarks.synthetic``)."""
+    from benchmarks import synthetic
+
+    return synthetic.write_map(tmp_path_factory.mktemp("synthetic"), callouts=12, models=4, vertices=300, seed=1)
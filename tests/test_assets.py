@@ -0,0 +1,66 @@
+import json
+import os
+
+import numpy as np
+from PIL import Image
+
+from cs2_callouts.assets import MIN_VARIANT_SIZE, AssetCache
+
+from .conftest import MAP_DATA
+
+
+def _radar(path, size=512):
+    rng = np.random.default_rng(0)
+    pixels = rng.integers(0, 256, size=(size, size, 4), dtype=np.uint8)
+    Image.fromarray(pixels, "RGBA").save(path)
+    return pixels
+
+
+def test_radar_round_trip_and_variants(tmp_path):
+    pixels = _radar(tmp_path / "radar.png")
+    cache = AssetCache(tmp_path / "cache")
+    np.testing.assert_array_equal(cache.radar_array(tmp_path / "radar.png"), pixels)
+    levels = cache.radar_levels(tmp_path / "radar.png")
+    assert levels[0] == (512, 512)
+    assert levels[-1][0] >= MIN_VARIANT_SIZE and levels[-1][0] // 2 < MIN_VARIANT_SIZE
+    image, factor = cache.radar_image(tmp_path / "radar.png", min_size=200)
+    assert image.size == (256, 256) and factor == 0.5
+
+
+def test_changed_radar_is_decoded_again(tmp_path):
+    path = tmp_path / "radar.png"
+    _radar(path)
+    AssetCache(tmp_path / "cache").radar_array(path)
+    Image.new("RGBA", (256, 256), (1, 2, 3, 255)).save(path)
+    os.utime(path, ns=(1, 1))
+    arr = AssetCache(tmp_path / "cache").radar_array(path)
+    assert arr.shape == (256, 256, 4) and tuple(arr[0, 0]) == (1, 2, 3, 255)
+
+
+def test_map_metadata_matches_source(tmp_path):
+    cache = AssetCache(tmp_path / "cache")
+    expected = json.loads(MAP_DATA.read_text(encoding="utf-8-sig"))["de_mirage"]
+    assert cache.map_metadata("de_mirage", MAP_DATA) == expected
+    assert cache.map_metadata("de_does_not_exist", MAP_DATA) is None
+    # A fresh cache reads the per-map index written by the first one
+    assert AssetCache(tmp_path / "cache").map_metadata("de_mirage", MAP_DATA) == expected
+
+
+def test_visualize_places_the_radar_from_cached_map_data(tmp_path, row_payload, monkeypatch):
+    import matplotlib.axes
+    from click.testing import CliRunner
+
+    from cs2_callouts.visualize import main
+
+    callouts = tmp_path / "de_mirage_callouts.json"
+    callouts.write_text(json.dumps(row_payload), encoding="utf-8")
+    _radar(tmp_path / "radar.png")
+    extents = []
+    imshow = matplotlib.axes.Axes.imshow
+    monkeypatch.setattr(matplotlib.axes.Axes, "imshow", lambda ax, img, **kw: extents.append(kw["extent"]) or imshow(ax, img, **kw))
+    args = ["--json", str(callouts), "--radar", str(tmp_path / "radar.png"), "--out", str(tmp_path / "out.png"),
+            "--cache-dir", str(tmp_path / "cache"), "--no-labels"]
+    result = CliRunner().invoke(main, args + ["--map-data", str(MAP_DATA)])
+    assert result.exit_code == 0, result.output
+    assert extents[-1] == [-3230.0, 1890.0, -3407.0, 1713.0]
+    assert list((tmp_path / "cache" / "map-data").glob("*/de_mirage.json"))
@@ -0,0 +1,76 @@
+import json
+
+import pytest
+
+from benchmarks import bench
+
+
+def test_every_case_is_registered():
+    assert set(bench.GATED) <= set(bench.CASES)
+    assert bench._select(None) == list(bench.CASES)
+    assert bench._select("lookup_index, convex_hull") == ["lookup_index", "convex_hull"]
+
+
+def test_summarize_known_answer():
+    r = bench.summarize([0.4, 0.1, 0.2, 0.3], items=100, unit="points")
+    assert r["median_s"] == 0.25 and r["q1_s"] == 0.175 and r["q3_s"] == 0.325
+    assert r["iqr_s"] == 0.15 and r["min_s"] == 0.1 and r["items_per_s"] == 400.0
+    assert r["samples_s"] == [0.4, 0.1, 0.2, 0.3]
+
+
+def test_run_suite_writes_a_json_report(tmp_path):
+    params = {"hulls": 2, "hull_points": 50, "lookup_callouts": 5, "positions": 100}
+    lines = []
+    bench.SCALES["tiny"] = params
+    try:
+        report = bench.run_suite(["convex_hull", "lookup_index"], "tiny", 2, tmp_path, echo=lines.append)
+    finally:
+        del bench.SCALES["tiny"]
+    assert list(report["results"]) == ["convex_hull", "lookup_index"] and len(lines) == 2
+    assert report["meta"]["params"] == params and report["meta"]["repeat"] == 2
+    lookup = report["results"]["lookup_index"]
+    assert lookup["items"] == 100 and lookup["unit"] == "points" and len(lookup["samples_s"]) == 2
+    json.dumps(report)
+
+
+def _results(**medians):
+    return {"results": {name: {"median_s": m, "iqr_s": iqr} for name, (m, iqr) in medians.items()}}
+
+
+def test_compare_flags_gated_regressions_only():
+    base = _results(convex_hull=(1.0, 0.01), glb_load=(1.0, 0.01), lookup_index=(1.0, 0.01), render_pillow=(1.0, 0.01))
+    cur = _results(convex_hull=(1.5, 0.01), glb_load=(1.5, 0.01), lookup_index=(0.5, 0.01), apply_srt=(1.0, 0.0))
+    rows, failed = bench.compare_results(base, cur, threshold=0.2, iqr_factor=2.0)
+    status = {r["case"]: r["status"] for r in rows}
+    assert failed
+    assert status == {
+        "convex_hull": "REGRESSION",
+        "glb_load": "slower",
+        "lookup_index": "faster",
+        "apply_srt": "new",
+        "render_pillow": "missing",
+    }
+    assert rows[0]["change"] == pytest.approx(0.5) and rows[0]["noise"] == pytest.approx(0.02)
+
+
+def test_compare_allows_slowdowns_within_noise():
+    base = _results(convex_hull=(1.0, 0.2))
+    rows, failed = bench.compare_results(base, _results(convex_hull=(1.3, 0.1)), threshold=0.2, iqr_factor=2.0)
+    assert not failed and rows[0]["status"] == "ok"
+    rows, failed = bench.compare_results(base, _results(convex_hull=(1.3, 0.1)), threshold=0.2, iqr_factor=1.0)
+    assert failed and rows[0]["status"] == "REGRESSION"
+
+
+def test_format_comparison():
+    rows, _ = bench.compare_results(_results(convex_hull=(0.01, 0.0)), _results(convex_hull=(0.01, 0.0), glb_load=(0.002, 0.0)))
+    lines = bench.format_comparison(rows)
+    assert len(lines) == 3 and lines[0].startswith("case")
+    assert lines[1].split() == ["convex_hull", "10.00", "10.00", "+0.0%", "0.0%", "ok"]
+    assert lines[2].split() == ["glb_load", "-", "2.00", "-", "-", "new", "(not", "gated)"]
+
+
+def test_committed_baseline_covers_every_case():
+    baseline = json.loads(bench.DEFAULT_BASELINE.read_text())
+    assert set(baseline["results"]) == set(bench.CASES)
+    rows, failed = bench.compare_results(baseline, baseline)
+    assert not failed and {r["status"] for r in rows} == {"ok"}
@@ -0,0 +1,17 @@
+import pytest
+from click.testing import CliRunner
+
+from benchmarks.import_time import ENTRY_MODULES, measure
+from cs2_callouts.cli import cli
+
+
+@pytest.mark.parametrize("module", ENTRY_MODULES)
+def test_entry_points_import_no_heavy_modules(module):
+    assert measure(module)["heavy"] == []
+
+
+def test_help_lists_commands_without_loading_them():
+    result = CliRunner().invoke(cli, ["--help"])
+    assert result.exit_code == 0
+    for command in ("process", "visualize", "label", "serve"):
+        assert command in result.output
@@ -0,0 +1,95 @@
+import json
+
+import numpy as np
+import pytest
+
+from cs2_callouts.compact import (
+    DEFAULT_STEP,
+    compact_path_for,
+    decode_compact,
+    encode_compact,
+    load_compact,
+    size_report,
+    write_compact,
+)
+from cs2_callouts.geometry import polygon_deviation
+from cs2_callouts.lookup import CalloutIndex
+
+from .conftest import MAP_DATA
+
+MIRAGE = json.loads(MAP_DATA.read_text())["de_mirage"]
+
+
+@pytest.fixture
+def payload():
+    rng = np.random.default_rng(0)
+    callouts = []
+    for i in range(6):
+        ring = rng.uniform(-2000, 1000, size=(8, 2)) + [0.123, -0.456]
+        callouts.append({"name": f"C{i % 4}", "model": f"models/m{i % 2}.vmdl", "polygon_2d": ring.tolist(),
+                         "z_min": -10.4, "z_max": 20.6})
+    callouts.append({"name": "Empty", "model": "models/m0.vmdl", "polygon_2d": [], "z_min": 0.0, "z_max": 0.0})
+    return {"rotation_order": "rz_rx_ry", "count": len(callouts), "callouts": callouts}
+
+
+@pytest.mark.parametrize("space", ["world", "radar"])
+def test_round_trip_within_the_grid_step(payload, space):
+    doc = encode_compact(payload, space=space, map_metadata=MIRAGE)
+    back = decode_compact(json.loads(json.dumps(doc)))
+    assert back["rotation_order"] == "rz_rx_ry" and back["count"] == 7
+    # Half a grid step per axis, in world units (a radar pixel is ``scale`` units)
+    half = DEFAULT_STEP[space] * (MIRAGE["scale"] if space == "radar" else 1.0) / 2 + 1e-9
+    for a, b in zip(payload["callouts"], back["callouts"]):
+        assert (b["name"], b["model"]) == (a["name"], a["model"])
+        assert (b["z_min"], b["z_max"]) == ((0.0, 0.0) if a["name"] == "Empty" else (-11.0, 21.0))
+        pa, pb = np.asarray(a["polygon_2d"]).reshape(-1, 2), np.asarray(b["polygon_2d"]).reshape(-1, 2)
+        assert len(pa) == len(pb)
+        if len(pa):
+            assert np.abs(pa - pb).max() <= half
+            assert polygon_deviation(pa, pb) <= half * np.sqrt(2)
+            assert b["bbox_2d"]["min_x"] == pb[:, 0].min() and b["bbox_2d"]["max_y"] == pb[:, 1].max()
+    assert doc["names"] == ["C0", "C1", "C2", "C3", "Empty"] and doc["models"] == ["models/m0.vmdl", "models/m1.vmdl"]
+
+
+def test_snapped_duplicates_are_dropped():
+    ring = [[0.0, 0.0], [0.2, 0.1], [10.0, 0.0], [10.0, 10.0], [0.1, 0.0]]
+    doc = encode_compact({"callouts": [{"name": "A", "model": "m", "polygon_2d": ring}]}, step=1.0)
+    assert doc["rings"] == [[0, 0, 10, 0, 0, 10]]
+    assert decode_compact(doc)["callouts"][0]["polygon_2d"] == [[0.0, 0.0], [10.0, 0.0], [10.0, 10.0]]
+
+
+def test_missing_z_range_round_trips_as_absent():
+    ring = [[0.0, 0.0], [10.0, 0.0], [10.0, 10.0]]
+    data = {"callouts": [{"name": "A", "model": "m", "polygon_2d": ring},
+                         {"name": "B", "model": "m", "polygon_2d": ring, "z_min": None, "z_max": None}]}
+    doc = encode_compact(data)
+    assert doc["z"] == [None, None, None, None]
+    back = decode_compact(json.loads(json.dumps(doc)))["callouts"]
+    assert all("z_min" not in c and "z_max" not in c for c in back)
+    assert CalloutIndex.from_output({"callouts": back}).zspans is None
+
+
+def test_write_load_and_size_report(tmp_path, payload):
+    src = tmp_path / "de_mirage_callouts.json"
+    assert compact_path_for(src) == tmp_path / "de_mirage_callouts.compact.json"
+    doc = encode_compact(payload)
+    path = write_compact(doc, compact_path_for(src))
+    assert load_compact(path) == decode_compact(doc)
+    report = size_report(payload, doc, repeat=1)
+    assert report["callouts"] == 7 and report["max_error"] <= np.sqrt(2) / 2
+    assert report["sizes"]["compact"]["bytes"] < report["sizes"]["minified"]["bytes"] < report["sizes"]["pretty"]["bytes"]
+    assert report["size_reduction"] > 0
+
+
+def test_bad_documents_and_arguments(payload):
+    doc = encode_compact(payload)
+    with pytest.raises(ValueError, match="Not a"):
+        decode_compact(dict(doc, format="geojson"))
+    with pytest.raises(ValueError, match="version"):
+        decode_compact(dict(doc, version=99))
+    with pytest.raises(ValueError, match="Unknown space"):
+        encode_compact(payload, space="tile")
+    with pytest.raises(ValueError, match="positive"):
+        encode_compact(payload, step=0)
+    with pytest.raises(ValueError, match="metadata"):
+        encode_compact(payload, space="radar")
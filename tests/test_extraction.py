@@ -0,0 +1,33 @@
+import os
+
+import pytest
+
+from benchmarks import fake_vrf, synthetic
+from benchmarks.extraction import run_extraction
+
+pytestmark = pytest.mark.skipif(os.name == "nt", reason="the stub launcher is a shell script")
+
+
+@pytest.fixture(scope="module")
+def fixture(tmp_path_factory):
+    return synthetic.write_vpk_fixture(tmp_path_factory.mktemp("vpk"), callouts=8, models=3, vertices=50, lumps=2)
+
+
+def test_extraction_against_the_stub(tmp_path, fixture):
+    cli = fake_vrf.install_stub(tmp_path / "vrf-cli")
+    r = run_extraction(cli, fixture, tmp_path / "export", latency=0.0)
+    assert r["callouts"] == 8
+    assert r["models_exported"] == 3 and r["models_missing"] == 0
+    assert r["subprocesses"] == sum(r["subprocesses_by_kind"].values()) > 0
+    assert 0.0 <= r["idle_fraction"] <= 1.0
+    assert r["wall_s"] == pytest.approx(r["idle_s"] + r["python_s"], abs=1e-5)
+    assert os.environ.get(fake_vrf.LATENCY_ENV) is None
+    glbs = sorted(p.name for p in (tmp_path / "export" / "models").rglob("*.glb"))
+    assert glbs == ["m0.glb", "m1.glb", "m2.glb"]
+
+
+def test_stub_lists_and_rejects_missing_entries(fixture, capsys):
+    assert fake_vrf.main(["-i", str(fixture.vpk_paths[1]), "--vpk_list"]) == 0
+    listed = capsys.readouterr().out.split()
+    assert f"maps/{fixture.map_name}.vmap_c" in listed and len(listed) == 1 + 2 + 3
+    assert fake_vrf.main(["-i", str(fixture.vpk_paths[0]), "--vpk_filepath", "models/nope.vmdl_c", "-o", "."]) == 1
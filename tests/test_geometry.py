@@ -0,0 +1,44 @@
+import numpy as np
+import pytest
+
+from cs2_callouts.geometry import apply_srt, polygon_deviation, to_xy
+
+SQUARE = np.array([[0.0, 0.0], [10.0, 0.0], [10.0, 10.0], [0.0, 10.0]])
+
+
+def test_apply_srt_known_answer():
+    v = np.array([[1.0, 0.0, 0.0], [0.0, 1.0, 0.0]])
+    out = apply_srt(v, [2.0, 2.0, 2.0], [0.0, 90.0, 0.0], [100.0, 0.0, 5.0])
+    np.testing.assert_allclose(out, [[100.0, 2.0, 5.0], [98.0, 0.0, 5.0]], atol=1e-12)
+    assert out.dtype == np.float64
+
+
+def test_apply_srt_float32_matches_float64():
+    rng = np.random.default_rng(0)
+    v = rng.uniform(-200, 200, size=(1000, 3)).astype(np.float32)
+    args = ([1.5, 0.75, 2.0], [12.5, -47.0, 3.25], [-2400.0, 1300.0, -160.0])
+    single = apply_srt(v, *args)
+    double = apply_srt(v, *args, dtype=np.float64)
+    assert single.dtype == np.float32 and double.dtype == np.float64
+    np.testing.assert_allclose(single, double, atol=1e-3)
+
+
+def test_polygon_deviation():
+    assert polygon_deviation(SQUARE, SQUARE + [1.0, 0.0]) == pytest.approx(1.0)
+    # A collinear vertex kept by one hull only does not count
+    with_mid = np.insert(SQUARE, 1, [5.0, 0.0], axis=0)
+    assert polygon_deviation(SQUARE, with_mid) == 0.0
+    assert polygon_deviation(SQUARE, SQUARE[::-1]) == 0.0
+    assert polygon_deviation(np.empty((0, 2)), np.empty((0, 2))) == 0.0
+    assert polygon_deviation(SQUARE, np.empty((0, 2))) == float("inf")
+
+
+def test_to_xy_converts_only_two_columns():
+    v64 = np.arange(12, dtype=np.float64).reshape(4, 3)
+    xy = to_xy(v64)
+    assert xy.shape == (4, 2) and np.shares_memory(xy, v64)
+    v32 = v64.astype(np.float32)
+    xy32 = to_xy(v32)
+    assert xy32.dtype == np.float64 and xy32.shape == (4, 2)
+    assert xy32.base is None or xy32.base.shape == (4, 2)
+    np.testing.assert_array_equal(xy32, v64[:, :2])
@@ -0,0 +1,56 @@
+import numpy as np
+import pytest
+
+from cs2_callouts.graph import CalloutGraph, all_pairs_routes, build_graph_file, callout_adjacency, graph_path_for
+from cs2_callouts.lookup import CalloutIndex
+
+from .conftest import callouts_payload, square
+
+
+def test_adjacency_touching_overlapping_and_gaps(row_payload):
+    index = CalloutIndex.from_output(row_payload)
+    pairs, gaps = callout_adjacency(index, tolerance=16)
+    assert pairs.tolist() == [[0, 1]] and gaps.tolist() == [0.0]
+    pairs, gaps = callout_adjacency(index, tolerance=60)
+    assert pairs.tolist() == [[0, 1], [1, 2]]
+    np.testing.assert_allclose(gaps, [0, 50])
+    overlapping = CalloutIndex.from_polygons(["Site", "Box"], [square(0, 0, 100), square(40, 40, 10)])
+    assert callout_adjacency(overlapping)[0].tolist() == [[0, 1]]
+
+
+def test_all_pairs_routes_known_answer():
+    inf = np.inf
+    w = np.array([[inf, 1, 5], [1, inf, 1], [5, 1, inf]])
+    dist, nxt = all_pairs_routes(w)
+    np.testing.assert_allclose(dist, [[0, 1, 2], [1, 0, 1], [2, 1, 0]])
+    assert nxt[0, 2] == 1 and nxt[2, 0] == 1
+
+
+def test_routes_and_distances(row_payload):
+    graph = CalloutGraph.build(CalloutIndex.from_output(row_payload), tolerance=60)
+    assert graph.route("A", "C") == ["A", "B", "C"]
+    assert graph.route(2, 0) == ["C", "B", "A"]
+    assert graph.distance("A", "C") == pytest.approx(100 + 150)
+    assert graph.neighbours("B") == ["A", "C"]
+    near = CalloutGraph.build(CalloutIndex.from_output(row_payload))
+    assert near.route("A", "C") == [] and near.distance("A", "C") == np.inf
+    with pytest.raises(KeyError):
+        near.route("A", "Nowhere")
+
+
+def test_shared_names_use_the_closest_volume():
+    payload = callouts_payload([("Mid", square(0, 0, 100)), ("Short", square(100, 0, 100)), ("Mid", square(200, 0, 100))])
+    graph = CalloutGraph.build(CalloutIndex.from_output(payload))
+    assert graph.route("Short", "Mid") == ["Short", "Mid"]
+    assert graph.distance("Short", "Mid") == pytest.approx(100)
+
+
+def test_save_load_round_trip(callouts_json):
+    graph, path = build_graph_file(callouts_json, tolerance=60)
+    assert path == graph_path_for(callouts_json) and path.name == "de_test_graph.json"
+    loaded = CalloutGraph.load(path)
+    assert loaded.names == graph.names and loaded.tolerance == 60
+    np.testing.assert_array_equal(loaded.edges, graph.edges)
+    np.testing.assert_array_equal(loaded.next_hop, graph.next_hop)
+    np.testing.assert_allclose(loaded.dist, graph.dist)
+    assert loaded.route("A", "C") == graph.route("A", "C")
@@ -0,0 +1,97 @@
+import json
+
+import numpy as np
+import pytest
+
+from cs2_callouts.heatmap import OUTSIDE, HeatmapAccumulator, accumulate_positions, heatmap_path_for
+from cs2_callouts.labeling import StreamSummary
+from cs2_callouts.lookup import CalloutIndex
+from cs2_callouts.transform import LOWER, UPPER, transform_for
+
+from .conftest import MAP_DATA
+
+MAPS = json.loads(MAP_DATA.read_text())
+
+
+@pytest.fixture
+def index(row_payload):
+    return CalloutIndex.from_output(row_payload)
+
+
+@pytest.fixture
+def points():
+    rng = np.random.default_rng(0)
+    on = rng.uniform([-100, -50], [400, 150], size=(5000, 2))
+    return np.vstack([on, [[-5000.0, 0.0], [0.0, 9000.0]]])
+
+
+def test_grid_matches_histogram2d(index, points):
+    acc = HeatmapAccumulator(index.names, MAPS["de_mirage"])
+    acc.add(points, index.lookup(points))
+    assert acc.shape == (1, 256, 256) and acc.rows == 5002 and acc.off_radar == 2
+    px = transform_for(MAPS["de_mirage"]).to_pixel(points[:-2])
+    expected, _, _ = np.histogram2d(px[:, 1], px[:, 0], bins=256, range=[[0, 1024], [0, 1024]])
+    np.testing.assert_array_equal(acc.grid(), expected)
+    per_callout = sum(acc.grid(name) for name in index.names) + acc.grid(OUTSIDE)
+    np.testing.assert_array_equal(per_callout, acc.grid())
+    ids = index.lookup(points)
+    totals = {r["callout"]: r["count"] for r in acc.callout_totals()}
+    assert totals == {OUTSIDE: int((ids < 0).sum()), **{n: int((ids == i).sum()) for i, n in enumerate(index.names)}}
+    assert acc.grid("B").sum() == acc.grid(1).sum() == totals["B"]
+    with pytest.raises(KeyError):
+        acc.grid("Nowhere")
+    with pytest.raises(ValueError, match="lower"):
+        acc.grid(level=LOWER)
+
+
+def test_merge_save_and_load(tmp_path, index, points):
+    ids = index.lookup(points)
+    whole = HeatmapAccumulator(index.names, MAPS["de_mirage"])
+    whole.add(points, ids)
+    first, second = HeatmapAccumulator(index.names, MAPS["de_mirage"]), HeatmapAccumulator(index.names, MAPS["de_mirage"])
+    first.add(points[:2000], ids[:2000])
+    second.add(points[2000:], ids[2000:])
+    first.sources, second.sources = ["a.csv"], ["b.csv", "a.csv"]
+    first.save(tmp_path / "first.npz")
+    loaded = HeatmapAccumulator.load(tmp_path / "first.npz")
+    loaded.merge(second)
+    assert loaded.sources == ["a.csv", "b.csv"] and loaded.rows == whole.rows and loaded.off_radar == 2
+    np.testing.assert_array_equal(loaded.totals, whole.totals)
+    np.testing.assert_array_equal(loaded.keys, whole.keys)
+    np.testing.assert_array_equal(loaded.key_counts, whole.key_counts)
+    with pytest.raises(ValueError, match="different"):
+        loaded.merge(HeatmapAccumulator(index.names, MAPS["de_mirage"], bin_px=8))
+    with pytest.raises(ValueError, match="different"):
+        loaded.merge(HeatmapAccumulator(["A", "B"], MAPS["de_mirage"]))
+
+
+def test_two_level_maps_split_by_z(index):
+    nuke = MAPS["de_nuke"]
+    acc = HeatmapAccumulator(index.names, nuke)
+    assert acc.shape[0] == 2
+    pts = np.array([[50.0, 50.0, 0.0], [50.0, 50.0, -600.0], [150.0, 50.0, -600.0]])
+    acc.add(pts, index.lookup(pts))
+    assert acc.grid(level=UPPER).sum() == 1 and acc.grid(level=LOWER).sum() == 2
+    assert acc.grid("A", level=LOWER).sum() == 1 and acc.grid("B", level=UPPER).sum() == 0
+
+
+def test_accumulate_positions_from_csv(tmp_path, index, points):
+    csv = tmp_path / "positions.csv"
+    csv.write_text("tick,X,Y\n" + "".join(f"{i},{x},{y}\n" for i, (x, y) in enumerate(points)), encoding="utf-8")
+    acc = HeatmapAccumulator(index.names, MAPS["de_mirage"])
+    summary = StreamSummary()
+    chunks = list(accumulate_positions(acc, csv, index, chunk_size=1000, summary=summary))
+    assert [c.rows for c in chunks] == [1000] * 5 + [2] and summary.chunks == chunks
+    direct = HeatmapAccumulator(index.names, MAPS["de_mirage"])
+    direct.add(points, index.lookup(points))
+    np.testing.assert_array_equal(acc.totals, direct.totals)
+    np.testing.assert_array_equal(acc.callout_counts, direct.callout_counts)
+    # Every on-radar point is within the snap distance of some callout
+    snapped = HeatmapAccumulator(index.names, MAPS["de_mirage"])
+    list(accumulate_positions(snapped, csv, index, snap_distance=1000.0))
+    assert snapped.grid(OUTSIDE).sum() == 0
+
+
+def test_heatmap_path_for():
+    assert heatmap_path_for("out/de_mirage_callouts.json").as_posix() == "out/de_mirage_heatmap.npz"
+    assert heatmap_path_for("out/custom.json").as_posix() == "out/custom_heatmap.npz"
@@ -0,0 +1,77 @@
+import numpy as np
+import pytest
+
+from cs2_callouts.intersect import intersect_polylines, intersect_segments
+from cs2_callouts.lookup import CalloutIndex
+
+from .conftest import square
+
+# A U shape: two 30-wide arms joined by a 30-high base
+U_SHAPE = [[0, 0], [90, 0], [90, 90], [60, 90], [60, 30], [30, 30], [30, 90], [0, 90]]
+
+
+def _hits(index, a, b, **kwargs):
+    h = intersect_segments(index, a, b, **kwargs)
+    return [(int(s), index.names[c], round(float(t0), 6), round(float(t1), 6))
+            for s, c, t0, t1 in zip(h.segment, h.callout, h.t_enter, h.t_exit)]
+
+
+def test_segment_across_a_row_of_callouts(row_payload):
+    index = CalloutIndex.from_output(row_payload)
+    assert _hits(index, [-50, 50], [400, 50]) == [
+        (0, "A", round(50 / 450, 6), round(150 / 450, 6)),
+        (0, "B", round(150 / 450, 6), round(250 / 450, 6)),
+        (0, "C", round(300 / 450, 6), round(400 / 450, 6)),
+    ]
+
+
+def test_start_and_end_inside(row_payload):
+    index = CalloutIndex.from_output(row_payload)
+    assert _hits(index, [[50, 50], [260, 50]], [[150, 50], [340, 50]]) == [
+        (0, "A", 0.0, 0.5), (0, "B", 0.5, 1.0), (1, "C", 0.0, 1.0)
+    ]
+
+
+def test_concave_polygon_reentry_gives_two_hits():
+    index = CalloutIndex.from_polygons(["U"], [U_SHAPE])
+    assert _hits(index, [-10, 60], [100, 60]) == [(0, "U", round(10 / 110, 6), round(40 / 110, 6)),
+                                                 (0, "U", round(70 / 110, 6), 1.0 - round(10 / 110, 6))]
+    # Below the notch the base is crossed in one piece
+    assert len(_hits(index, [-10, 15], [100, 15])) == 1
+
+
+def test_crossing_through_vertices_counts_once():
+    index = CalloutIndex.from_polygons(["Sq"], [square(0, 0, 100)])
+    assert _hits(index, [-10, -10], [110, 110]) == [(0, "Sq", round(10 / 120, 6), round(110 / 120, 6))]
+    # Grazing a corner from outside is not a hit
+    assert _hits(index, [-10, 10], [10, -10]) == []
+
+
+def test_zero_length_segment_is_a_point_query(row_payload):
+    index = CalloutIndex.from_output(row_payload)
+    assert _hits(index, [[150, 50], [225, 50]], [[150, 50], [225, 50]]) == [(0, "B", 0.0, 1.0)]
+
+
+def test_z_spans_clip_intervals(row_payload):
+    index = CalloutIndex.from_output(row_payload)  # z range [-100, 100]
+    assert _hits(index, [-50, 50, 500], [400, 50, 500]) == []
+    assert [h[1] for h in _hits(index, [-50, 50, 500], [400, 50, 500], use_z=False)] == ["A", "B", "C"]
+    # Descending from 250 to -200 over 450 units: z = 200 - x, inside the Z span for x in [100, 300]
+    hits = _hits(index, [-50, 50, 250], [400, 50, -200])
+    assert hits == [(0, "B", round(150 / 450, 6), round(250 / 450, 6)), (0, "C", round(300 / 450, 6), round(350 / 450, 6))]
+    assert [h[1] for h in _hits(index, [-50, 50, 250], [400, 50, -200], z_margin=100)] == ["A", "B", "C"]
+
+
+def test_polylines_merge_runs_across_vertices(row_payload):
+    index = CalloutIndex.from_output(row_payload)
+    path = np.array([[-50, 50], [50, 50], [90, 50], [150, 50], [150, 200]])
+    h = intersect_polylines(index, [path, np.array([[300, 50], [300, 60]])])
+    assert h.sequences(index.names) == [["A", "B"], ["C"]]
+    np.testing.assert_allclose(h.t_enter, [0.5, 2 + 10 / 60, 0.0])
+    np.testing.assert_allclose(h.t_exit, [2 + 10 / 60, 3 + 50 / 150, 1.0])
+
+
+def test_rejects_mismatched_endpoints(row_payload):
+    index = CalloutIndex.from_output(row_payload)
+    with pytest.raises(ValueError):
+        intersect_segments(index, [[0, 0]], [[1, 1], [2, 2]])
@@ -0,0 +1,83 @@
+import csv
+
+import numpy as np
+import pytest
+
+from cs2_callouts.labeling import (
+    StreamSummary,
+    iter_position_chunks,
+    label_chunk,
+    resolve_xy_columns,
+    stream_label,
+    stream_label_parallel,
+)
+from cs2_callouts.lookup import CalloutIndex
+
+
+@pytest.fixture
+def positions_csv(tmp_path):
+    rng = np.random.default_rng(0)
+    path = tmp_path / "ticks.csv"
+    with open(path, "w", newline="") as f:
+        w = csv.writer(f)
+        w.writerow(["tick", "steamid", "X", "Y", "Z"])
+        for i in range(1000):
+            w.writerow([i, 76561198000000000 + i % 10, rng.uniform(-20, 370), rng.uniform(-20, 120), 0.0])
+    return path
+
+
+def _column(path, name):
+    return np.concatenate([np.asarray(c.columns[name]) for c in iter_position_chunks(path, chunk_size=128)])
+
+
+def test_resolve_xy_columns():
+    assert resolve_xy_columns(["tick", "X", "Y"]) == ("X", "Y")
+    assert resolve_xy_columns(["x", "y", "px"], x_col="px") == ("px", "y")
+    with pytest.raises(ValueError):
+        resolve_xy_columns(["tick", "X"])
+
+
+def test_chunks_cover_every_row_once(positions_csv):
+    chunks = list(iter_position_chunks(positions_csv, chunk_size=300))
+    assert [len(c) for c in chunks] == [300, 300, 300, 100]
+    assert np.concatenate([np.asarray(c.columns["tick"]) for c in chunks]).tolist() == list(range(1000))
+
+
+@pytest.mark.parametrize("suffix", [".csv", ".csv.gz", ".parquet"])
+def test_stream_label_matches_whole_table_lookup(tmp_path, positions_csv, row_payload, suffix):
+    index = CalloutIndex.from_output(row_payload)
+    out = tmp_path / f"labeled{suffix}"
+    summary = StreamSummary()
+    chunks = list(stream_label(positions_csv, index, out_path=out, chunk_size=128, summary=summary))
+    assert summary.rows == 1000 and len(summary.chunks) == len(chunks) == 8
+
+    xy = np.column_stack([_column(positions_csv, "X"), _column(positions_csv, "Y")])
+    expected = index.label(xy)
+    streamed = np.concatenate([c.columns["callout"] for c, _ in chunks])
+    np.testing.assert_array_equal(streamed, expected)
+    written = _column(out, "callout")
+    assert [("" if v is None else str(v)) for v in written.tolist()] == expected.tolist()
+    assert _column(out, "tick").tolist() == list(range(1000))
+
+
+
+def test_parallel_labeling_matches_serial(tmp_path, positions_csv, row_payload):
+    index = CalloutIndex.from_output(row_payload)
+    serial = [c for c, _ in stream_label(positions_csv, index, chunk_size=100)]
+    out = tmp_path / "labeled.csv"
+    parallel = list(stream_label_parallel(positions_csv, index, out_path=out, chunk_size=100, workers=2, prefetch=1))
+    assert [s.index for _, s in parallel] == list(range(10))
+    for a, (b, _) in zip(serial, parallel):
+        np.testing.assert_array_equal(a.columns["tick"], b.columns["tick"])
+        np.testing.assert_array_equal(a.columns["callout"], b.columns["callout"])
+    assert _column(out, "tick").tolist() == list(range(1000))
+
+
+def test_label_chunk_snaps_gaps(row_payload, positions_csv):
+    index = CalloutIndex.from_output(row_payload)
+    chunk = next(iter_position_chunks(positions_csv, chunk_size=10))
+    chunk.columns["X"] = np.array([240.0] * 10)
+    chunk.columns["Y"] = np.array([50.0] * 10)
+    assert set(label_chunk(chunk, index, "X", "Y").columns["callout"].tolist()) == {""}
+    snapped = label_chunk(chunk, index, "X", "Y", snap_distance=20.0).columns["callout"]
+    assert set(snapped.tolist()) == {"C"}
@@ -0,0 +1,101 @@
+import numpy as np
+
+from cs2_callouts.lookup import CalloutIndex, SharedCalloutIndex, attach_shared_index, expand_ranges
+
+from .conftest import square
+
+# An L-shaped (concave) callout: the 100x100 square minus its top-right quarter
+L_SHAPE = [[0, 0], [100, 0], [100, 50], [50, 50], [50, 100], [0, 100]]
+
+
+def test_expand_ranges():
+    owner, values = expand_ranges(np.array([5, 0, 10]), np.array([2, 0, 3]))
+    assert owner.tolist() == [0, 0, 2, 2, 2]
+    assert values.tolist() == [5, 6, 10, 11, 12]
+
+
+def test_lookup_known_answers(row_payload):
+    index = CalloutIndex.from_output(row_payload)
+    points = np.array([[50, 50], [150, 50], [300, 50], [225, 50], [50, 500], [-1, 50]])
+    assert index.lookup(points).tolist() == [0, 1, 2, -1, -1, -1]
+    assert index.label(points, missing="-").tolist() == ["A", "B", "C", "-", "-", "-"]
+
+
+def test_concave_polygon_uses_even_odd_rule():
+    index = CalloutIndex.from_polygons(["L"], [L_SHAPE])
+    points = np.array([[25, 25], [75, 25], [25, 75], [75, 75]])
+    assert index.lookup(points).tolist() == [0, 0, 0, -1]
+
+
+def test_smallest_overlapping_polygon_wins():
+    index = CalloutIndex.from_polygons(["Site", "Box"], [square(0, 0, 100), square(40, 40, 10)])
+    assert index.lookup(np.array([[45, 45], [10, 10]])).tolist() == [1, 0]
+
+
+def test_lookup_ignores_z_and_matches_brute_force(row_payload):
+    index = CalloutIndex.from_output(row_payload, cell_size=7.0)
+    rng = np.random.default_rng(1)
+    pts = np.column_stack([rng.uniform(-20, 370, 2000), rng.uniform(-20, 120, 2000), rng.uniform(-50, 50, 2000)])
+    x, y = pts[:, 0], pts[:, 1]
+    inside_y = (y >= 0) & (y <= 100)
+    expected = np.full(len(pts), -1)
+    expected[inside_y & (x > 250) & (x < 350)] = 2
+    expected[inside_y & (x > 100) & (x < 200)] = 1
+    expected[inside_y & (x > 0) & (x < 100)] = 0
+    # Points exactly on an edge may go either way; the random draws never land on one
+    np.testing.assert_array_equal(index.lookup(pts), expected)
+
+
+def test_from_json_matches_from_output(row_payload, callouts_json):
+    a = CalloutIndex.from_json(callouts_json)
+    b = CalloutIndex.from_output(row_payload)
+    assert a.names == b.names
+    np.testing.assert_array_equal(a.vertices, b.vertices)
+    np.testing.assert_array_equal(a.zspans, [[-100, 100]] * 3)
+
+
+def test_shared_index_views_match_the_source(row_payload):
+    index = CalloutIndex.from_output(row_payload)
+    points = np.array([[50, 50], [150, 50], [300, 50], [225, 50]])
+    with SharedCalloutIndex(index) as shared:
+        attached, shm = attach_shared_index(shared.spec)
+        try:
+            assert attached.names == index.names
+            assert not attached.vertices.flags.writeable
+            np.testing.assert_array_equal(attached.lookup(points), index.lookup(points))
+        finally:
+            del attached
+            shm.close()
+
+
+def test_nearest_signed_distances(row_payload):
+    index = CalloutIndex.from_output(row_payload)
+    points = np.array([[50, 10], [240, 50], [210, 50], [175, 150], [1000, 50]])
+    ids, dist = index.nearest(points)
+    assert ids.tolist() == [0, 2, 1, 1, 2]
+    np.testing.assert_allclose(dist, [-10, 10, 10, 50, 650])
+    capped, _ = index.nearest(points, max_distance=20)
+    assert capped.tolist() == [0, 2, 1, -1, -1]
+
+
+def test_nearest_matches_brute_force_on_concave_hull():
+    index = CalloutIndex.from_polygons(["L", "Far"], [L_SHAPE, square(300, 300, 20)])
+    rng = np.random.default_rng(2)
+    pts = rng.uniform(-50, 350, size=(500, 2))
+    ids, dist = index.nearest(pts)
+
+    def edge_distance(poly, p):
+        a = np.asarray(poly, dtype=np.float64)
+        b = np.roll(a, -1, axis=0)
+        d = b - a
+        t = np.clip(((p - a) * d).sum(axis=1) / (d * d).sum(axis=1), 0, 1)
+        return np.hypot(*(a + t[:, None] * d - p).T).min()
+
+    polys = [L_SHAPE, square(300, 300, 20)]
+    inside = index.lookup(pts)
+    for p, i, d, hit in zip(pts, ids, dist, inside):
+        per = [edge_distance(poly, p) for poly in polys]
+        if hit >= 0:
+            assert i == hit and np.isclose(d, -per[hit])
+        else:
+            assert np.isclose(d, min(per)) and np.isclose(per[i], min(per))
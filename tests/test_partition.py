@@ -0,0 +1,69 @@
+import json
+
+import numpy as np
+import pytest
+
+from cs2_callouts.lookup import CalloutIndex
+from cs2_callouts.partition import (
+    CalloutPartition,
+    build_partition_file,
+    load_priorities,
+    partition_path_for,
+    resolution_order,
+)
+
+from .conftest import callouts_payload, square
+
+OVERLAPS = callouts_payload([("Site", square(0, 0, 200)), ("Box", square(50, 50, 40)), ("Ramp", square(150, 150, 100))])
+
+
+def _points(n=5000, seed=3):
+    return np.random.default_rng(seed).uniform(-30, 280, size=(n, 2))
+
+
+def test_resolution_order_priority_then_area():
+    index = CalloutIndex.from_output(OVERLAPS)
+    assert resolution_order(index).tolist() == [2, 0, 1]
+    assert resolution_order(index, {"Site": 5.0}).tolist() == [0, 1, 2]
+
+
+@pytest.mark.parametrize("cell_size", [4.0, 16.0, 50.0])
+def test_default_priorities_match_smallest_area_lookup(cell_size):
+    index = CalloutIndex.from_output(OVERLAPS)
+    part = CalloutPartition.build(index, cell_size=cell_size)
+    pts = _points()
+    np.testing.assert_array_equal(part.lookup(pts), index.lookup(pts))
+
+
+def test_priorities_override_area():
+    index = CalloutIndex.from_output(OVERLAPS)
+    part = CalloutPartition.build(index, priorities={"Site": 1.0})
+    pts = np.array([[70, 70], [175, 175], [240, 240], [300, 300]])
+    assert part.label(pts, missing="-").tolist() == ["Site", "Site", "Ramp", "-"]
+    assert 0.0 < part.boundary_fraction < 1.0
+
+
+def test_save_load_and_stale_detection(tmp_path):
+    path = tmp_path / "de_test_callouts.json"
+    path.write_text(json.dumps(OVERLAPS), encoding="utf-8")
+    zones = tmp_path / "inferno.json"
+    zones.write_text(json.dumps({"zones": [{"name": "Site", "priority": 2}, {"name": "Box"}]}), encoding="utf-8")
+    assert load_priorities(zones) == {"Site": 2.0}
+    part, out = build_partition_file(path, zones_json=zones)
+    assert out == partition_path_for(path) and out.name == "de_test_partition.npz"
+    index = CalloutIndex.from_json(path)
+    loaded = CalloutPartition.load(out, index)
+    pts = _points(1000)
+    np.testing.assert_array_equal(loaded.lookup(pts), part.lookup(pts))
+    other = CalloutIndex.from_output(callouts_payload([("Elsewhere", square(0, 0, 10))]))
+    with pytest.raises(ValueError):
+        CalloutPartition.load(out, other)
+
+
+def test_load_rejects_changed_geometry_with_same_names(tmp_path):
+    path = tmp_path / "de_test_callouts.json"
+    path.write_text(json.dumps(OVERLAPS), encoding="utf-8")
+    _, out = build_partition_file(path)
+    moved = callouts_payload([("Site", square(0, 0, 200)), ("Box", square(120, 20, 40)), ("Ramp", square(150, 150, 100))])
+    with pytest.raises(ValueError):
+        CalloutPartition.load(out, CalloutIndex.from_output(moved))
@@ -0,0 +1,63 @@
+import json
+
+import numpy as np
+import pytest
+
+from cs2_callouts.pipeline import compare_precision, process_callouts, read_callouts_json
+from cs2_callouts.profiling import profiling
+
+
+@pytest.fixture(scope="module")
+def callouts(synthetic_map):
+    items = json.loads(synthetic_map.callouts_json.read_text())
+    items.append(dict(items[0], placename="Ghost", model="models/callouts/missing.vmdl"))
+    path = synthetic_map.root / "with_missing.json"
+    path.write_text(json.dumps(items), encoding="utf-8")
+    return read_callouts_json(path)
+
+
+@pytest.fixture(scope="module")
+def reference(synthetic_map, callouts):
+    return process_callouts(callouts, synthetic_map.models_root)
+
+
+def test_hulls_cover_the_transformed_models(reference):
+    assert reference["count"] == 12 and len(reference["callouts"]) == 12
+    assert [m["placename"] for m in reference["missing_models"]] == ["Ghost"]
+    for record in reference["callouts"]:
+        poly = np.asarray(record["polygon_2d"])
+        assert len(poly) >= 3 and record["vertices_count"] == 300
+        box = record["bbox_2d"]
+        assert box["min_x"] == poly[:, 0].min() and box["max_y"] == poly[:, 1].max()
+
+
+def test_stream_output_is_identical(synthetic_map, callouts, reference):
+    assert process_callouts(callouts, synthetic_map.models_root, stream=True) == reference
+
+
+def test_stream_records_the_same_model_keys(synthetic_map, callouts):
+    keys = []
+    for stream in (False, True):
+        with profiling("process", memory=True) as prof:
+            process_callouts(callouts, synthetic_map.models_root, rotation_order="rz_rx_ry", stream=stream)
+        keys.append(sorted(prof.models))
+    assert keys[0] == keys[1] and len(keys[0]) == 4
+
+
+def test_float32_stays_within_the_precision_tolerance(synthetic_map, callouts, reference):
+    single = process_callouts(callouts, synthetic_map.models_root, float32=True)
+    report = compare_precision(reference, single)
+    assert report["ok"] and report["same_callouts"] and report["over_tolerance"] == 0
+    assert report["callouts"] == 12 and report["max_deviation"] <= report["tolerance"]
+
+
+def test_compare_precision_known_answers(reference):
+    shifted = dict(reference, callouts=[dict(c) for c in reference["callouts"]])
+    moved = shifted["callouts"][3]
+    moved["polygon_2d"] = (np.asarray(moved["polygon_2d"]) + [0.0, 0.5]).tolist()
+    report = compare_precision(reference, shifted, tolerance=0.1)
+    assert report["max_deviation"] == pytest.approx(0.5) and report["worst"] == moved["name"]
+    assert report["over_tolerance"] == 1 and report["max_area_error"] == pytest.approx(0.0, abs=1e-9)
+    assert not report["ok"]
+    assert compare_precision(reference, dict(shifted, callouts=shifted["callouts"][1:]))["same_callouts"] is False
+    assert compare_precision(reference, dict(reference, rotation_order="other"))["ok"] is False
@@ -0,0 +1,103 @@
+import json
+import tracemalloc
+
+import numpy as np
+
+from cs2_callouts.profiling import (
+    active_profiler,
+    finish_profile,
+    profiling,
+    record_model,
+    record_subprocess,
+    stage,
+    timings_path_for,
+)
+
+MB = 1 << 20
+
+
+def test_timings_path_for():
+    assert timings_path_for("out/de_mirage_callouts.json").as_posix() == "out/de_mirage_timings.json"
+    assert timings_path_for("radar.png").as_posix() == "radar_timings.json"
+
+
+def test_stages_nest_and_accumulate():
+    with profiling("process") as prof:
+        with stage("load"):
+            for _ in range(3):
+                with stage("model"):
+                    pass
+        with stage("hulls"):
+            pass
+    report = prof.report()
+    assert report["command"] == "process"
+    assert {k: v["calls"] for k, v in report["stages"].items()} == {"load/model": 3, "load": 1, "hulls": 1}
+    assert "memory" not in report and "top_allocations" not in report["stages"]["load"]
+    assert active_profiler() is None
+
+
+def test_stage_is_a_no_op_without_a_profiler():
+    with stage("anything"):
+        pass
+    with profiling("off", enabled=False) as prof:
+        assert prof is None and active_profiler() is None
+
+
+def test_nested_commands_share_the_outer_profiler():
+    with profiling("pipeline") as outer:
+        with profiling("extract") as inner:
+            assert inner is None
+            with stage("decompile"):
+                pass
+    assert "decompile" in outer.stages
+
+
+def test_subprocesses_are_grouped_by_kind():
+    with profiling("extract") as prof:
+        record_subprocess(["vrf", "--vpk_list"], 0.5)
+        record_subprocess(["vrf", "--gltf_export_format", "glb"], 1.0)
+        record_subprocess(["vrf", "--gltf_export_format", "glb"], 1.0)
+        record_subprocess(["vrf", "-d"], 0.25)
+    sub = prof.report()["vrf_subprocesses"]
+    assert sub["calls"] == 4 and sub["wall_s"] == 2.75
+    assert {k: v["calls"] for k, v in sub["by_kind"].items()} == {"list": 1, "export": 2, "decompile": 1}
+
+
+def test_finish_profile_writes_json(tmp_path):
+    lines = []
+    with profiling("process") as prof:
+        with stage("hulls"):
+            pass
+    path = finish_profile(prof, tmp_path / "de_test_timings.json", echo=lines.append)
+    assert json.loads(path.read_text())["stages"]["hulls"]["calls"] == 1
+    assert lines[-1] == f"Timings: {path}"
+    assert finish_profile(None, tmp_path / "unused.json") is None
+
+
+def test_memory_peaks_propagate_to_enclosing_stages():
+    with profiling("process", memory=True) as prof:
+        with stage("outer"):
+            with stage("alloc"):
+                block = np.ones(8 * MB, dtype=np.uint8)
+                del block
+            with stage("small"):
+                kept = np.ones(MB // 4, dtype=np.uint8)
+        record_model("models/a", np.zeros(1000))
+    assert not tracemalloc.is_tracing()
+    stages = prof.report()["stages"]
+    assert stages["outer/alloc"]["traced_peak_bytes"] >= 8 * MB
+    assert stages["outer/alloc"]["traced_delta_bytes"] < MB
+    # A later, smaller stage does not hide the earlier peak from its parent
+    assert stages["outer/small"]["traced_peak_bytes"] < 8 * MB
+    assert stages["outer"]["traced_peak_bytes"] >= 8 * MB
+    assert stages["outer/small"]["traced_delta_bytes"] >= MB // 4
+    mem = prof.report()["memory"]
+    assert mem["traced_peak_bytes"] >= 8 * MB
+    assert mem["model_cache"] == {"models": 1, "total_bytes": 8000, "bytes_per_model": {"models/a": 8000}}
+    del kept
+
+
+def test_record_model_needs_memory_mode():
+    with profiling("process") as prof:
+        record_model("models/a", np.zeros(10))
+    assert prof.models == {}
@@ -0,0 +1,67 @@
+import numpy as np
+from PIL import Image
+
+from cs2_callouts.raster import DEFAULT_SIZE, density_image, render_callouts_image, render_overlay_image
+from cs2_callouts.render import color_for_name, flatten_polygons
+
+from .conftest import square
+
+
+def _rgb(name):
+    return tuple(int(round(c * 255)) for c in color_for_name(name))
+
+
+def _render(**kwargs):
+    vertices, offsets = flatten_polygons([square(10, 10, 40)])
+    return np.asarray(render_overlay_image(vertices, offsets, ["A"], alpha=1.0, labels=False, **kwargs))
+
+
+def test_fill_is_exact_with_full_alpha():
+    img = _render()
+    assert img.shape == (DEFAULT_SIZE, DEFAULT_SIZE, 4)
+    assert tuple(img[30, 30, :3]) == _rgb("A")
+    assert tuple(img[100, 100]) == (255, 255, 255, 255)
+
+
+def test_size_scales_coordinates():
+    img = _render(size=(DEFAULT_SIZE // 2, DEFAULT_SIZE // 2))
+    assert img.shape[:2] == (DEFAULT_SIZE // 2, DEFAULT_SIZE // 2)
+    assert tuple(img[15, 15, :3]) == _rgb("A")
+    assert tuple(img[30, 30, :3]) == (255, 255, 255)
+
+
+def test_radar_sets_pixel_space():
+    radar = Image.new("RGBA", (200, 100), (0, 0, 0, 255))
+    img = _render(radar=radar, radar_alpha=1.0)
+    assert img.shape[:2] == (100, 200)
+    assert tuple(img[30, 30, :3]) == _rgb("A")
+    assert tuple(img[80, 150, :3]) == (0, 0, 0)
+
+
+def test_transparent_background():
+    vertices, offsets = flatten_polygons([square(10, 10, 40)])
+    img = np.asarray(render_overlay_image(vertices, offsets, ["A"], alpha=0.5, labels=False, background=None))
+    assert tuple(img[100, 100]) == (0, 0, 0, 0)
+    assert img[30, 30, 3] == 128 and tuple(img[30, 30, :3]) == _rgb("A")
+
+
+def test_inputs_are_not_modified():
+    vertices, offsets = flatten_polygons([square(10, 10, 40)])
+    before = vertices.copy()
+    render_overlay_image(vertices, offsets, ["A"], size=(64, 64))
+    np.testing.assert_array_equal(vertices, before)
+
+
+def test_density_image_transparent_where_empty_and_peaks_at_alpha():
+    grid = np.array([[0, 1], [10, 100]])
+    rgba = np.asarray(density_image(grid, alpha=0.8))
+    assert rgba.shape == (2, 2, 4)
+    assert rgba[0, 0, 3] == 0
+    assert rgba[1, 1, 3] == round(0.8 * 255)
+    assert rgba[0, 1, 3] < rgba[1, 0, 3] < rgba[1, 1, 3]
+
+
+def test_render_callouts_image_fits_without_metadata(row_payload):
+    img = render_callouts_image(row_payload, size=(128, 128), labels=False)
+    assert img.size == (128, 128)
+    assert (np.asarray(img)[..., :3] != 255).any()
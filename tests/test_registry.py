@@ -0,0 +1,89 @@
+import json
+import os
+
+import numpy as np
+import pytest
+
+from cs2_callouts.graph import build_graph_file
+from cs2_callouts.partition import build_partition_file
+from cs2_callouts.registry import CalloutMaps
+
+from .conftest import MAP_DATA, callouts_payload, square
+
+
+def _write(path, payload):
+    path.write_text(json.dumps(payload), encoding="utf-8")
+    # Bump the mtime explicitly; back-to-back writes can share a timestamp
+    st = path.stat()
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+
+
+@pytest.fixture
+def maps_dir(tmp_path, row_payload):
+    out = tmp_path / "out"
+    out.mkdir()
+    _write(out / "de_one_callouts.json", row_payload)
+    _write(out / "de_two_callouts.json", callouts_payload([("Mid", square(0, 0, 50))]))
+    return out
+
+
+def _maps(maps_dir, **kwargs):
+    return CalloutMaps(maps_dir, map_data=MAP_DATA, cache_dir=maps_dir.parent / "cache", **kwargs)
+
+
+def test_lazy_load_and_hits(maps_dir):
+    maps = _maps(maps_dir)
+    assert maps.available() == ["de_one", "de_two"] and maps.loaded() == []
+    first = maps["de_one"]
+    assert maps["de_one"] is first
+    assert first.label(np.array([[50.0, 50.0]])).tolist() == ["A"]
+    stats = maps.stats
+    assert (stats.hits, stats.misses, stats.entries) == (1, 1, 1)
+
+
+@pytest.mark.parametrize("name", ["de_missing", "", "../out/de_one", ".hidden"])
+def test_unknown_or_unsafe_names_raise_key_error(maps_dir, name):
+    with pytest.raises(KeyError):
+        _maps(maps_dir).get(name)
+
+
+def test_lru_eviction_keeps_the_requested_map(maps_dir):
+    maps = _maps(maps_dir, max_entries=1)
+    maps["de_one"]
+    maps["de_two"]
+    assert maps.loaded() == ["de_two"]
+    assert maps.stats.evictions == 1 and maps.stats.evicted == ["de_one"]
+    tiny = _maps(maps_dir, max_bytes=1)
+    tiny["de_one"]
+    assert tiny.loaded() == ["de_one"]
+
+
+def test_changed_callouts_file_is_reloaded(maps_dir):
+    maps = _maps(maps_dir)
+    before = maps["de_two"]
+    _write(maps_dir / "de_two_callouts.json", callouts_payload([("Window", square(0, 0, 50))]))
+    after = maps["de_two"]
+    assert after is not before and after.names == ["Window"]
+    assert maps.stats.reloads == 1
+    assert _maps(maps_dir, check_files=False)["de_two"].names == ["Window"]
+
+
+def test_graph_and_partition_files_trigger_reload(maps_dir):
+    maps = _maps(maps_dir)
+    assert maps["de_one"].graph is None and maps["de_one"].partition is None
+    build_graph_file(maps_dir / "de_one_callouts.json")
+    with_graph = maps["de_one"]
+    assert with_graph.graph is not None
+    assert with_graph.route("A", "B") == ["A", "B"]
+    build_partition_file(maps_dir / "de_one_callouts.json")
+    assert maps["de_one"].partition is not None
+    (maps_dir / "de_one_graph.json").unlink()
+    assert maps["de_one"].graph is None
+    assert maps.stats.reloads == 3
+
+
+def test_stale_graph_is_dropped(maps_dir):
+    build_graph_file(maps_dir / "de_one_callouts.json")
+    _write(maps_dir / "de_one_callouts.json", callouts_payload([("Mid", square(0, 0, 50))]))
+    entry = _maps(maps_dir)["de_one"]
+    assert entry.names == ["Mid"] and entry.graph is None
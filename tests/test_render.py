@@ -0,0 +1,46 @@
+import numpy as np
+
+from cs2_callouts.render import (
+    draw_callouts,
+    flatten_polygons,
+    game_to_pixel,
+    polygon_centroids,
+    split_polygons,
+    use_noninteractive_backend,
+)
+
+from .conftest import square
+
+
+def test_flatten_split_round_trip():
+    polys = [square(0, 0, 10), [], square(5, 5, 2)[:3]]
+    vertices, offsets = flatten_polygons(polys)
+    assert offsets.tolist() == [0, 4, 4, 7]
+    assert [p.tolist() for p in split_polygons(vertices, offsets)] == [[[float(x), float(y)] for x, y in p] for p in polys]
+
+
+def test_polygon_centroids_vertex_mean_and_empty():
+    vertices, offsets = flatten_polygons([square(0, 0, 10), [], [[0, 0], [3, 0], [0, 3]]])
+    np.testing.assert_allclose(polygon_centroids(vertices, offsets), [[5, 5], [0, 0], [1, 1]])
+
+
+def test_game_to_pixel_awpy_formula():
+    meta = {"pos_x": -3230.0, "pos_y": 1713.0, "scale": 5.0}
+    px = game_to_pixel(np.array([[-3230.0, 1713.0], [-3230.0 + 5120.0, 1713.0 - 5120.0]]), meta)
+    np.testing.assert_allclose(px, [[0, 0], [1024, 1024]])
+    assert game_to_pixel(np.zeros((0, 2)), meta).shape == (0, 2)
+
+
+def test_draw_callouts_adds_one_collection():
+    use_noninteractive_backend()
+    import matplotlib.pyplot as plt
+
+    fig, ax = plt.subplots()
+    try:
+        vertices, offsets = flatten_polygons([square(0, 0, 10), square(20, 0, 10), [[0, 0], [1, 1]]])
+        draw_callouts(ax, vertices, offsets, ["A", "B", "Line"], labels=True, min_vertices=3)
+        assert len(ax.collections) == 1
+        assert len(ax.collections[0].get_paths()) == 2
+        assert sorted(t.get_text() for t in ax.texts) == ["A", "B"]
+    finally:
+        plt.close(fig)
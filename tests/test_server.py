@@ -0,0 +1,88 @@
+import http.client
+import json
+import threading
+
+import pytest
+
+from cs2_callouts.registry import CalloutMaps
+from cs2_callouts.server import CalloutClient, lookup_request, make_server
+
+from .conftest import MAP_DATA
+
+
+@pytest.fixture
+def maps(tmp_path, callouts_json):
+    return CalloutMaps(callouts_json.parent, map_data=MAP_DATA, cache_dir=tmp_path / "cache")
+
+
+@pytest.fixture
+def server(maps):
+    srv = make_server(maps, port=0)
+    thread = threading.Thread(target=srv.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield srv
+    finally:
+        srv.shutdown()
+        srv.server_close()
+
+
+def _post(conn, body):
+    conn.request("POST", "/lookup", body=json.dumps(body).encode("utf-8"), headers={"Content-Type": "application/json"})
+    resp = conn.getresponse()
+    return resp.status, json.loads(resp.read())
+
+
+def test_lookup_request_known_answers(maps):
+    out = lookup_request(maps, {"map": "de_test", "points": [[50, 50, 0], [150, 50, 0], [225, 50, 0]]})
+    assert out == {"map": "de_test", "ids": [0, 1, -1], "callouts": ["A", "B", None]}
+    assert lookup_request(maps, {"map": "de_test", "points": [300, 50]})["callouts"] == ["C"]
+    assert lookup_request(maps, {"map": "de_test", "points": []})["ids"] == []
+
+
+@pytest.mark.parametrize(
+    "payload",
+    [
+        {"map": 5, "points": [[1, 2]]},
+        {"points": [[1, 2]]},
+        {"map": "de_test", "points": {}},
+        {"map": "de_test", "points": [["a", 1]]},
+        {"map": "de_test", "points": "50,50"},
+        {"map": "de_test", "points": [[1, 2, 3, 4]]},
+        {"map": "de_test", "points": [[1, 2]], "space": None},
+        {"map": "de_test", "points": [[1, 2]], "space": "screen"},
+        [1, 2],
+    ],
+)
+def test_lookup_request_rejects_malformed_payloads(maps, payload):
+    with pytest.raises(ValueError):
+        lookup_request(maps, payload)
+
+
+def test_errors_keep_the_connection_usable(server, monkeypatch):
+    conn = http.client.HTTPConnection("127.0.0.1", server.server_address[1], timeout=10)
+    try:
+        assert _post(conn, {"map": "de_test", "points": {}})[0] == 400
+        assert _post(conn, {"map": "de_nope", "points": [[0, 0]]})[0] == 404
+
+        def broken(name):
+            raise RuntimeError("index exploded")
+
+        monkeypatch.setattr(server.maps, "get", broken)
+        status, body = _post(conn, {"map": "de_test", "points": [[0, 0]]})
+        assert status == 500 and "index exploded" in body["error"]
+        monkeypatch.undo()
+
+        status, body = _post(conn, {"map": "de_test", "points": [[50, 50]]})
+        assert status == 200 and body["callouts"] == ["A"]
+    finally:
+        conn.close()
+
+
+def test_client_round_trip(server):
+    with CalloutClient(port=server.server_address[1]) as client:
+        assert client.lookup("de_test", [[150, 50], [-5, -5]]) == ["B", None]
+        maps = client.maps()
+        assert maps["maps"] == ["de_test"] and maps["loaded"] == ["de_test"]
+        with pytest.raises(RuntimeError, match="404"):
+            client.lookup("de_nope", [[0, 0]])
@@ -0,0 +1,70 @@
+import numpy as np
+
+from cs2_callouts.geometry import polygon_area
+from cs2_callouts.simplify import SIMPLIFIED_KEY, simplify_callouts, simplify_polygon
+
+from .conftest import callouts_payload
+
+
+def _circle(n=64, r=100.0):
+    a = np.linspace(0, 2 * np.pi, n, endpoint=False)
+    return np.column_stack([r * np.cos(a), r * np.sin(a)])
+
+
+def _rotated_square_with_midpoints(angle=0.5236):
+    """A rotated 100-unit square with a midpoint on every edge; the midpoints are collinear up to float noise."""
+    corners = np.array([[0, 0], [100, 0], [100, 100], [0, 100]], dtype=np.float64)
+    ring = np.vstack([np.vstack([c, (c + n) / 2]) for c, n in zip(corners, np.roll(corners, -1, axis=0))])
+    c, s = np.cos(angle), np.sin(angle)
+    return ring @ np.array([[c, -s], [s, c]]).T + [1234.5, -987.6]
+
+
+def test_collinear_vertices_go_at_zero_tolerance():
+    ring = _rotated_square_with_midpoints()
+    out, stats = simplify_polygon(ring, tolerance=0.0)
+    assert len(out) == 4 and stats.vertices_before == 8
+    assert stats.max_deviation < 1e-9
+    assert abs(stats.area_error) < 1e-12
+
+
+def test_tolerance_bounds_the_deviation():
+    out, stats = simplify_polygon(_circle(), tolerance=2.0)
+    assert 4 <= len(out) < 64
+    assert stats.max_deviation <= 2.0
+    # Dropping vertices of a convex ring only cuts area off
+    assert abs(polygon_area(out)) <= abs(polygon_area(_circle()))
+
+
+def test_vertex_budget_is_hard_and_reports_the_deviation():
+    out, stats = simplify_polygon(_circle(), tolerance=0.5, max_vertices=8)
+    assert len(out) == 8
+    assert stats.max_deviation > 0.5
+    # Eight vertices of a 100-unit circle: the chord sagitta is r (1 - cos(pi / 8))
+    assert stats.max_deviation >= 100 * (1 - np.cos(np.pi / 8)) - 1e-9
+
+
+def test_small_rings_are_kept():
+    out, stats = simplify_polygon([[0, 0], [1, 0], [0, 1]], tolerance=10.0)
+    assert len(out) == 3 and stats.max_deviation == 0.0
+
+
+def test_simplify_callouts_summary():
+    data = callouts_payload([("Circle", _circle()), ("Square", _rotated_square_with_midpoints())])
+    summary = simplify_callouts(data, tolerance=1.0, max_vertices=12)
+    assert summary is data["simplification"]
+    assert summary["vertices_before"] == 72 and summary["vertices_after"] == 12 + 4
+    assert summary["over_tolerance"] == 1
+    assert [len(c[SIMPLIFIED_KEY]) for c in data["callouts"]] == [12, 4]
+    assert data["callouts"][0]["polygon_2d"] == [[float(x), float(y)] for x, y in _circle().tolist()]
+
+
+def test_float_noise_is_not_over_tolerance():
+    data = callouts_payload([("Square", _rotated_square_with_midpoints())])
+    assert simplify_callouts(data, tolerance=0.0)["over_tolerance"] == 0
+
+
+def test_budget_without_tolerance_skips_the_count():
+    data = callouts_payload([("Circle", _circle()), ("Square", _rotated_square_with_midpoints())])
+    summary = simplify_callouts(data, tolerance=None, max_vertices=8)
+    assert summary["over_tolerance"] is None and summary["tolerance"] is None
+    assert summary["vertices_after"] == 8 + 4
@@ -0,0 +1,79 @@
+import json
+
+import numpy as np
+import pytest
+from PIL import Image
+
+from cs2_callouts.raster import DEFAULT_SIZE
+from cs2_callouts.render import flatten_polygons
+from cs2_callouts.tiles import MANIFEST_NAME, TILE_SIZE, build_tile_pyramid, plan_tiles
+
+from .conftest import square
+
+
+def _full_cover():
+    return flatten_polygons([square(0, 0, DEFAULT_SIZE)])
+
+
+def test_plan_tiles_full_levels_then_sparse():
+    vertices, offsets = flatten_polygons([square(10, 10, 20)])
+    jobs = plan_tiles(vertices, offsets, (DEFAULT_SIZE, DEFAULT_SIZE), max_zoom=3, sparse_from=2)
+    per_zoom = {z: [j.key for j in jobs if j.z == z] for z in range(4)}
+    assert len(per_zoom[0]) == 1 and len(per_zoom[1]) == 4
+    # Sparse levels keep only the corner tile; the label margin does not reach the next one
+    assert per_zoom[2] == ["2/0/0"]
+    assert per_zoom[3] == ["3/0/0"]
+
+
+@pytest.mark.parametrize("with_radar", [False, True])
+def test_full_tile_polygon_fills_every_tile(tmp_path, with_radar):
+    vertices, offsets = _full_cover()
+    radar = Image.new("RGBA", (DEFAULT_SIZE, DEFAULT_SIZE), (0, 0, 0, 255)) if with_radar else None
+    build_tile_pyramid(tmp_path, vertices, offsets, ["Everywhere"], radar=radar, max_zoom=2, sparse_from=1,
+                       alpha=1.0, labels=False, workers=1)
+    manifest = json.loads((tmp_path / MANIFEST_NAME).read_text())
+    assert len(manifest["tiles"]) == 1 + 4 + 16
+    reference = None
+    for key in manifest["tiles"]:
+        tile = np.asarray(Image.open(tmp_path / f"{key}.png").convert("RGB"))
+        assert tile.shape == (TILE_SIZE, TILE_SIZE, 3)
+        # Away from the outline every pixel is the fill colour
+        inner = tile[4:-4, 4:-4].reshape(-1, 3)
+        reference = inner[0] if reference is None else reference
+        assert (inner == reference).all(), key
+
+
+def test_label_crossing_a_tile_edge_shows_on_both_tiles(tmp_path):
+    # A small polygon straddling the vertical edge between tiles 1/0/0 and 1/1/0
+    half = DEFAULT_SIZE // 2
+    vertices, offsets = flatten_polygons([square(half - 4, 100, 8)])
+    build_tile_pyramid(tmp_path, vertices, offsets, ["A very long callout name"], max_zoom=1, sparse_from=1,
+                       alpha=0.0, label_min_zoom=1, workers=1)
+    left = np.asarray(Image.open(tmp_path / "1" / "0" / "0.png").convert("RGB"))
+    right = np.asarray(Image.open(tmp_path / "1" / "1" / "0.png").convert("RGB"))
+    # Zoom 1 halves base pixels: the centroid is at tile row 52, the outline in the two edge columns.
+    # Dark label text must appear on both sides of the edge, clear of the outline.
+    band = slice(40, 65)
+    assert (left[band, -60:-6] < 128).any()
+    assert (right[band, 6:60] < 128).any()
+
+
+def test_rebuild_skips_unchanged_tiles(tmp_path):
+    vertices, offsets = _full_cover()
+    first = build_tile_pyramid(tmp_path, vertices, offsets, ["A"], max_zoom=1, sparse_from=1, workers=1)
+    again = build_tile_pyramid(tmp_path, vertices, offsets, ["A"], max_zoom=1, sparse_from=1, workers=1)
+    assert first["rendered"] == first["planned"] == 5
+    assert again["rendered"] == 0 and again["skipped"] == 5
+    renamed = build_tile_pyramid(tmp_path, vertices, offsets, ["B"], max_zoom=1, sparse_from=1, workers=1)
+    assert renamed["rendered"] == 5
+
+
+def test_tiles_without_a_radar_are_transparent(tmp_path):
+    vertices, offsets = flatten_polygons([square(0, 0, DEFAULT_SIZE // 2)])
+    build_tile_pyramid(tmp_path, vertices, offsets, ["A"], max_zoom=1, sparse_from=2, alpha=0.5, labels=False, workers=1)
+    covered = Image.open(tmp_path / "1" / "0" / "0.png")
+    empty = Image.open(tmp_path / "1" / "1" / "1.png")
+    assert covered.mode == empty.mode == "RGBA"
+    # Only the square's corner outline reaches the diagonal tile
+    assert (np.asarray(empty)[4:, 4:, 3] == 0).all()
+    assert np.asarray(covered)[128, 128, 3] == 128
@@ -0,0 +1,107 @@
+import csv
+
+import numpy as np
+import pytest
+
+from cs2_callouts.lookup import CalloutIndex
+from cs2_callouts.trajectory import VisitTracker, resolve_player_tick_columns, stream_visits
+
+NAMES = ["A", "B", "C"]
+
+
+def _run(players, ticks, ids, max_gap=None, chunk=None):
+    tracker = VisitTracker(NAMES, max_gap=max_gap)
+    step = chunk or len(ids)
+    rows = []
+    for s in range(0, len(ids), step):
+        v = tracker.update(players[s:s + step], ticks[s:s + step], ids[s:s + step])
+        rows += list(zip(v.player.tolist(), v.callout.tolist(), v.enter_tick.tolist(), v.exit_tick.tolist(), v.samples.tolist()))
+    v = tracker.finish()
+    rows += list(zip(v.player.tolist(), v.callout.tolist(), v.enter_tick.tolist(), v.exit_tick.tolist(), v.samples.tolist()))
+    return sorted(rows), tracker
+
+
+def _reference(players, ticks, ids, max_gap=None):
+    """Plain-Python run-length visits: (player, callout, enter, exit, samples) and transitions."""
+    rows, moves = [], []
+    for player in sorted(set(players)):
+        seq = sorted((t, c) for p, t, c in zip(players, ticks, ids) if p == player)
+        runs = []
+        for t, c in seq:
+            gap = bool(runs) and max_gap is not None and t - runs[-1]["last"] > max_gap
+            if runs and runs[-1]["c"] == c and not gap:
+                runs[-1]["last"] = t
+                runs[-1]["n"] += 1
+            else:
+                runs.append({"c": c, "enter": t, "last": t, "n": 1, "gap_before": gap})
+        for r, nxt in zip(runs, runs[1:] + [None]):
+            joined = nxt is not None and not nxt["gap_before"]
+            rows.append((player, r["c"], r["enter"], nxt["enter"] if joined else r["last"], r["n"]))
+            if joined:
+                moves.append((r["c"], nxt["c"]))
+    return sorted(rows), moves
+
+
+def test_known_visits_tile_the_timeline():
+    rows, tracker = _run(["p"] * 6, list(range(6)), [0, 0, 0, 1, 1, -1])
+    assert rows == [("p", -1, 5, 5, 1), ("p", 0, 0, 3, 3), ("p", 1, 3, 5, 2)]
+    assert tracker.dwell_ticks.tolist() == [3, 2, 0, 0]
+    assert tracker.visit_counts.tolist() == [1, 1, 0, 1]
+    assert tracker.transitions[0, 1] == 1 and tracker.transitions[1, 3] == 1 and tracker.transitions.sum() == 2
+
+
+def test_max_gap_splits_visits_without_a_transition():
+    players, ticks, ids = ["p"] * 5, [0, 1, 2, 10, 11], [0, 0, 0, 0, 1]
+    rows, tracker = _run(players, ticks, ids, max_gap=4)
+    assert rows == [("p", 0, 0, 2, 3), ("p", 0, 10, 11, 1), ("p", 1, 11, 11, 1)]
+    assert tracker.transitions.sum() == 1
+    merged, _ = _run(players, ticks, ids)
+    assert merged == [("p", 0, 0, 11, 4), ("p", 1, 11, 11, 1)]
+
+
+@pytest.mark.parametrize("max_gap", [None, 3])
+@pytest.mark.parametrize("chunk", [1, 7, 64, None])
+def test_chunked_stream_matches_reference(max_gap, chunk):
+    rng = np.random.default_rng(5)
+    n = 400
+    players = rng.choice(["p1", "p2", "p3"], size=n).tolist()
+    # Ticks increase over the stream (as in an awpy export) with occasional jumps
+    ticks = np.cumsum(rng.choice([1, 1, 1, 6], size=n)).tolist()
+    ids = rng.choice([-1, 0, 1, 2], size=n, p=[0.1, 0.5, 0.3, 0.1])
+    # Long stays, so runs span chunk boundaries
+    ids = np.repeat(ids[: n // 8], 8).tolist()
+    rows, tracker = _run(players, ticks, ids, max_gap=max_gap, chunk=chunk)
+    expected, moves = _reference(players, ticks, ids, max_gap=max_gap)
+    assert rows == expected
+    slot = lambda c: 3 if c < 0 else c
+    want = np.zeros((4, 4), dtype=np.int64)
+    for a, b in moves:
+        want[slot(a), slot(b)] += 1
+    np.testing.assert_array_equal(tracker.transitions, want)
+    assert tracker.dwell_ticks.sum() == sum(r[3] - r[2] for r in expected)
+
+
+def test_resolve_player_tick_columns():
+    assert resolve_player_tick_columns(["tick", "steamid", "name", "X"]) == ("steamid", "tick")
+    assert resolve_player_tick_columns(["Tick", "name"]) == ("name", "Tick")
+    with pytest.raises(ValueError):
+        resolve_player_tick_columns(["steamid", "X"])
+
+
+def test_stream_visits_from_a_position_table(tmp_path, row_payload):
+    path = tmp_path / "ticks.csv"
+    xs = [50, 50, 150, 150, 225, 300]
+    with open(path, "w", newline="") as f:
+        w = csv.writer(f)
+        w.writerow(["tick", "steamid", "X", "Y"])
+        for tick, x in enumerate(xs):
+            w.writerow([tick, 7, x, 50])
+    index = CalloutIndex.from_output(row_payload)
+    tracker = VisitTracker(index.names)
+    out = tmp_path / "visits.csv"
+    batches = [v for v, _ in stream_visits(path, index, tracker=tracker, out_path=out, chunk_size=4)]
+    records = [r for v in batches for r in v.records(index.names)]
+    assert [(r["callout"], r["enter_tick"], r["exit_tick"]) for r in records] == [
+        ("A", 0, 2), ("B", 2, 4), ("", 4, 5), ("C", 5, 5)
+    ]
+    assert [row["callout"] for row in csv.DictReader(open(out))] == ["A", "B", "", "C"]
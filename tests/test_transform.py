@@ -0,0 +1,63 @@
+import json
+
+import numpy as np
+import pytest
+
+from cs2_callouts.transform import LOWER, UPPER, RadarTransform, transform_for
+
+from .conftest import MAP_DATA
+
+MIRAGE = {"pos_x": -3230, "pos_y": 1713, "scale": 5.0, "rotate": 0, "zoom": 0.0, "lower_level_max_units": -1000000.0}
+NUKE = {"pos_x": -3453, "pos_y": 2887, "scale": 7.0, "rotate": None, "zoom": None, "lower_level_max_units": -495.0}
+
+
+def test_awpy_known_answers():
+    tf = transform_for(MIRAGE)
+    world = np.array([[-3230.0, 1713.0, 12.0], [-3230.0 + 5120.0, 1713.0 - 5120.0, 0.0], [-3230.0 + 512.0, 1713.0, 0.0]])
+    np.testing.assert_allclose(tf.to_pixel(world), [[0, 0], [1024, 1024], [102.4, 0]])
+    np.testing.assert_allclose(tf.to_normalized(world), [[0, 0], [1, 1], [0.1, 0]])
+
+
+def test_round_trips():
+    tf = transform_for(NUKE)
+    rng = np.random.default_rng(0)
+    world = rng.uniform(-3000, 3000, size=(100, 2))
+    np.testing.assert_allclose(tf.to_world(tf.to_pixel(world)), world, atol=1e-9)
+    np.testing.assert_allclose(tf.from_normalized(tf.to_normalized(world)), world, atol=1e-9)
+    xyz = tf.to_world(tf.to_pixel(world), z=5.0)
+    assert xyz.shape == (100, 3) and (xyz[:, 2] == 5.0).all()
+
+
+def test_scaled_matches_downsampled_radar():
+    tf = transform_for(MIRAGE)
+    half = tf.scaled(0.5)
+    assert half.radar_size == (512, 512)
+    pts = np.array([[0.0, 0.0], [-1000.0, 500.0]])
+    np.testing.assert_allclose(half.to_pixel(pts), tf.to_pixel(pts) * 0.5)
+
+
+def test_rotate_and_zoom_about_center():
+    meta = dict(MIRAGE, rotate=1, zoom=2.0)
+    centre_world = transform_for(MIRAGE).to_world([[512.0, 512.0]])
+    corner_world = transform_for(MIRAGE).to_world([[0.0, 0.0]])
+    rotated = transform_for(meta, apply_rotate=True)
+    np.testing.assert_allclose(rotated.to_pixel(centre_world), [[512, 512]])
+    np.testing.assert_allclose(rotated.to_pixel(corner_world), [[1024, 0]])
+    zoomed = transform_for(meta, apply_zoom=True)
+    np.testing.assert_allclose(zoomed.to_pixel(corner_world), [[-512, -512]])
+
+
+def test_levels():
+    assert not transform_for(MIRAGE).has_lower_level
+    assert transform_for(MIRAGE).level([[0, 0, -5000]]).tolist() == [UPPER]
+    tf = transform_for(NUKE)
+    upper, lower = tf.split_levels([[0, 0, 0], [0, 0, -495], [0, 0, -800]])
+    assert upper.tolist() == [0] and lower.tolist() == [1, 2]
+    assert tf.level([[0, 0, -600]]).tolist() == [LOWER]
+    with pytest.raises(ValueError):
+        tf.level([[0, 0]])
+
+
+def test_transform_for_is_cached_per_metadata():
+    assert transform_for(dict(MIRAGE)) is transform_for(dict(MIRAGE))
+    assert isinstance(transform_for(json.loads(MAP_DATA.read_text())["de_mirage"]), RadarTransform)